@@ -5,12 +5,15 @@ from pathlib import Path
 from typing import Optional, Union
 
 import streamlit as st
-import pandas as pd
 import streamlit.components.v1 as components
 from dotenv import load_dotenv
 from components.table_epicos import show_epicos
 from components.form_epico import show_form_epico
+from components.import_epicos import show_import_epicos
 from components.detail_epico import show_detail_epico
+from components.table_analises import show_analises
+from components.busca_analises import show_busca_analises
+from components.analytics_custos import show_custos
 from components.tags_list import show_tags_list
 from components.tags_form import show_tags_form
 from components.tag_acoes_manager import show_tag_acoes_manager
@@ -28,10 +31,7 @@ from observability.logging import setup_logging, get_logger
 setup_logging()
 logger = get_logger(__name__)
 
-from repositories.epicos_repository import contar_epicos
-from repositories.analises_repository import contar_analises, listar_analises
-from repositories.prompts_repository import contar_prompts, listar_prompts
-from repositories.tags_repository import contar_tags
+from repositories.painel_repository import resumo_painel
 
 DEFAULT_GEAR_SVG = """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">
   <path fill="currentColor" d="M50,8 L56,18 L68,16 L70,28 L82,32 L76,43 L84,52 L72,58 L72,70 L60,70 L52,82 L43,74 L32,80 L28,68 L16,66 L18,54 L8,50 L18,44 L16,32 L28,30 L32,18 L43,24 L50,8 Z M50,28 A22,22 0 1,0 50,72 A22,22 0 1,0 50,28 Z"/>
@@ -205,14 +205,14 @@ st.markdown(
 # ============================
 menu = st.sidebar.radio(
     "Navegação",
-    ["🏠 Início", "📂 Épicos", "🧠 Análises", "💬 Prompts", "🏷️ Tags", "🔗 Integrações", "⚙️ Administração", "📈 Observabilidade"]
+    ["🏠 Início", "📂 Épicos", "🧠 Análises", "💰 Custos", "💬 Prompts", "🏷️ Tags", "🔗 Integrações", "⚙️ Administração", "📈 Observabilidade"]
 )
 
 
 # ============================
 # VERIFICAÇÃO DE CONEXÃO COM BANCO
 # ============================
-from database.connection import test_connection
+from database.health import get_db_health
 
 
 def render_painel_inicio():
@@ -221,11 +221,13 @@ def render_painel_inicio():
         st.markdown("### 🧭 Painel Maestro")
 
         try:
+            resumo = resumo_painel()
+
             col1, col2, col3, col4 = st.columns(4)
-            col1.metric("Épicos cadastrados", contar_epicos())
-            col2.metric("Análises executadas", contar_analises())
-            col3.metric("Prompts ativos", contar_prompts())
-            col4.metric("Tags ativas", contar_tags())
+            col1.metric("Épicos cadastrados", resumo["epicos"])
+            col2.metric("Análises executadas", resumo["analises"])
+            col3.metric("Prompts ativos", resumo["prompts"])
+            col4.metric("Tags ativas", resumo["tags"])
 
             st.markdown("---")
             st.markdown(
@@ -240,10 +242,15 @@ def render_painel_inicio():
 
             with col1:
                 st.markdown("**🔗 Conexão com Banco de Dados**")
-                if test_connection():
-                    st.success("✅ Conectado ao PostgreSQL")
+                saude = get_db_health()
+                if saude.pending:
+                    st.info("⏳ Verificando conexão com o banco...")
+                elif saude.ok:
+                    st.success(f"✅ Conectado ao PostgreSQL ({saude.latency_ms:.0f} ms)")
                 else:
                     st.error("❌ Sem conexão com o banco")
+                if saude.checked_at:
+                    st.caption(f"Última verificação: {saude.checked_at:%H:%M:%S}")
 
             with col2:
                 import os
@@ -258,7 +265,7 @@ def render_painel_inicio():
 def render_epicos():
     track_page_view("epicos")
     with observe_render("pagina_epicos"):
-        abas = st.tabs(["Lista", "Criar", "Detalhe"])
+        abas = st.tabs(["Lista", "Criar", "Importar", "Detalhe"])
         with abas[0]:
             with observe_render("epicos_lista"):
                 show_epicos()
@@ -266,6 +273,9 @@ def render_epicos():
             with observe_render("epicos_criar"):
                 show_form_epico()
         with abas[2]:
+            with observe_render("epicos_importar"):
+                show_import_epicos()
+        with abas[3]:
             with observe_render("epicos_detalhe"):
                 show_detail_epico()
 
@@ -273,35 +283,19 @@ def render_epicos():
 def render_analises():
     track_page_view("analises")
     with observe_render("pagina_analises"):
-        st.subheader("🧠 Histórico de análises GPT")
+        abas = st.tabs(["Histórico", "Buscar nos resultados"])
+        with abas[0]:
+            with observe_render("analises_historico"):
+                show_analises()
+        with abas[1]:
+            with observe_render("analises_busca"):
+                show_busca_analises()
 
-        try:
-            analises = listar_analises(limite=50)
-
-            if not analises:
-                st.info("Nenhuma an�lise executada ainda.")
-            else:
-                st.markdown(f"Exibindo **{len(analises)}** an�lises mais recentes")
-
-                df = pd.DataFrame(analises)
-                df_display = df[
-                    [
-                        "id_execucao",
-                        "epico",
-                        "prompt_contexto",
-                        "data",
-                        "tokens_consumidos",
-                        "custo_estimado",
-                        "status",
-                    ]
-                ].copy()
-
-                df_display.columns = ["ID", "Épico", "Contexto", "Data", "Tokens", "Custo (R$)", "Status"]
-
-                st.dataframe(df_display, use_container_width=True)
 
-        except Exception as e:
-            st.error(f"Erro ao carregar análises: {str(e)}")
+def render_custos():
+    track_page_view("custos")
+    with observe_render("pagina_custos"):
+        show_custos()
 
 
 def render_prompts():
@@ -408,10 +402,10 @@ def render_observabilidade():
         # Iframe do dashboard de logs (autenticação anônima configurada no Grafana)
         components.iframe(logs_dashboard_url, height=900, scrolling=True)
 
-# Testar conexão com banco de dados
+# Status do banco de dados (último resultado do monitor em segundo plano)
 try:
-    db_status = test_connection()
-    if not db_status:
+    db_status = get_db_health()
+    if not db_status.ok and not db_status.pending:
         st.sidebar.warning("⚠️ Banco de dados não está acessível")
 except Exception as e:
     st.sidebar.error(f"❌ Erro de conexão: {str(e)}")
@@ -429,6 +423,9 @@ elif menu == "📂 Épicos":
 elif menu == "🧠 Análises":
     render_analises()
 
+elif menu == "💰 Custos":
+    render_custos()
+
 elif menu == "💬 Prompts":
     render_prompts()
 
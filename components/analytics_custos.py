@@ -0,0 +1,94 @@
+"""
+Painel de custos, tokens e latência das execuções (lê o rollup diário).
+"""
+
+from datetime import date, timedelta
+
+import streamlit as st
+from repositories.analytics_repository import (
+    custos_por_dia, custos_por_dimensao, frescor_rollup, latencia_por_prompt, resumo_custos
+)
+
+PERIODOS = {"Últimos 7 dias": 7, "Últimos 30 dias": 30, "Últimos 90 dias": 90}
+
+FORMATO_VALORES = {
+    "Custo (R$)": st.column_config.NumberColumn(format="R$ %.4f"),
+    "Custo médio (R$)": st.column_config.NumberColumn(format="R$ %.4f"),
+    "Tokens": st.column_config.NumberColumn(format="%d"),
+    "Média (ms)": st.column_config.NumberColumn(format="%.0f"),
+    "p50 (ms)": st.column_config.NumberColumn(format="%.0f"),
+    "p95 (ms)": st.column_config.NumberColumn(format="%.0f"),
+}
+
+
+def _selecionar_periodo():
+    """Retorna (data_inicio, data_fim) escolhidos pelo usuário."""
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        opcao = st.selectbox("Período", list(PERIODOS) + ["Personalizado"], key="custos_periodo")
+
+    hoje = date.today()
+    if opcao != "Personalizado":
+        return hoje - timedelta(days=PERIODOS[opcao] - 1), hoje
+
+    with col2:
+        intervalo = st.date_input(
+            "Intervalo",
+            value=(hoje - timedelta(days=29), hoje),
+            format="DD/MM/YYYY",
+            key="custos_intervalo",
+        )
+    if len(intervalo) != 2:
+        st.stop()
+    return intervalo
+
+
+def _tabela(df):
+    st.dataframe(df, use_container_width=True, hide_index=True, column_config=FORMATO_VALORES)
+
+
+def show_custos():
+    st.subheader("💰 Custos e Latência")
+
+    data_inicio, data_fim = _selecionar_periodo()
+
+    try:
+        frescor = frescor_rollup()
+        resumo = resumo_custos(data_inicio, data_fim)
+    except Exception as e:
+        st.error(f"Erro ao carregar custos: {str(e)}")
+        st.info(
+            "Verifique se as migrações foram aplicadas (python -m database.migrations) "
+            "e se o job de rollup está rodando (python -m jobs.rollup_analises)."
+        )
+        return
+
+    if frescor is None:
+        st.warning("O rollup ainda não foi processado. Execute python -m jobs.rollup_analises --once.")
+        return
+    st.caption(f"Dados consolidados até {frescor:%d/%m/%Y %H:%M}.")
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Custo total", f"R$ {resumo['custo']:,.2f}")
+    col2.metric("Execuções", f"{resumo['execucoes']:,}")
+    col3.metric("Tokens", f"{resumo['tokens']:,}")
+    col4.metric("Custo médio", f"R$ {resumo['custo'] / resumo['execucoes']:,.4f}" if resumo["execucoes"] else "-")
+
+    if not resumo["execucoes"]:
+        st.info("Nenhuma execução no período.")
+        return
+
+    st.markdown("#### Custo por dia")
+    por_dia = custos_por_dia(data_inicio, data_fim)
+    st.bar_chart(por_dia, x="Dia", y="Custo (R$)")
+
+    abas = st.tabs(["Por prompt", "Por contexto", "Por épico", "Latência por prompt"])
+    with abas[0]:
+        _tabela(custos_por_dimensao("prompt", data_inicio, data_fim))
+    with abas[1]:
+        _tabela(custos_por_dimensao("contexto", data_inicio, data_fim))
+    with abas[2]:
+        _tabela(custos_por_dimensao("epico", data_inicio, data_fim))
+    with abas[3]:
+        _tabela(latencia_por_prompt(data_inicio, data_fim))
+        st.caption("p50/p95 estimados a partir de faixas de latência (até 120 s).")
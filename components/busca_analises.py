@@ -0,0 +1,74 @@
+"""
+Busca textual nos resultados das análises, com trechos destacados.
+"""
+
+import html
+
+import streamlit as st
+from repositories.analises_repository import (
+    MARCA_FIM,
+    MARCA_INICIO,
+    buscar_em_resultados,
+    buscar_resultado_execucao,
+)
+
+
+def _trecho_html(trecho: str) -> str:
+    """Escapa o trecho e troca os marcadores da busca por <mark>."""
+    texto = html.escape(trecho or "")
+    return (
+        texto.replace(MARCA_INICIO, "<mark>")
+        .replace(MARCA_FIM, "</mark>")
+        .replace("\n", " ")
+    )
+
+
+def show_busca_analises():
+    st.subheader("🔎 Buscar nos Resultados")
+
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        texto = st.text_input(
+            "Termos de busca",
+            key="busca_analises_texto",
+            placeholder='Ex.: integração SAP, "nota fiscal" -cancelamento',
+        )
+    with col2:
+        limite = st.selectbox("Resultados", [10, 20, 50], index=1, key="busca_analises_limite")
+
+    if not texto.strip():
+        st.caption("A busca considera o texto completo das respostas e ordena por relevância.")
+        return
+
+    try:
+        resultados = buscar_em_resultados(texto, limite=limite)
+    except Exception as e:
+        st.error(f"Erro na busca: {str(e)}")
+        st.info("Verifique se as migrações do banco foram aplicadas (python -m database.migrations).")
+        return
+
+    if not resultados:
+        st.info("Nenhuma análise encontrada para a busca.")
+        return
+
+    st.markdown(f"**{len(resultados)}** análises encontradas (mais relevantes primeiro)")
+
+    for analise in resultados:
+        with st.container(border=True):
+            st.markdown(
+                f"**{analise.epico}** (ID: {analise.id_epico}) · "
+                f"{analise.prompt_contexto} · {analise.data}"
+            )
+            st.markdown(
+                f"<div style='font-size: 0.9rem'>… {_trecho_html(analise.trecho)} …</div>",
+                unsafe_allow_html=True,
+            )
+
+            # Resposta completa só é buscada se o usuário pedir
+            if st.toggle("Exibir resultado completo", key=f"busca-resultado-{analise.id_execucao}"):
+                st.text_area(
+                    "Resultado",
+                    buscar_resultado_execucao(analise.id_execucao, analise.executado_em) or "",
+                    key=f"busca-texto-{analise.id_execucao}",
+                    height=300,
+                )
@@ -1,11 +1,21 @@
 import html
 import json
 import re
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple
 
 import streamlit as st
-from repositories.analises_repository import buscar_analises_por_epico
-from repositories.epicos_repository import listar_epicos
+from components.paginacao import mostrar_controles_paginacao, reiniciar_paginacao
+from repositories.analises_repository import (
+    buscar_analises_por_epico,
+    buscar_resultado_execucao,
+)
+from repositories.epicos_repository import listar_epicos_pagina
+
+CURSOR_DETALHE = "detalhe_epicos_cursor"
+
+# Resultados de execuções mantidos na sessão (os abertos mais recentemente)
+MAX_RESULTADOS_SESSAO = 5
 
 
 def _format_label(label: str) -> str:
@@ -472,13 +482,43 @@ def _render_formatted_result(resultado: str) -> None:
         )
 
 
+def _carregar_resultado(id_execucao: int, executado_em=None) -> str:
+    """
+    Busca o resultado de uma execução, reaproveitando-o entre reruns da sessão.
+
+    Guarda apenas os MAX_RESULTADOS_SESSAO resultados abertos mais
+    recentemente; execuções ainda sem resposta não são guardadas, para que
+    a resposta apareça assim que for gravada.
+    """
+    resultados = st.session_state.setdefault("resultados_execucao", OrderedDict())
+    if id_execucao in resultados:
+        resultados.move_to_end(id_execucao)
+        return resultados[id_execucao]
+
+    resultado = buscar_resultado_execucao(id_execucao, executado_em)
+    if not resultado:
+        return "Análise em processamento..."
+
+    resultados[id_execucao] = resultado
+    while len(resultados) > MAX_RESULTADOS_SESSAO:
+        resultados.popitem(last=False)
+    return resultado
+
+
 def show_detail_epico():
     st.subheader("🧠 Detalhe do Épico")
 
     try:
-        epicos = listar_epicos()
+        pagina = listar_epicos_pagina(
+            tamanho=100,
+            cursor=st.session_state.get(CURSOR_DETALHE)
+        )
+        epicos = pagina.itens
 
         if not epicos:
+            if st.session_state.get(CURSOR_DETALHE):
+                reiniciar_paginacao(CURSOR_DETALHE)
+                st.rerun()
             st.info("Nenhum épico cadastrado ainda.")
             return
 
@@ -494,6 +534,7 @@ def show_detail_epico():
         )
 
         id_epico_selecionado = opcoes[selecionado]
+        mostrar_controles_paginacao(pagina, CURSOR_DETALHE)
 
         analises = buscar_analises_por_epico(id_epico_selecionado)
 
@@ -537,6 +578,16 @@ def show_detail_epico():
                 st.markdown("---")
                 st.markdown("#### 📄 Resultado da Análise")
 
+                # O conteúdo do expander é executado mesmo recolhido, então o
+                # corpo da resposta só é buscado quando o usuário pede
+                if not st.toggle(
+                    "Exibir resultado",
+                    key=f"view-load-{analise['id_execucao']}",
+                ):
+                    continue
+
+                resultado = _carregar_resultado(analise["id_execucao"], analise["executado_em"])
+
                 view_mode = st.radio(
                     "Formato de visualização",
                     ("Visualização Azure", "Saída do Azure"),
@@ -545,11 +596,11 @@ def show_detail_epico():
                 )
 
                 if view_mode == "Visualização Azure":
-                    _render_formatted_result(analise.get("resultado", ""))
+                    _render_formatted_result(resultado)
                 else:
                     st.text_area(
                         "Saída bruta",
-                        analise.get("resultado", ""),
+                        resultado,
                         key=f"view-raw-{analise['id_execucao']}",
                         height=300,
                     )
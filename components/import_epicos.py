@@ -0,0 +1,115 @@
+"""
+Importação de épicos em lote a partir de arquivos CSV ou JSON.
+"""
+
+import csv
+import io
+import json
+from typing import Dict, List
+
+import streamlit as st
+from repositories.epicos_repository import criar_epicos_em_lote
+
+CAMPOS_EPICO = ["titulo", "descricao", "contexto", "tag", "origem", "external_id"]
+
+# Nomes alternativos aceitos nos arquivos (ex.: exportação de outra ferramenta)
+ALIASES_CAMPOS = {
+    "descricao_inicial": "descricao",
+    "tag_atual": "tag",
+}
+
+
+def _normalizar(registro: Dict) -> Dict:
+    epico = {}
+    for chave, valor in registro.items():
+        if chave is None:
+            continue
+        campo = chave.strip().lower()
+        campo = ALIASES_CAMPOS.get(campo, campo)
+        if campo in CAMPOS_EPICO and valor not in (None, ""):
+            epico[campo] = str(valor).strip()
+    return epico
+
+
+def _ler_arquivo(nome: str, conteudo: bytes) -> List[Dict]:
+    """
+    Lê os épicos de um arquivo CSV (com cabeçalho) ou JSON (lista de objetos).
+
+    Raises:
+        ValueError: Se o arquivo não puder ser interpretado
+    """
+    texto = conteudo.decode("utf-8-sig")
+
+    if nome.lower().endswith(".json"):
+        dados = json.loads(texto)
+        if isinstance(dados, dict):
+            dados = dados.get("epicos", [])
+        if not isinstance(dados, list) or not all(isinstance(d, dict) for d in dados):
+            raise ValueError("O JSON deve ser uma lista de objetos (ou {\"epicos\": [...]})")
+        registros = dados
+    else:
+        dialeto = csv.Sniffer().sniff(texto[:4096], delimiters=",;\t")
+        registros = list(csv.DictReader(io.StringIO(texto), dialect=dialeto))
+
+    return [_normalizar(registro) for registro in registros]
+
+
+def show_import_epicos():
+    st.subheader("📥 Importar Épicos em Lote")
+    st.caption(
+        "Envie um CSV (com cabeçalho) ou JSON com as colunas: "
+        "titulo, descricao, contexto, tag, origem, external_id. "
+        "Título e descrição são obrigatórios."
+    )
+
+    arquivo = st.file_uploader("Arquivo de épicos", type=["csv", "json"], key="import_epicos_arquivo")
+    if arquivo is None:
+        return
+
+    try:
+        epicos = _ler_arquivo(arquivo.name, arquivo.getvalue())
+    except (ValueError, csv.Error, UnicodeDecodeError) as e:
+        st.error(f"❌ Não foi possível ler o arquivo: {str(e)}")
+        return
+
+    if not epicos:
+        st.warning("Nenhum épico encontrado no arquivo.")
+        return
+
+    invalidos = [i for i, e in enumerate(epicos, start=1) if not e.get("titulo") or not e.get("descricao")]
+
+    st.markdown(f"**{len(epicos)}** épicos encontrados no arquivo")
+    st.dataframe(epicos[:20], use_container_width=True)
+    if len(epicos) > 20:
+        st.caption("Exibindo os 20 primeiros.")
+
+    if invalidos:
+        st.error(
+            f"❌ {len(invalidos)} épicos sem título ou descrição "
+            f"(linhas {', '.join(map(str, invalidos[:10]))}{'...' if len(invalidos) > 10 else ''})."
+        )
+        return
+
+    with st.form("form_import_epicos"):
+        col1, col2 = st.columns(2)
+        with col1:
+            tag = st.selectbox("Tag padrão", ["analise_pre", "wbs", "refino"])
+        with col2:
+            origem = st.selectbox("Origem padrão", ["manual", "azure", "jira"])
+        st.caption("Os valores padrão são usados quando a linha não informa tag ou origem.")
+        submitted = st.form_submit_button(f"Importar {len(epicos)} épicos")
+
+    if submitted:
+        for epico in epicos:
+            epico.setdefault("tag", tag)
+            epico.setdefault("origem", origem)
+
+        try:
+            with st.spinner("Importando épicos..."):
+                ids = criar_epicos_em_lote(epicos)
+
+            st.success(f"✅ {len(ids)} épicos importados com sucesso! (IDs {min(ids)} a {max(ids)})")
+
+        except Exception as e:
+            st.error(f"❌ Erro ao importar épicos: {str(e)}")
+            st.info("Nenhum épico foi criado. Verifique o arquivo e o acesso ao banco de dados.")
@@ -0,0 +1,66 @@
+"""
+Controles de navegação para listas paginadas por cursor.
+"""
+
+import streamlit as st
+
+from repositories.paginacao import Pagina
+
+TAMANHOS_PAGINA = [25, 50, 100, 200]
+
+
+def _definir_cursor(chave_estado: str, token) -> None:
+    st.session_state[chave_estado] = token
+
+
+def reiniciar_paginacao(chave_estado: str) -> None:
+    """Volta a lista para a primeira página."""
+    st.session_state.pop(chave_estado, None)
+
+
+def seletor_tamanho_pagina(chave_estado: str, rotulo: str = "Itens por página", padrao: int = 50) -> int:
+    """Selectbox de tamanho de página; ao mudar, volta para a primeira página."""
+    return st.selectbox(
+        rotulo,
+        TAMANHOS_PAGINA,
+        index=TAMANHOS_PAGINA.index(padrao),
+        key=f"{chave_estado}_tamanho",
+        on_change=reiniciar_paginacao,
+        args=(chave_estado,),
+    )
+
+
+def mostrar_controles_paginacao(pagina: Pagina, chave_estado: str) -> None:
+    """
+    Exibe botões Anterior/Primeira/Próxima que atualizam o cursor na sessão.
+
+    Args:
+        pagina: Página atualmente exibida
+        chave_estado: Chave do st.session_state que guarda o cursor da lista
+    """
+    col_primeira, col_anterior, col_proxima = st.columns(3)
+
+    col_primeira.button(
+        "⏮️ Primeira",
+        key=f"{chave_estado}_primeira",
+        disabled=st.session_state.get(chave_estado) is None,
+        on_click=reiniciar_paginacao,
+        args=(chave_estado,),
+        use_container_width=True,
+    )
+    col_anterior.button(
+        "⬅️ Anterior",
+        key=f"{chave_estado}_anterior",
+        disabled=pagina.anterior is None,
+        on_click=_definir_cursor,
+        args=(chave_estado, pagina.anterior),
+        use_container_width=True,
+    )
+    col_proxima.button(
+        "Próxima ➡️",
+        key=f"{chave_estado}_proxima",
+        disabled=pagina.proximo is None,
+        on_click=_definir_cursor,
+        args=(chave_estado, pagina.proximo),
+        use_container_width=True,
+    )
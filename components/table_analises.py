@@ -0,0 +1,124 @@
+"""
+Componente de histórico de análises com filtros e paginação por cursor.
+"""
+
+import streamlit as st
+from components.paginacao import (
+    mostrar_controles_paginacao, reiniciar_paginacao, seletor_tamanho_pagina
+)
+from repositories.analises_repository import tabela_analises_pagina
+from repositories.prompts_repository import listar_contextos_disponiveis
+
+CURSOR_ANALISES = "analises_cursor"
+
+STATUS_EXECUCAO = ["sucesso", "erro", "processando"]
+
+
+def _filtros_analises() -> dict:
+    """Exibe os filtros e retorna os argumentos para tabela_analises_pagina."""
+    try:
+        contextos = listar_contextos_disponiveis()
+    except Exception as e:
+        st.error(f"Erro ao carregar contextos: {str(e)}")
+        contextos = []
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+
+    with col1:
+        id_epico = st.number_input(
+            "ID do Épico",
+            min_value=0,
+            value=0,
+            step=1,
+            help="0 = todos os épicos",
+            key="analises_filtro_epico",
+            on_change=reiniciar_paginacao,
+            args=(CURSOR_ANALISES,),
+        )
+
+    with col2:
+        contexto = st.selectbox(
+            "Contexto",
+            ["Todos"] + contextos,
+            key="analises_filtro_contexto",
+            on_change=reiniciar_paginacao,
+            args=(CURSOR_ANALISES,),
+        )
+
+    with col3:
+        status = st.selectbox(
+            "Status",
+            ["Todos"] + STATUS_EXECUCAO,
+            index=1,
+            key="analises_filtro_status",
+            on_change=reiniciar_paginacao,
+            args=(CURSOR_ANALISES,),
+        )
+
+    with col4:
+        data_inicio = st.date_input(
+            "De",
+            value=None,
+            format="DD/MM/YYYY",
+            key="analises_filtro_inicio",
+            on_change=reiniciar_paginacao,
+            args=(CURSOR_ANALISES,),
+        )
+
+    with col5:
+        data_fim = st.date_input(
+            "Até",
+            value=None,
+            format="DD/MM/YYYY",
+            key="analises_filtro_fim",
+            on_change=reiniciar_paginacao,
+            args=(CURSOR_ANALISES,),
+        )
+
+    return {
+        "id_epico": int(id_epico) or None,
+        "contexto": None if contexto == "Todos" else contexto,
+        "status": None if status == "Todos" else status,
+        "data_inicio": data_inicio,
+        "data_fim": data_fim,
+    }
+
+
+def show_analises():
+    st.subheader("🧠 Histórico de análises GPT")
+
+    filtros = _filtros_analises()
+
+    try:
+        col1, col2 = st.columns([3, 1])
+        with col2:
+            tamanho = seletor_tamanho_pagina(CURSOR_ANALISES, "Análises por página")
+
+        pagina = tabela_analises_pagina(
+            tamanho=tamanho,
+            cursor=st.session_state.get(CURSOR_ANALISES),
+            **filtros
+        )
+
+        if pagina.vazia:
+            if st.session_state.get(CURSOR_ANALISES):
+                reiniciar_paginacao(CURSOR_ANALISES)
+                st.rerun()
+            st.info("Nenhuma análise encontrada para os filtros selecionados.")
+            return
+
+        with col1:
+            st.markdown(f"Exibindo **{len(pagina.itens)}** análises")
+
+        st.dataframe(
+            pagina.itens,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Data": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm"),
+            },
+        )
+        mostrar_controles_paginacao(pagina, CURSOR_ANALISES)
+
+    except Exception as e:
+        st.error(f"Erro ao carregar análises: {str(e)}")
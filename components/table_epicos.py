@@ -1,32 +1,213 @@
+import csv
+import os
+import tempfile
+
 import streamlit as st
-import pandas as pd
-from repositories.epicos_repository import listar_epicos
+from components.paginacao import (
+    mostrar_controles_paginacao, reiniciar_paginacao, seletor_tamanho_pagina
+)
+from repositories.epicos_repository import (
+    atualizar_epicos_em_lote, buscar_epicos, iterar_epicos, tabela_epicos_pagina
+)
+from repositories.tags_repository import listar_tags_opcoes
+
+CURSOR_EPICOS = "epicos_cursor"
+PAGINA_EPICOS_IDS = "epicos_pagina_ids"
+SELECAO_EPICOS = "epicos_selecionados"
+
+STATUS_EPICO = ["em_analise", "concluido", "erro"]
+TAGS_PADRAO = ["analise_pre", "wbs", "refino"]
+MANTER = "— manter —"
+
+COLUNAS_EXPORTACAO = [
+    'id_epico', 'titulo', 'descricao', 'status', 'tag', 'origem',
+    'external_id', 'azure_id', 'criado_em', 'atualizado_em'
+]
+
+
+def _gerar_csv_epicos() -> str:
+    """
+    Gera o CSV de todos os épicos lendo o banco em lotes (cursor no servidor).
+
+    O CSV é gravado em um arquivo temporário, não em memória.
+
+    Returns:
+        Caminho do arquivo gerado
+    """
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".csv", prefix="epicos_", encoding="utf-8", newline="", delete=False
+    ) as arquivo:
+        writer = csv.DictWriter(arquivo, fieldnames=COLUNAS_EXPORTACAO, extrasaction="ignore")
+        writer.writeheader()
+        for epico in iterar_epicos():
+            writer.writerow(epico)
+    return arquivo.name
+
+
+def _descartar_csv():
+    """Remove o arquivo do último CSV gerado na sessão."""
+    caminho = st.session_state.pop("epicos_csv", None)
+    if caminho and os.path.exists(caminho):
+        os.remove(caminho)
+
+
+def _mostrar_exportacao():
+    with st.expander("⬇️ Exportar todos os épicos (CSV)"):
+        if st.button("Gerar CSV", key="epicos_gerar_csv"):
+            _descartar_csv()
+            st.session_state["epicos_csv"] = _gerar_csv_epicos()
+
+        caminho = st.session_state.get("epicos_csv")
+        if caminho and os.path.exists(caminho):
+            with open(caminho, "rb") as arquivo:
+                st.download_button(
+                    "💾 Baixar epicos.csv",
+                    arquivo,
+                    file_name="epicos.csv",
+                    mime="text/csv",
+                    on_click=_descartar_csv,
+                )
+
+
+def _registrar_selecao():
+    """
+    Converte as linhas selecionadas em IDs de épicos.
+
+    Roda antes do rerun, com os IDs da página que o usuário estava vendo: a
+    página é consultada de novo a cada rerun e as posições podem mudar se
+    outro usuário alterar épicos nesse meio tempo.
+    """
+    ids_pagina = st.session_state.get(PAGINA_EPICOS_IDS, [])
+    linhas = st.session_state["epicos_tabela"].selection.rows
+    st.session_state[SELECAO_EPICOS] = [ids_pagina[i] for i in linhas if i < len(ids_pagina)]
+
+
+def _mostrar_acoes_em_lote(ids):
+    """Formulário para aplicar status/tag aos épicos selecionados na tabela."""
+    try:
+        tags = [t["nome"] for t in listar_tags_opcoes()] or TAGS_PADRAO
+    except Exception:
+        tags = TAGS_PADRAO
+
+    with st.form("form_epicos_lote"):
+        st.markdown(f"**Ações em lote** — {len(ids)} épicos selecionados")
+        st.caption("IDs: " + ", ".join(map(str, ids)))
+        col1, col2 = st.columns(2)
+        with col1:
+            status = st.selectbox("Status", [MANTER] + STATUS_EPICO)
+        with col2:
+            tag = st.selectbox("Tag", [MANTER] + tags)
+        submitted = st.form_submit_button("Aplicar aos selecionados")
+
+    if submitted:
+        if status == MANTER and tag == MANTER:
+            st.warning("Escolha um status ou uma tag para aplicar.")
+            return
+
+        try:
+            total = atualizar_epicos_em_lote(
+                ids,
+                status=None if status == MANTER else status,
+                tag=None if tag == MANTER else tag,
+            )
+        except Exception as e:
+            st.error(f"❌ Erro ao atualizar épicos: {str(e)}")
+            return
+
+        st.session_state["epicos_lote_mensagem"] = f"✅ {total} épicos atualizados."
+        # Os épicos atualizados mudam de posição: limpa a seleção da tabela
+        st.session_state.pop("epicos_tabela", None)
+        st.session_state.pop(SELECAO_EPICOS, None)
+        st.rerun()
+
+
+def _mostrar_busca() -> bool:
+    """Campo de busca textual; retorna True se uma busca estiver ativa."""
+    texto = st.text_input(
+        "🔎 Buscar épicos",
+        key="epicos_busca",
+        placeholder='Ex.: integração SAP, "nota fiscal" -cancelamento',
+    )
+    if not texto.strip():
+        return False
+
+    try:
+        resultados = buscar_epicos(texto, limite=50)
+    except Exception as e:
+        st.error(f"Erro na busca: {str(e)}")
+        return True
+
+    if not resultados:
+        st.info("Nenhum épico encontrado para a busca.")
+        return True
+
+    st.markdown(f"**{len(resultados)}** épicos encontrados (mais relevantes primeiro)")
+    st.dataframe(
+        [
+            {
+                "ID": e.id_epico,
+                "Título": e.titulo,
+                "Status": e.status,
+                "Tag": e.tag,
+                "Origem": e.origem,
+                "ID Externo": e.external_id,
+                "Atualizado em": e.atualizado_em,
+            }
+            for e in resultados
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+    return True
+
 
 def show_epicos():
     st.subheader("📋 Lista de Épicos")
 
+    mensagem = st.session_state.pop("epicos_lote_mensagem", None)
+    if mensagem:
+        st.success(mensagem)
+
+    if _mostrar_busca():
+        return
+
     try:
-        epicos = listar_epicos()
+        col1, col2 = st.columns([3, 1])
+        with col2:
+            tamanho = seletor_tamanho_pagina(CURSOR_EPICOS, "Épicos por página")
 
-        if not epicos:
+        # DataFrame já vem com as colunas exibidas e rótulos em português
+        pagina = tabela_epicos_pagina(
+            tamanho=tamanho,
+            cursor=st.session_state.get(CURSOR_EPICOS)
+        )
+
+        if pagina.vazia:
+            if st.session_state.get(CURSOR_EPICOS):
+                # Cursor obsoleto (épicos removidos): volta para o início
+                reiniciar_paginacao(CURSOR_EPICOS)
+                st.rerun()
             st.info("Nenhum épico cadastrado.")
             return
 
-        # Selecionar e renomear colunas para exibição
-        df = pd.DataFrame(epicos)
-
-        # Renomear colunas para português
-        df_display = df[[
-            'id_epico', 'titulo', 'status', 'tag', 'origem',
-            'external_id', 'criado_em', 'atualizado_em'
-        ]].copy()
+        evento = st.dataframe(
+            pagina.itens,
+            use_container_width=True,
+            hide_index=True,
+            on_select=_registrar_selecao,
+            selection_mode="multi-row",
+            key="epicos_tabela",
+        )
+        st.session_state[PAGINA_EPICOS_IDS] = pagina.itens["ID"].tolist()
+        mostrar_controles_paginacao(pagina, CURSOR_EPICOS)
 
-        df_display.columns = [
-            'ID', 'Título', 'Status', 'Tag', 'Origem',
-            'ID Externo', 'Criado em', 'Atualizado em'
-        ]
+        ids = st.session_state.get(SELECAO_EPICOS) if evento.selection.rows else None
+        if ids:
+            _mostrar_acoes_em_lote(ids)
+        else:
+            st.caption("Selecione linhas na tabela para alterar status ou tag em lote.")
 
-        st.dataframe(df_display, use_container_width=True)
+        _mostrar_exportacao()
 
     except Exception as e:
         st.error(f"Erro ao carregar épicos: {str(e)}")
@@ -5,12 +5,12 @@ Componente de gerenciamento de Tag_Acoes (associações entre tags e ações).
 import streamlit as st
 import pandas as pd
 from repositories.tag_acoes_repository import (
-    listar_tag_acoes, criar_tag_acao, excluir_tag_acao_permanente,
-    atualizar_tag_acao, verificar_duplicata
+    listar_tag_acoes, criar_tag_acoes_em_lote, excluir_tag_acao_permanente,
+    atualizar_tag_acao
 )
-from repositories.tags_repository import listar_tags
+from repositories.tags_repository import listar_tags_opcoes
 from repositories.acoes_repository import listar_acoes
-from repositories.prompts_repository import listar_prompts
+from repositories.prompts_repository import listar_prompts_opcoes
 
 
 def show_tag_acoes_manager():
@@ -31,7 +31,7 @@ def show_tag_acoes_list():
 
     try:
         # Filtro por tag
-        tags = listar_tags()
+        tags = listar_tags_opcoes()
 
         col1, col2 = st.columns([3, 1])
         with col1:
@@ -130,11 +130,15 @@ def show_tag_acoes_list():
 def show_tag_acoes_form():
     """Formulário para criar nova associação"""
 
+    # Resultado da última criação em lote, guardado antes do st.rerun()
+    for tipo, mensagem in st.session_state.pop("tag_acoes_lote_mensagens", []):
+        getattr(st, tipo)(mensagem)
+
     try:
         # Carregar dados para os selects
-        tags = listar_tags(apenas_ativas=True)
-        acoes = listar_acoes(apenas_ativas=True)
-        prompts = listar_prompts(apenas_ativos=True)
+        tags = listar_tags_opcoes(apenas_ativas=True)
+        acoes = listar_acoes(apenas_ativas=True, incluir_usos=False)
+        prompts = listar_prompts_opcoes(apenas_ativos=True)
 
         if not tags:
             st.warning("⚠️ Nenhuma tag ativa encontrada. Crie uma tag primeiro.")
@@ -150,22 +154,21 @@ def show_tag_acoes_form():
 
         with st.form("form_tag_acao"):
             st.markdown("### Criar Nova Associação")
+            st.caption("Selecione várias tags e/ou ações para criar todas as combinações de uma vez.")
 
-            # Select da Tag
+            # Seleção das Tags
             tags_options = {f"{t['nome']} ({t['id_tag']})": t['id_tag'] for t in tags}
-            tag_selecionada = st.selectbox(
-                "Tag *",
+            tags_selecionadas = st.multiselect(
+                "Tags *",
                 options=list(tags_options.keys())
             )
-            id_tag = tags_options[tag_selecionada]
 
-            # Select da Ação
+            # Seleção das Ações
             acoes_options = {f"{a['nome']} - {a['tipo']} ({a['codigo']})": a['id_acao'] for a in acoes}
-            acao_selecionada = st.selectbox(
-                "Ação *",
+            acoes_selecionadas = st.multiselect(
+                "Ações *",
                 options=list(acoes_options.keys())
             )
-            id_acao = acoes_options[acao_selecionada]
 
             # Select do Prompt
             prompts_options = {f"{p['nome']} (v{p['versao']})": p['id_prompt'] for p in prompts}
@@ -199,9 +202,13 @@ def show_tag_acoes_form():
             )
 
             # Botão de envio
-            submitted = st.form_submit_button("💾 Criar Associação", type="primary", use_container_width=True)
+            submitted = st.form_submit_button("💾 Criar Associações", type="primary", use_container_width=True)
 
         if submitted:
+            if not tags_selecionadas or not acoes_selecionadas:
+                st.error("❌ Selecione ao menos uma tag e uma ação!")
+                return
+
             # Validar JSON (se fornecidos)
             import json
             cond_json = None
@@ -221,29 +228,51 @@ def show_tag_acoes_form():
                 st.error("❌ Parâmetros: JSON inválido!")
                 return
 
-            # Verificar duplicata
-            if verificar_duplicata(id_tag, id_acao, id_prompt):
-                st.error("❌ Já existe uma associação ativa entre esta tag, ação e prompt!")
-                return
+            pares = [
+                (tags_options[tag], acoes_options[acao])
+                for tag in tags_selecionadas
+                for acao in acoes_selecionadas
+            ]
 
-            # Criar associação
+            # Duplicatas verificadas e associações criadas em lote, na mesma transação
             try:
-                id_tag_acao = criar_tag_acao(
-                    id_tag=id_tag,
-                    id_acao=id_acao,
+                resultado = criar_tag_acoes_em_lote(
+                    pares,
                     id_prompt=id_prompt,
                     prioridade=prioridade,
                     condicoes_extras=cond_json,
                     parametros=param_json
                 )
 
-                st.success(f"✅ Associação criada com sucesso! (ID: {id_tag_acao})")
-                st.info("A associação está ativa e será executada quando a tag for detectada.")
-                st.rerun()
-                return
-
             except Exception as e:
                 st.error(f"❌ Erro ao criar associação: {str(e)}")
+                return
+
+            nomes_tags = {v: k for k, v in tags_options.items()}
+            nomes_acoes = {v: k for k, v in acoes_options.items()}
+            mensagens = []
+
+            if resultado["criadas"]:
+                mensagens.append(("success", f"✅ {len(resultado['criadas'])} associações criadas com sucesso!"))
+                mensagens.append(("info", "As associações estão ativas e serão executadas quando a tag for detectada."))
+
+            if resultado["duplicadas"]:
+                mensagens.append((
+                    "warning",
+                    "⚠️ Já existiam associações ativas com este prompt para: "
+                    + "; ".join(f"{nomes_tags[t]} → {nomes_acoes[a]}" for t, a in resultado["duplicadas"])
+                ))
+
+            if resultado["conflitos"]:
+                mensagens.append((
+                    "warning",
+                    "⚠️ Não criadas por já existir associação (inativa ou com outro prompt) para: "
+                    + "; ".join(f"{nomes_tags[t]} → {nomes_acoes[a]}" for t, a in resultado["conflitos"])
+                ))
+
+            # As novas associações só aparecem na lista após recarregar a página
+            st.session_state["tag_acoes_lote_mensagens"] = mensagens
+            st.rerun()
 
     except Exception as e:
         st.error(f"Erro ao carregar formulário: {str(e)}")
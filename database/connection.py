@@ -3,14 +3,32 @@ Módulo de conexão com o banco de dados PostgreSQL.
 Compatível com a estrutura do projeto Maestro.
 """
 
+import atexit
 import os
+import threading
+import time
+import uuid
 from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 import psycopg2
 from dotenv import load_dotenv
+from psycopg2.extensions import (
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_INERROR,
+    TRANSACTION_STATUS_INTRANS,
+)
 from psycopg2.extras import RealDictCursor
 
-from observability.metrics import db_connection_error, db_connection_opened
+from observability.metrics import (
+    db_connection_closed,
+    db_connection_error,
+    db_connection_opened,
+    db_pool_checkout,
+    db_pool_state,
+    db_pool_timeout,
+)
 
 # Carrega variáveis de ambiente
 load_dotenv()
@@ -31,35 +49,472 @@ def get_database_url():
     return f"postgresql://{credentials}@{host}:{port}/{database}"
 
 
-@contextmanager
-def get_db_connection():
+class PoolTimeout(Exception):
+    """Nenhuma conexão do pool ficou disponível dentro do tempo limite."""
+
+
+class ConnectionPool:
     """
-    Context manager para conexão com o banco de dados.
+    Pool de conexões thread-safe compartilhado pelo processo.
 
-    Uso:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT * FROM epicos")
-                results = cur.fetchall()
+    As conexões são abertas sob demanda até `max_size`. Ao devolver uma
+    conexão ao pool, conexões quebradas, com transação pendente ou acima do
+    tempo máximo de vida são descartadas; conexões ociosas além de
+    `idle_timeout` são fechadas enquanto o pool tiver mais que `min_size`.
+
+    Args:
+        dsn: URL de conexão com o banco
+        min_size: Número mínimo de conexões mantidas ociosas
+        max_size: Número máximo de conexões abertas simultaneamente
+        idle_timeout: Segundos que uma conexão pode ficar ociosa no pool
+        max_lifetime: Segundos de vida máximos de uma conexão
+        timeout: Segundos de espera por uma conexão livre antes de PoolTimeout
+        pre_ping: Se True, valida a conexão com SELECT 1 antes de entregá-la
+        connection_factory: Subclasse de connection do psycopg2 (opcional)
     """
-    conn = None
-    try:
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_timeout: float = 300.0,
+        max_lifetime: float = 1800.0,
+        timeout: float = 30.0,
+        pre_ping: bool = True,
+        connection_factory=None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size deve ser maior que zero")
+
+        self.dsn = dsn
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+        self.connection_factory = connection_factory
+
+        self._cond = threading.Condition()
+        # Pilha LIFO de (conexão, instante em que voltou ao pool): as conexões
+        # mais quentes são reutilizadas e as do fundo expiram por ociosidade
+        self._idle: List[Tuple[object, float]] = []
+        self._created_at: Dict[int, float] = {}
+        self._size = 0
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Conexões físicas
+    # ------------------------------------------------------------------
+    def _connect(self):
         conn = psycopg2.connect(
-            get_database_url(),
+            self.dsn,
+            connection_factory=self.connection_factory,
             cursor_factory=RealDictCursor  # Retorna resultados como dicionários
         )
+        self._created_at[id(conn)] = time.monotonic()
         db_connection_opened()
+        return conn
+
+    def _close(self, conn) -> None:
+        created_at = self._created_at.pop(id(conn), None)
+        if created_at is not None:
+            db_connection_closed(time.monotonic() - created_at)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _expired(self, conn, now: float) -> bool:
+        created_at = self._created_at.get(id(conn), now)
+        return self.max_lifetime > 0 and now - created_at >= self.max_lifetime
+
+    def _report_state(self) -> None:
+        """Publica a ocupação atual do pool (chamar com o lock adquirido)."""
+        idle = len(self._idle)
+        db_pool_state(self._size, self._size - idle, idle)
+
+    def _ping(self, conn) -> bool:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    # ------------------------------------------------------------------
+    # Checkout / devolução
+    # ------------------------------------------------------------------
+    def getconn(self):
+        """Retira uma conexão do pool, abrindo uma nova se houver espaço."""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        discarded = []
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeout("Pool de conexões encerrado")
+
+                conn = None
+                now = time.monotonic()
+                while self._idle:
+                    candidate, _ = self._idle.pop()
+                    if candidate.closed or self._expired(candidate, now):
+                        discarded.append(candidate)
+                        self._size -= 1
+                        continue
+                    conn = candidate
+                    break
+
+                if conn is not None:
+                    break
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._report_state()
+                    db_pool_timeout()
+                    raise PoolTimeout(
+                        f"Nenhuma conexão disponível após {self.timeout:.1f}s "
+                        f"(max_size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+
+            self._report_state()
+
+        for stale in discarded:
+            self._close(stale)
+
+        if conn is None or (self.pre_ping and not self._ping(conn)):
+            # Conexão nova (vaga reservada acima) ou reutilizada que falhou no ping
+            if conn is not None:
+                self._close(conn)
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._report_state()
+                    self._cond.notify()
+                raise
+
+        db_pool_checkout(time.monotonic() - started)
+        return conn
+
+    def putconn(self, conn, discard: bool = False) -> None:
+        """Devolve a conexão ao pool (ou a descarta se estiver inutilizável)."""
+        if not discard and not conn.closed:
+            status = conn.info.transaction_status
+            if status in (TRANSACTION_STATUS_INTRANS, TRANSACTION_STATUS_INERROR):
+                # Transação abandonada (ex.: GeneratorExit, st.rerun)
+                try:
+                    conn.rollback()
+                    status = conn.info.transaction_status
+                except psycopg2.Error:
+                    discard = True
+            if status != TRANSACTION_STATUS_IDLE:
+                discard = True
+
+        now = time.monotonic()
+        if conn.closed or self._expired(conn, now):
+            discard = True
+
+        to_close = []
+        with self._cond:
+            if discard or self._closed:
+                to_close.append(conn)
+                self._size -= 1
+            else:
+                self._idle.append((conn, now))
+                to_close.extend(self._prune_idle(now))
+            self._report_state()
+            self._cond.notify()
+
+        for stale in to_close:
+            self._close(stale)
+
+    def _prune_idle(self, now: float) -> List[object]:
+        """Remove do fundo da pilha as conexões ociosas há tempo demais."""
+        pruned = []
+        if self.idle_timeout <= 0:
+            return pruned
+        while self._idle and self._size > self.min_size:
+            conn, returned_at = self._idle[0]
+            if now - returned_at < self.idle_timeout:
+                break
+            self._idle.pop(0)
+            self._size -= 1
+            pruned.append(conn)
+        return pruned
+
+    def closeall(self) -> None:
+        """Fecha todas as conexões ociosas e impede novos checkouts."""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._size -= len(idle)
+            self._idle.clear()
+            self._report_state()
+            self._cond.notify_all()
+
+        for conn in idle:
+            self._close(conn)
+
+
+_POOL: Optional[ConnectionPool] = None
+_POOL_PID: Optional[int] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Retorna o pool de conexões do processo, criando-o na primeira chamada.
+
+    Configuração via variáveis de ambiente:
+        DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_IDLE_TIMEOUT,
+        DB_POOL_MAX_LIFETIME, DB_POOL_TIMEOUT, DB_POOL_PRE_PING
+    """
+    global _POOL, _POOL_PID
+
+    pid = os.getpid()
+    if _POOL is not None and _POOL_PID == pid:
+        return _POOL
+
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_PID != pid:
+            # Após fork as conexões herdadas não podem ser reutilizadas
+            _POOL = ConnectionPool(
+                get_database_url(),
+                min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+                max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                idle_timeout=float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300")),
+                max_lifetime=float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+                timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+                pre_ping=os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+            )
+            _POOL_PID = pid
+        return _POOL
+
+
+def install_pool(pool: ConnectionPool) -> None:
+    """
+    Substitui o pool do processo (usado por ferramentas, ex.: index_advisor).
+
+    O pool anterior, se houver, é encerrado.
+    """
+    global _POOL, _POOL_PID
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL_PID == os.getpid():
+            _POOL.closeall()
+        _POOL = pool
+        _POOL_PID = os.getpid()
+
+
+def close_pool() -> None:
+    """Encerra o pool de conexões do processo."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL_PID == os.getpid():
+            _POOL.closeall()
+        _POOL = None
+
+
+atexit.register(close_pool)
+
+
+class _UnitOfWork:
+    """Estado da unidade de trabalho ativa no contexto atual."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.savepoints = 0
+        self.on_commit: List[Callable[[], None]] = []
+
+
+_UNIT_OF_WORK: ContextVar[Optional[_UnitOfWork]] = ContextVar(
+    "maestro_unit_of_work", default=None
+)
+
+
+@contextmanager
+def _pooled_connection():
+    """Empresta uma conexão do pool com commit/rollback ao final."""
+    pool = get_pool()
+    try:
+        conn = pool.getconn()
+    except Exception as e:
+        db_connection_error()
+        raise e
+
+    discard = False
+    try:
         yield conn
         conn.commit()
     except Exception as e:
-        if conn is None:
-            db_connection_error()
-        else:
+        try:
             conn.rollback()
+        except psycopg2.Error:
+            discard = True
         raise e
     finally:
-        if conn:
-            conn.close()
+        pool.putconn(conn, discard=discard)
+
+
+@contextmanager
+def get_db_connection():
+    """
+    Context manager para conexão com o banco de dados.
+
+    A conexão é emprestada do pool do processo e devolvida ao final,
+    com commit em caso de sucesso e rollback em caso de erro. Dentro de
+    `unit_of_work()`/`transaction()` a conexão da unidade de trabalho é
+    reutilizada e o commit fica a cargo dela.
+
+    Uso:
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT * FROM epicos")
+                results = cur.fetchall()
+    """
+    uow = _UNIT_OF_WORK.get()
+    if uow is not None:
+        yield uow.conn
+        return
+
+    with _pooled_connection() as conn:
+        yield conn
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Compartilha uma única conexão e transação entre várias chamadas de repositório.
+
+    Todas as funções que usam `get_db_connection()` dentro do bloco reutilizam
+    a mesma conexão; o commit acontece uma única vez ao final (rollback se o
+    bloco levantar exceção). Unidades aninhadas se juntam à mais externa.
+
+    Uso:
+        with unit_of_work():
+            total_epicos = contar_epicos()
+            total_tags = contar_tags()
+    """
+    uow = _UNIT_OF_WORK.get()
+    if uow is not None:
+        yield uow.conn
+        return
+
+    with _pooled_connection() as conn:
+        uow = _UnitOfWork(conn)
+        token = _UNIT_OF_WORK.set(uow)
+        try:
+            yield conn
+        finally:
+            _UNIT_OF_WORK.reset(token)
+
+    # Só chega aqui se o commit foi bem-sucedido
+    for callback in uow.on_commit:
+        callback()
+
+
+def in_unit_of_work() -> bool:
+    """Indica se há uma unidade de trabalho ativa no contexto atual."""
+    return _UNIT_OF_WORK.get() is not None
+
+
+def on_commit(callback: Callable[[], None]) -> None:
+    """
+    Agenda `callback` para depois do commit da unidade de trabalho ativa.
+
+    Fora de uma unidade de trabalho (cada chamada de repositório já foi
+    commitada ao retornar) o callback é executado imediatamente.
+    """
+    uow = _UNIT_OF_WORK.get()
+    if uow is None:
+        callback()
+    else:
+        uow.on_commit.append(callback)
+
+
+@contextmanager
+def transaction():
+    """
+    Executa o bloco de forma atômica.
+
+    Fora de uma unidade de trabalho equivale a `unit_of_work()`. Dentro de uma,
+    abre um SAVEPOINT, de modo que uma falha no bloco desfaz apenas as suas
+    alterações sem abortar a transação externa.
+
+    Uso:
+        with transaction():
+            if not verificar_duplicata(id_tag, id_acao, id_prompt):
+                criar_tag_acao(id_tag, id_acao, id_prompt)
+    """
+    uow = _UNIT_OF_WORK.get()
+    if uow is None:
+        with unit_of_work() as conn:
+            yield conn
+        return
+
+    uow.savepoints += 1
+    savepoint = f"maestro_sp_{uow.savepoints}"
+    with uow.conn.cursor() as cur:
+        cur.execute(f"SAVEPOINT {savepoint}")
+
+    try:
+        yield uow.conn
+    except Exception:
+        with uow.conn.cursor() as cur:
+            cur.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+        raise
+    else:
+        with uow.conn.cursor() as cur:
+            cur.execute(f"RELEASE SAVEPOINT {savepoint}")
+
+
+def stream_rows(
+    query: str,
+    params=None,
+    itersize: int = 2000,
+    row_factory: Optional[Callable[[List[str]], Callable]] = None,
+) -> Iterator:
+    """
+    Executa uma consulta em um cursor nomeado (server-side) e gera as linhas.
+
+    O servidor envia as linhas em lotes de `itersize`, então a memória do
+    processo fica limitada ao lote, independentemente do tamanho do
+    resultado. A conexão permanece emprestada até o gerador ser esgotado
+    ou fechado.
+
+    Com `row_factory`, as linhas vêm de um cursor de tuplas e são convertidas
+    pela função que `row_factory(nomes_das_colunas)` retornar.
+
+    Uso:
+        for row in stream_rows("SELECT * FROM epicos WHERE id_cliente = %s", (1,)):
+            ...
+    """
+    cursor_kwargs = {"name": f"maestro_stream_{uuid.uuid4().hex}"}
+    if row_factory is not None:
+        cursor_kwargs["cursor_factory"] = psycopg2.extensions.cursor
+
+    with get_db_connection() as conn:
+        with conn.cursor(**cursor_kwargs) as cur:
+            cur.itersize = itersize
+            cur.execute(query, params)
+            converter = None
+            for row in cur:
+                if row_factory is not None:
+                    # Em cursores nomeados a descrição só existe após o primeiro fetch
+                    if converter is None:
+                        converter = row_factory([col.name for col in cur.description])
+                    row = converter(row)
+                yield row
 
 
 def test_connection():
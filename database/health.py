@@ -0,0 +1,119 @@
+"""
+Monitor de saúde do banco de dados com cache em memória.
+
+Uma thread em segundo plano verifica a conexão a cada `DB_HEALTH_TTL`
+segundos; as telas leem apenas o último status conhecido, sem abrir
+conexões a cada rerun do Streamlit. Até a primeira verificação terminar, o
+status fica pendente (`pending=True`), sem bloquear quem o lê.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from database.connection import get_db_connection
+from observability.metrics import db_health_checked
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HealthStatus:
+    """Resultado da última verificação de saúde do banco."""
+
+    ok: bool
+    latency_ms: Optional[float] = None
+    checked_at: Optional[datetime] = None
+    error: Optional[str] = None
+    pending: bool = False
+
+
+class DatabaseHealthMonitor:
+    """
+    Executa `SELECT 1` periodicamente e guarda o último status conhecido.
+
+    Args:
+        ttl: Intervalo em segundos entre verificações
+    """
+
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._status = HealthStatus(ok=False, error="Verificação em andamento", pending=True)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Inicia a thread de monitoramento, que faz a primeira verificação."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="maestro-db-health", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Interrompe a thread de monitoramento."""
+        self._stop.set()
+
+    def status(self) -> HealthStatus:
+        """Retorna o último status conhecido (sem acessar o banco)."""
+        return self._status
+
+    def check(self) -> HealthStatus:
+        """Executa uma verificação imediatamente e atualiza o status."""
+        start = time.perf_counter()
+        try:
+            with get_db_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1 as test")
+                    cur.fetchone()
+            latency = time.perf_counter() - start
+            status = HealthStatus(
+                ok=True,
+                latency_ms=latency * 1000,
+                checked_at=datetime.now(),
+            )
+        except Exception as e:
+            latency = None
+            logger.warning("Falha na verificação de saúde do banco: %s", e)
+            status = HealthStatus(ok=False, checked_at=datetime.now(), error=str(e))
+
+        self._status = status
+        db_health_checked(status.ok, latency)
+        return status
+
+    def _run(self) -> None:
+        # A primeira verificação roda já na thread: com o banco fora do ar,
+        # a conexão pode demorar até o timeout e não deve travar a tela
+        self.check()
+        while not self._stop.wait(self.ttl):
+            self.check()
+
+
+_MONITOR: Optional[DatabaseHealthMonitor] = None
+_MONITOR_LOCK = threading.Lock()
+
+
+def get_health_monitor() -> DatabaseHealthMonitor:
+    """Retorna o monitor do processo, iniciando-o na primeira chamada."""
+    global _MONITOR
+    if _MONITOR is not None:
+        return _MONITOR
+
+    with _MONITOR_LOCK:
+        if _MONITOR is None:
+            monitor = DatabaseHealthMonitor(ttl=float(os.getenv("DB_HEALTH_TTL", "30")))
+            monitor.start()
+            _MONITOR = monitor
+        return _MONITOR
+
+
+def get_db_health() -> HealthStatus:
+    """Retorna o último status de saúde do banco lido da memória."""
+    return get_health_monitor().status()
@@ -0,0 +1,343 @@
+"""
+Index advisor: executa as consultas de leitura dos repositórios com
+EXPLAIN (ANALYZE, BUFFERS) e falha se alguma fizer Seq Scan sobre mais
+linhas que o limite.
+
+As consultas são capturadas chamando as próprias funções dos repositórios
+com um pool cujas conexões registram cada `cursor.execute`; assim a
+verificação acompanha o SQL real, inclusive filtros dinâmicos.
+
+Pensado para um Postgres local/CI com as migrações aplicadas:
+
+    python -m database.migrations
+    python -m database.index_advisor --seed 100000
+    python -m database.index_advisor --threshold 5000
+
+Sai com código 1 se houver regressão (útil em pipelines).
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Consultas precisam ir ao banco: sem cache de repositório nem listener
+os.environ.setdefault("REPO_CACHE_ENABLED", "false")
+os.environ.setdefault("REPO_CACHE_NOTIFY", "false")
+
+import psycopg2
+from psycopg2.extensions import connection as _BaseConnection
+from psycopg2.extensions import cursor as _BaseCursor
+from psycopg2.extensions import parse_dsn
+
+from database.connection import ConnectionPool, get_database_url, install_pool
+
+_LOCAL_HOSTS = {"", "localhost", "127.0.0.1", "::1", "postgres", "db"}
+
+_captured: List[str] = []
+_capturing_factories: Dict[type, type] = {}
+
+
+def _capturing(factory: type) -> type:
+    """Subclasse da cursor factory que registra o SQL de cada execute."""
+    if factory not in _capturing_factories:
+        def execute(self, query, vars=None):
+            _captured.append(self.mogrify(query, vars).decode("utf-8"))
+            return factory.execute(self, query, vars)
+
+        _capturing_factories[factory] = type(
+            f"Capturing{factory.__name__}", (factory,), {"execute": execute}
+        )
+    return _capturing_factories[factory]
+
+
+class CapturingConnection(_BaseConnection):
+    """Conexão cujos cursores registram as consultas executadas."""
+
+    def cursor(self, *args, **kwargs):
+        factory = kwargs.get("cursor_factory") or self.cursor_factory or _BaseCursor
+        kwargs["cursor_factory"] = _capturing(factory)
+        return super().cursor(*args, **kwargs)
+
+
+@dataclass
+class SeqScan:
+    """Um nó Seq Scan encontrado no plano."""
+
+    relation: str
+    rows_scanned: int
+
+
+@dataclass
+class QueryReport:
+    """Resultado do EXPLAIN de uma consulta capturada."""
+
+    scenario: str
+    sql: str
+    execution_ms: float
+    seq_scans: List[SeqScan]
+
+
+# ----------------------------------------------------------------------
+# Cenários: funções de leitura dos repositórios
+# ----------------------------------------------------------------------
+
+def _scenarios(id_epico: Optional[int]) -> List[Tuple[str, Callable[[], object]]]:
+    from repositories import (
+        acoes_repository,
+        analises_repository,
+        epicos_repository,
+        painel_repository,
+        prompts_repository,
+        tag_acoes_repository,
+        tags_repository,
+    )
+
+    scenarios = [
+        ("listar_epicos", epicos_repository.listar_epicos),
+        ("listar_epicos_pagina", epicos_repository.listar_epicos_pagina),
+        ("tabela_epicos_pagina", epicos_repository.tabela_epicos_pagina),
+        ("iterar_epicos", lambda: list(itertools.islice(epicos_repository.iterar_epicos(), 1))),
+        ("buscar_epicos", lambda: epicos_repository.buscar_epicos("integração sistema")),
+        ("contar_epicos", epicos_repository.contar_epicos),
+        ("listar_analises", analises_repository.listar_analises),
+        ("tabela_analises_pagina", analises_repository.tabela_analises_pagina),
+        ("iterar_analises", lambda: list(itertools.islice(analises_repository.iterar_analises(), 1))),
+        ("buscar_em_resultados", lambda: analises_repository.buscar_em_resultados("integração")),
+        ("contar_analises", analises_repository.contar_analises),
+        ("listar_prompts", prompts_repository.listar_prompts),
+        ("listar_prompts_opcoes", prompts_repository.listar_prompts_opcoes),
+        ("listar_tags", tags_repository.listar_tags),
+        ("listar_tags_opcoes", tags_repository.listar_tags_opcoes),
+        ("listar_acoes", acoes_repository.listar_acoes),
+        ("listar_tag_acoes", tag_acoes_repository.listar_tag_acoes),
+        ("resumo_painel", painel_repository.resumo_painel),
+    ]
+
+    if id_epico is not None:
+        scenarios += [
+            ("buscar_epico_por_id", lambda: epicos_repository.buscar_epico_por_id(id_epico)),
+            ("buscar_analises_por_epico", lambda: analises_repository.buscar_analises_por_epico(id_epico)),
+            ("buscar_ultima_analise_epico", lambda: analises_repository.buscar_ultima_analise_epico(id_epico)),
+            (
+                "tabela_analises_pagina[id_epico]",
+                lambda: analises_repository.tabela_analises_pagina(id_epico=id_epico),
+            ),
+        ]
+
+    return scenarios
+
+
+def capture_queries(id_epico: Optional[int]) -> List[Tuple[str, str]]:
+    """
+    Executa os cenários e retorna (cenário, SQL) das consultas de leitura.
+
+    Raises:
+        RuntimeError: Se algum cenário falhar
+    """
+    queries: List[Tuple[str, str]] = []
+    seen = set()
+
+    for name, func in _scenarios(id_epico):
+        _captured.clear()
+        try:
+            func()
+        except Exception as e:
+            raise RuntimeError(f"Cenário {name} falhou: {e}") from e
+
+        for sql in _captured:
+            normalized = sql.strip()
+            head = normalized.split(None, 1)[0].upper() if normalized else ""
+            if head not in ("SELECT", "WITH") or normalized in seen:
+                continue
+            seen.add(normalized)
+            queries.append((name, normalized))
+
+    return queries
+
+
+# ----------------------------------------------------------------------
+# EXPLAIN
+# ----------------------------------------------------------------------
+
+def _walk(plan: Dict, found: List[SeqScan]) -> None:
+    if plan.get("Node Type") == "Seq Scan":
+        loops = plan.get("Actual Loops", 1) or 1
+        rows = plan.get("Actual Rows", 0) + plan.get("Rows Removed by Filter", 0)
+        found.append(SeqScan(plan.get("Relation Name", "?"), int(rows * loops)))
+    for child in plan.get("Plans", []):
+        _walk(child, found)
+
+
+def explain(conn, scenario: str, sql: str) -> QueryReport:
+    """Executa EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) e desfaz a transação."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql)
+            result = cur.fetchone()[0]
+    finally:
+        conn.rollback()
+
+    plan = (json.loads(result) if isinstance(result, str) else result)[0]
+    seq_scans: List[SeqScan] = []
+    _walk(plan["Plan"], seq_scans)
+    return QueryReport(scenario, sql, plan.get("Execution Time", 0.0), seq_scans)
+
+
+def first_epic_with_analyses(conn, id_cliente: int) -> Optional[int]:
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT e.id_epico
+            FROM epicos e
+            WHERE e.id_cliente = %s
+              AND EXISTS (SELECT 1 FROM prompt_execucoes pe WHERE pe.id_epico = e.id_epico)
+            LIMIT 1
+        """, (id_cliente,))
+        row = cur.fetchone()
+    conn.rollback()
+    return row[0] if row else None
+
+
+# ----------------------------------------------------------------------
+# Carga de dados sintéticos
+# ----------------------------------------------------------------------
+
+def seed(conn, id_cliente: int, epicos: int, execucoes_por_epico: int) -> None:
+    """
+    Insere épicos e execuções sintéticos (external_id 'SEED-*') e roda ANALYZE.
+
+    Usa o primeiro prompt ativo do cliente ou cria um "Prompt de carga".
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT id_prompt FROM prompts
+            WHERE id_cliente = %s AND ativo = true
+            ORDER BY id_prompt LIMIT 1
+        """, (id_cliente,))
+        row = cur.fetchone()
+        if row:
+            id_prompt = row[0]
+        else:
+            cur.execute("""
+                INSERT INTO prompts (id_cliente, nome, contexto, versao, template_prompt, ativo)
+                VALUES (%s, 'Prompt de carga', 'carga', '1.0.0', 'Analise: {descricao}', true)
+                RETURNING id_prompt
+            """, (id_cliente,))
+            id_prompt = cur.fetchone()[0]
+
+        cur.execute("""
+            INSERT INTO epicos (
+                id_cliente, origem, external_id, titulo, descricao_inicial,
+                tag_atual, status, criado_em, atualizado_em
+            )
+            SELECT
+                %s,
+                'manual',
+                'SEED-' || g || '-' || md5(random()::text),
+                'Épico de carga ' || g || ' integração sistema ' || (g %% 97),
+                repeat('Descrição do épico de carga com requisitos de negócio. ', 5) || md5(g::text),
+                (ARRAY['analise_pre', 'wbs', 'refino'])[1 + g %% 3],
+                'em_analise',
+                NOW() - (g || ' minutes')::interval,
+                NOW() - (g || ' minutes')::interval
+            FROM generate_series(1, %s) AS g
+            RETURNING id_epico
+        """, (id_cliente, epicos))
+        ids = [r[0] for r in cur.fetchall()]
+
+        cur.execute("""
+            INSERT INTO prompt_execucoes (
+                id_epico, id_prompt, executado_em, resposta_gpt, status,
+                tokens_consumidos, custo_estimado, tempo_execucao_ms
+            )
+            SELECT
+                e.id_epico,
+                %s,
+                NOW() - (random() * interval '365 days'),
+                '## Análise\n' || repeat('Resultado da análise com pontos de integração e riscos. ', 20) || md5(random()::text),
+                CASE WHEN random() < 0.95 THEN 'sucesso' ELSE 'erro' END,
+                (500 + random() * 4000)::int,
+                round((random() * 0.05)::numeric, 6),
+                (800 + random() * 20000)::int
+            FROM unnest(%s::int[]) AS e(id_epico)
+            CROSS JOIN generate_series(1, %s)
+        """, (id_prompt, ids, execucoes_por_epico))
+
+    conn.commit()
+
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("ANALYZE epicos")
+            cur.execute("ANALYZE prompt_execucoes")
+    finally:
+        conn.autocommit = False
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Verifica com EXPLAIN ANALYZE se as consultas dos repositórios usam índices."
+    )
+    parser.add_argument("--threshold", type=int, default=10000,
+                        help="linhas lidas por Seq Scan a partir das quais a consulta falha (padrão: 10000)")
+    parser.add_argument("--seed", type=int, metavar="EPICOS",
+                        help="insere EPICOS épicos sintéticos (e execuções) antes de verificar")
+    parser.add_argument("--execucoes-por-epico", type=int, default=5,
+                        help="execuções sintéticas por épico no --seed (padrão: 5)")
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="permite --seed em host que não seja local")
+    parser.add_argument("--verbose", action="store_true", help="mostra o SQL de cada consulta")
+    args = parser.parse_args(argv)
+
+    dsn = get_database_url()
+    id_cliente = int(os.getenv("DEFAULT_CLIENT_ID", "1"))
+
+    if args.seed and not args.allow_remote:
+        host = parse_dsn(dsn).get("host", "")
+        if host not in _LOCAL_HOSTS:
+            print(f"[ERRO] --seed recusado para o host {host!r} (use --allow-remote)", file=sys.stderr)
+            return 2
+
+    conn = psycopg2.connect(dsn)
+    try:
+        if args.seed:
+            print(f"Inserindo {args.seed} épicos sintéticos...")
+            seed(conn, id_cliente, args.seed, args.execucoes_por_epico)
+
+        install_pool(ConnectionPool(
+            dsn, min_size=0, max_size=2, pre_ping=False,
+            connection_factory=CapturingConnection,
+        ))
+
+        queries = capture_queries(first_epic_with_analyses(conn, id_cliente))
+        reports = [explain(conn, scenario, sql) for scenario, sql in queries]
+    except (psycopg2.Error, RuntimeError) as e:
+        print(f"[ERRO] {e}", file=sys.stderr)
+        return 2
+    finally:
+        conn.close()
+
+    failures = 0
+    for report in reports:
+        offenders = [s for s in report.seq_scans if s.rows_scanned > args.threshold]
+        status = "FALHA" if offenders else "OK"
+        failures += bool(offenders)
+
+        scans = ", ".join(f"{s.relation}={s.rows_scanned}" for s in report.seq_scans) or "-"
+        print(f"[{status}] {report.scenario}: {report.execution_ms:.1f} ms; seq scans: {scans}")
+        if args.verbose or offenders:
+            print("    " + " ".join(report.sql.split()))
+
+    print(f"\n{len(reports)} consultas verificadas, {failures} com Seq Scan acima de {args.threshold} linhas.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
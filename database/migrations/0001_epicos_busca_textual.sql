@@ -0,0 +1,14 @@
+-- Busca textual em épicos (buscar_epicos).
+-- Vetor gerado a partir do título (peso A) e da descrição (peso B) com a
+-- configuração 'portuguese', indexado com GIN.
+-- Atenção: ADD COLUMN ... STORED reescreve a tabela epicos.
+
+ALTER TABLE epicos
+    ADD COLUMN IF NOT EXISTS busca_tsv tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', coalesce(titulo, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(descricao_inicial, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_epicos_busca_tsv
+    ON epicos USING GIN (busca_tsv);
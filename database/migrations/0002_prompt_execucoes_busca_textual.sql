@@ -0,0 +1,32 @@
+-- Busca textual nos resultados das análises (buscar_em_resultados).
+-- A coluna é mantida por trigger (e não GENERATED) para que a migração não
+-- reescreva prompt_execucoes de uma vez: as linhas existentes são
+-- preenchidas em lotes pela migração 0003.
+
+ALTER TABLE prompt_execucoes
+    ADD COLUMN IF NOT EXISTS resposta_tsv tsvector;
+
+-- Limita o texto indexado: um tsvector não pode passar de 1 MB
+CREATE OR REPLACE FUNCTION maestro_resposta_tsv(resposta text)
+RETURNS tsvector
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT to_tsvector('portuguese'::regconfig, left(resposta, 250000))
+$$;
+
+CREATE OR REPLACE FUNCTION prompt_execucoes_atualizar_resposta_tsv()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.resposta_tsv := maestro_resposta_tsv(NEW.resposta_gpt);
+    RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_prompt_execucoes_resposta_tsv ON prompt_execucoes;
+
+CREATE TRIGGER trg_prompt_execucoes_resposta_tsv
+    BEFORE INSERT OR UPDATE OF resposta_gpt ON prompt_execucoes
+    FOR EACH ROW
+    EXECUTE FUNCTION prompt_execucoes_atualizar_resposta_tsv();
@@ -0,0 +1,37 @@
+-- maestro:no-transaction
+-- Preenche resposta_tsv das execuções existentes em faixas de 5000 ids
+-- (pela chave primária), com COMMIT a cada faixa: sem transação longa nem
+-- bloqueio da tabela inteira. Depois cria o índice GIN sem bloquear escritas.
+
+DO $$
+DECLARE
+    ultimo bigint := 0;
+    proximo bigint;
+BEGIN
+    LOOP
+        SELECT max(id_execucao) INTO proximo
+        FROM (
+            SELECT id_execucao
+            FROM prompt_execucoes
+            WHERE id_execucao > ultimo
+            ORDER BY id_execucao
+            LIMIT 5000
+        ) faixa;
+
+        EXIT WHEN proximo IS NULL;
+
+        UPDATE prompt_execucoes
+        SET resposta_tsv = maestro_resposta_tsv(resposta_gpt)
+        WHERE id_execucao > ultimo
+          AND id_execucao <= proximo
+          AND resposta_gpt IS NOT NULL
+          AND resposta_tsv IS NULL;
+
+        ultimo := proximo;
+        COMMIT;
+    END LOOP;
+END
+$$;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_prompt_execucoes_resposta_tsv
+    ON prompt_execucoes USING GIN (resposta_tsv);
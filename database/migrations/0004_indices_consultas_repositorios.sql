@@ -0,0 +1,43 @@
+-- maestro:no-transaction
+-- Índices para as consultas frequentes dos repositórios.
+-- Criados com CONCURRENTLY para não bloquear escritas; conferidos pelo
+-- index advisor (python -m database.index_advisor).
+-- Se um CREATE INDEX CONCURRENTLY falhar, o índice fica INVALID e o
+-- IF NOT EXISTS o ignoraria: remova-o (DROP INDEX CONCURRENTLY) antes de
+-- reaplicar a migração.
+
+-- buscar_analises_por_epico / iterar_analises_por_epico / buscar_ultima_analise_epico:
+--   WHERE id_epico = %s ORDER BY executado_em DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_prompt_execucoes_epico_executado
+    ON prompt_execucoes (id_epico, executado_em DESC);
+
+-- listar_analises_pagina / tabela_analises_pagina: keyset (executado_em, id_execucao)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_prompt_execucoes_executado_id
+    ON prompt_execucoes (executado_em DESC, id_execucao DESC);
+
+-- listar_analises / iterar_analises: apenas execuções com resposta
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_prompt_execucoes_sucesso_executado
+    ON prompt_execucoes (executado_em DESC)
+    WHERE status = 'sucesso' AND resposta_gpt IS NOT NULL;
+
+-- listar_prompts: contagem de execuções por prompt
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_prompt_execucoes_prompt
+    ON prompt_execucoes (id_prompt);
+
+-- listar_epicos / listar_epicos_pagina / tabela_epicos_pagina:
+--   WHERE id_cliente = %s ORDER BY atualizado_em DESC, id_epico DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_epicos_cliente_atualizado
+    ON epicos (id_cliente, atualizado_em DESC, id_epico DESC);
+
+-- listar_tags (usos por tag) e filtros por tag: WHERE id_cliente = %s AND tag_atual = %s
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_epicos_cliente_tag
+    ON epicos (id_cliente, tag_atual);
+
+-- listar_tag_acoes / contagem de ações por tag: apenas associações ativas
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tag_acoes_ativas_tag
+    ON tag_acoes (id_tag, prioridade)
+    WHERE ativo = true;
+
+-- buscar_tag_por_nome / listar_tags
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tags_cliente_nome
+    ON tags (id_cliente, nome);
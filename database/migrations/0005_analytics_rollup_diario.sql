@@ -0,0 +1,46 @@
+-- Rollup diário de custos, tokens e latência das execuções (página Custos).
+-- Mantido incrementalmente por jobs.rollup_analises a partir da marca
+-- d'água (executado_em, id_execucao) guardada em analytics_watermarks.
+--
+-- latencia_buckets: contagem de execuções por faixa de tempo_execucao_ms,
+-- com os limites de repositories.analytics_repository.LIMITES_LATENCIA_MS
+-- (a última posição conta as execuções acima do maior limite).
+
+CREATE TABLE IF NOT EXISTS analytics_execucoes_diarias (
+    dia DATE NOT NULL,
+    id_cliente INTEGER NOT NULL,
+    id_epico INTEGER NOT NULL,
+    id_prompt INTEGER NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    execucoes BIGINT NOT NULL DEFAULT 0,
+    tokens BIGINT NOT NULL DEFAULT 0,
+    custo NUMERIC(18, 6) NOT NULL DEFAULT 0,
+    tempo_total_ms BIGINT NOT NULL DEFAULT 0,
+    latencia_buckets BIGINT[] NOT NULL,
+    PRIMARY KEY (id_cliente, dia, id_prompt, id_epico, status)
+);
+
+CREATE INDEX IF NOT EXISTS idx_analytics_execucoes_diarias_epico
+    ON analytics_execucoes_diarias (id_epico, dia);
+
+CREATE TABLE IF NOT EXISTS analytics_watermarks (
+    nome TEXT PRIMARY KEY,
+    executado_em TIMESTAMPTZ NOT NULL,
+    id_execucao BIGINT NOT NULL,
+    atualizado_em TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Soma elemento a elemento de dois histogramas de latência
+CREATE OR REPLACE FUNCTION maestro_somar_buckets(a BIGINT[], b BIGINT[])
+RETURNS BIGINT[]
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT array_agg(COALESCE(x, 0) + COALESCE(y, 0) ORDER BY i)
+    FROM unnest(a, b) WITH ORDINALITY AS u(x, y, i)
+$$;
+
+-- Agregado que soma histogramas de várias linhas (consultas da página Custos)
+CREATE OR REPLACE AGGREGATE maestro_soma_buckets(BIGINT[]) (
+    SFUNC = maestro_somar_buckets,
+    STYPE = BIGINT[]
+);
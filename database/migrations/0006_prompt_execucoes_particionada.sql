@@ -0,0 +1,189 @@
+-- Particiona prompt_execucoes por mês de executado_em (RANGE).
+--
+-- A tabela atual é renomeada para prompt_execucoes_legado e mantida intacta
+-- (para conferência ou rollback manual); uma nova prompt_execucoes
+-- particionada, com as mesmas colunas, recebe uma cópia dos dados. As
+-- partições futuras são criadas por jobs.particoes_execucoes.
+--
+-- Requer PostgreSQL 13+ (trigger BEFORE ROW em tabela particionada).
+-- Roda em uma única transação com a tabela travada (ACCESS EXCLUSIVE):
+-- leituras e escritas em prompt_execucoes esperam até o fim da cópia, então
+-- aplique em janela de manutenção.
+--
+-- Limitações:
+--   * a chave primária passa a ser (id_execucao, executado_em): índices
+--     únicos e chaves estrangeiras que apontem para prompt_execucoes precisam
+--     incluir executado_em (a migração aborta se encontrar FKs de entrada);
+--   * GRANTs, views e outros índices criados fora destas migrações continuam
+--     apontando para prompt_execucoes_legado e devem ser recriados;
+--   * executado_em passa a ser obrigatório (NOT NULL).
+
+-- Cria a partição de um mês, movendo para ela as linhas que já estiverem na
+-- partição DEFAULT naquele intervalo. Limites calculados em UTC para que
+-- sessões com fusos diferentes gerem as mesmas partições.
+CREATE OR REPLACE FUNCTION maestro_criar_particao_execucoes(mes date)
+RETURNS boolean
+LANGUAGE plpgsql
+SET timezone = 'UTC'
+AS $$
+DECLARE
+    inicio date := date_trunc('month', mes)::date;
+    fim date := (date_trunc('month', mes) + interval '1 month')::date;
+    nome text := 'prompt_execucoes_p' || to_char(mes, 'YYYY_MM');
+BEGIN
+    IF to_regclass(nome) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE prompt_execucoes INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE)',
+        nome
+    );
+
+    IF to_regclass('prompt_execucoes_default') IS NOT NULL THEN
+        EXECUTE format(
+            'WITH movidas AS (
+                 DELETE FROM prompt_execucoes_default
+                 WHERE executado_em >= %L AND executado_em < %L
+                 RETURNING *
+             )
+             INSERT INTO %I SELECT * FROM movidas',
+            inicio, fim, nome
+        );
+    END IF;
+
+    EXECUTE format(
+        'ALTER TABLE prompt_execucoes ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        nome, inicio, fim
+    );
+    RETURN true;
+END
+$$;
+
+-- Cria as partições mensais de `inicio` até `fim` (inclusive); retorna quantas eram novas
+CREATE OR REPLACE FUNCTION maestro_criar_particoes_execucoes(inicio date, fim date)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    mes date := date_trunc('month', inicio)::date;
+    criadas integer := 0;
+BEGIN
+    WHILE mes <= fim LOOP
+        IF maestro_criar_particao_execucoes(mes) THEN
+            criadas := criadas + 1;
+        END IF;
+        mes := (mes + interval '1 month')::date;
+    END LOOP;
+    RETURN criadas;
+END
+$$;
+
+DO $$
+DECLARE
+    r record;
+    sequencia text;
+    identidade boolean;
+    primeiro date;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_partitioned_table
+        WHERE partrelid = to_regclass('prompt_execucoes')
+    ) THEN
+        RAISE NOTICE 'prompt_execucoes já é particionada';
+        RETURN;
+    END IF;
+
+    LOCK TABLE prompt_execucoes IN ACCESS EXCLUSIVE MODE;
+
+    IF EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE confrelid = 'prompt_execucoes'::regclass AND contype = 'f'
+    ) THEN
+        RAISE EXCEPTION 'Há chaves estrangeiras apontando para prompt_execucoes; ajuste-as para incluir executado_em antes de particionar';
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM prompt_execucoes WHERE executado_em IS NULL) THEN
+        RAISE EXCEPTION 'Há execuções sem executado_em; preencha a coluna antes de particionar';
+    END IF;
+
+    -- Libera os nomes: a tabela e os índices atuais ganham o sufixo _legado
+    ALTER TABLE prompt_execucoes RENAME TO prompt_execucoes_legado;
+    FOR r IN
+        SELECT c.relname
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = 'prompt_execucoes_legado'::regclass
+    LOOP
+        EXECUTE format('ALTER INDEX %I RENAME TO %I', r.relname, left(r.relname, 56) || '_legado');
+    END LOOP;
+
+    CREATE TABLE prompt_execucoes (
+        LIKE prompt_execucoes_legado INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE
+    ) PARTITION BY RANGE (executado_em);
+
+    ALTER TABLE prompt_execucoes ALTER COLUMN executado_em SET NOT NULL;
+
+    -- Chaves estrangeiras de saída (épico, prompt) com os mesmos nomes
+    FOR r IN
+        SELECT conname, pg_get_constraintdef(oid) AS definicao
+        FROM pg_constraint
+        WHERE conrelid = 'prompt_execucoes_legado'::regclass AND contype = 'f'
+    LOOP
+        EXECUTE format('ALTER TABLE prompt_execucoes ADD CONSTRAINT %I %s', r.conname, r.definicao);
+    END LOOP;
+
+    -- id_execucao: a sequência passa a pertencer à nova tabela. Colunas
+    -- IDENTITY não são suportadas em tabelas particionadas (PG < 17), então
+    -- nesse caso a nova coluna usa uma sequência comum a partir do maior id
+    -- (a sequência da identidade antiga continua com a tabela legado).
+    SELECT a.attidentity <> '' INTO identidade
+    FROM pg_attribute a
+    WHERE a.attrelid = 'prompt_execucoes_legado'::regclass AND a.attname = 'id_execucao';
+
+    IF identidade THEN
+        CREATE SEQUENCE prompt_execucoes_id_execucao_part_seq OWNED BY prompt_execucoes.id_execucao;
+        PERFORM setval(
+            'prompt_execucoes_id_execucao_part_seq',
+            GREATEST((SELECT max(id_execucao) FROM prompt_execucoes_legado), 1)
+        );
+        ALTER TABLE prompt_execucoes
+            ALTER COLUMN id_execucao SET DEFAULT nextval('prompt_execucoes_id_execucao_part_seq');
+    ELSE
+        sequencia := pg_get_serial_sequence('prompt_execucoes_legado', 'id_execucao');
+        IF sequencia IS NOT NULL THEN
+            EXECUTE format('ALTER SEQUENCE %s OWNED BY prompt_execucoes.id_execucao', sequencia);
+        END IF;
+    END IF;
+
+    ALTER TABLE prompt_execucoes ADD PRIMARY KEY (id_execucao, executado_em);
+
+    -- Partições do histórico até três meses à frente, mais a DEFAULT
+    SELECT COALESCE(min(executado_em), NOW())::date INTO primeiro FROM prompt_execucoes_legado;
+    PERFORM maestro_criar_particoes_execucoes(primeiro, (NOW() + interval '3 months')::date);
+    CREATE TABLE prompt_execucoes_default PARTITION OF prompt_execucoes DEFAULT;
+
+    -- Copia os dados (resposta_tsv já preenchida; o trigger só é criado depois)
+    INSERT INTO prompt_execucoes SELECT * FROM prompt_execucoes_legado;
+
+    -- Índices das migrações 0003/0004, criados em cada partição
+    CREATE INDEX idx_prompt_execucoes_epico_executado
+        ON prompt_execucoes (id_epico, executado_em DESC);
+    CREATE INDEX idx_prompt_execucoes_executado_id
+        ON prompt_execucoes (executado_em DESC, id_execucao DESC);
+    CREATE INDEX idx_prompt_execucoes_sucesso_executado
+        ON prompt_execucoes (executado_em DESC)
+        WHERE status = 'sucesso' AND resposta_gpt IS NOT NULL;
+    CREATE INDEX idx_prompt_execucoes_prompt
+        ON prompt_execucoes (id_prompt);
+    CREATE INDEX idx_prompt_execucoes_resposta_tsv
+        ON prompt_execucoes USING GIN (resposta_tsv);
+
+    CREATE TRIGGER trg_prompt_execucoes_resposta_tsv
+        BEFORE INSERT OR UPDATE OF resposta_gpt ON prompt_execucoes
+        FOR EACH ROW
+        EXECUTE FUNCTION prompt_execucoes_atualizar_resposta_tsv();
+END
+$$;
+
+ANALYZE prompt_execucoes;
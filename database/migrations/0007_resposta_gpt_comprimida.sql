@@ -0,0 +1,46 @@
+-- Cópia comprimida opcional de resposta_gpt (repositories.compressao), gravada
+-- por jobs.comprimir_respostas. Os repositórios preferem a cópia comprimida
+-- quando existe; com --limpar-texto o job também remove o texto original.
+--
+-- O PostgreSQL já comprime (TOAST/pglz) textos grandes no disco, então o
+-- ganho principal é de bytes trafegados por leitura e, com o texto
+-- removido, de espaço (zstd/zlib comprimem mais que pglz).
+--
+-- A criação do novo índice parcial bloqueia escritas em prompt_execucoes
+-- durante a construção (índices em tabela particionada não aceitam
+-- CONCURRENTLY).
+
+ALTER TABLE prompt_execucoes
+    ADD COLUMN IF NOT EXISTS resposta_gpt_comprimida bytea;
+
+-- Os dados já vêm comprimidos: não tenta comprimi-los de novo no TOAST
+ALTER TABLE prompt_execucoes
+    ALTER COLUMN resposta_gpt_comprimida SET STORAGE EXTERNAL;
+
+-- resposta_tsv continua vindo do texto. Quando o job remove o texto (mantendo
+-- a cópia comprimida), o tsvector já calculado é preservado; quando o
+-- backend grava um texto novo, a cópia comprimida desatualizada é descartada.
+CREATE OR REPLACE FUNCTION prompt_execucoes_atualizar_resposta_tsv()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW.resposta_gpt IS NOT NULL THEN
+        NEW.resposta_tsv := maestro_resposta_tsv(NEW.resposta_gpt);
+        IF TG_OP = 'UPDATE' AND NEW.resposta_gpt IS DISTINCT FROM OLD.resposta_gpt THEN
+            NEW.resposta_gpt_comprimida := NULL;
+        END IF;
+    ELSIF NEW.resposta_gpt_comprimida IS NULL THEN
+        NEW.resposta_tsv := NULL;
+    END IF;
+    RETURN NEW;
+END
+$$;
+
+-- listar_analises / iterar_analises: execuções com resposta (texto ou comprimida)
+CREATE INDEX IF NOT EXISTS idx_prompt_execucoes_sucesso_resposta
+    ON prompt_execucoes (executado_em DESC)
+    WHERE status = 'sucesso'
+      AND (resposta_gpt IS NOT NULL OR resposta_gpt_comprimida IS NOT NULL);
+
+DROP INDEX IF EXISTS idx_prompt_execucoes_sucesso_executado;
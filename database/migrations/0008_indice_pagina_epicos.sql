@@ -0,0 +1,10 @@
+-- maestro:no-transaction
+-- listar_epicos_pagina / tabela_epicos_pagina ordenam por
+-- COALESCE(atualizado_em, criado_em) (épicos nunca alterados podem ter
+-- atualizado_em NULL); o índice de 0004 sobre atualizado_em não atende
+-- essa expressão.
+-- Se o CREATE INDEX CONCURRENTLY falhar, remova o índice INVALID
+-- (DROP INDEX CONCURRENTLY) antes de reaplicar a migração.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_epicos_cliente_pagina
+    ON epicos (id_cliente, COALESCE(atualizado_em, criado_em) DESC, id_epico DESC);
@@ -0,0 +1,251 @@
+"""
+Migrações versionadas do schema usado pelo Maestro Front.
+
+Cada arquivo `NNNN_descricao.sql` deste diretório é uma migração. As
+migrações aplicadas ficam registradas na tabela `schema_migrations` e são
+executadas em ordem de versão, cada uma em sua própria transação.
+
+Migrações que não podem rodar em transação (ex.: CREATE INDEX CONCURRENTLY)
+devem começar com a linha `-- maestro:no-transaction`; nesse caso os
+comandos são executados um a um em autocommit e devem ser idempotentes
+(IF NOT EXISTS), pois uma falha no meio não desfaz os anteriores.
+
+Uso:
+    python -m database.migrations            # aplica as pendentes
+    python -m database.migrations --list     # mostra aplicadas/pendentes
+"""
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import psycopg2
+
+from database.connection import get_database_url
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent
+
+NO_TRANSACTION_MARKER = "-- maestro:no-transaction"
+
+# Impede que duas instâncias apliquem migrações ao mesmo tempo
+ADVISORY_LOCK_ID = 7_301_944_117
+
+_FILE_PATTERN = re.compile(r"^(\d{4})_(\w+)\.sql$")
+_DOLLAR_TAG = re.compile(r"\$[A-Za-z_]*\$")
+
+
+class MigrationError(Exception):
+    """Falha ao descobrir ou aplicar uma migração."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Um arquivo de migração."""
+
+    version: str
+    name: str
+    path: Path
+
+    @property
+    def sql(self) -> str:
+        return self.path.read_text(encoding="utf-8")
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.path.read_bytes()).hexdigest()
+
+    @property
+    def transactional(self) -> bool:
+        return not self.sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+
+    def statements(self) -> List[str]:
+        """Comandos da migração, para execução um a um (modo sem transação)."""
+        return split_statements(self.sql)
+
+
+def split_statements(sql: str) -> List[str]:
+    """
+    Separa um script SQL em comandos pelo `;`, respeitando comentários,
+    strings e blocos entre dollar quotes (corpos de função e DO).
+    """
+    comandos = []
+    inicio = 0
+    i = 0
+    n = len(sql)
+    while i < n:
+        if sql.startswith("--", i):
+            fim = sql.find("\n", i)
+            i = n if fim == -1 else fim + 1
+        elif sql[i] == "'":
+            fim = i + 1
+            while True:
+                fim = sql.find("'", fim)
+                if fim == -1 or not sql.startswith("''", fim):
+                    break
+                fim += 2
+            i = n if fim == -1 else fim + 1
+        elif sql[i] == "$" and (tag := _DOLLAR_TAG.match(sql, i)):
+            fim = sql.find(tag.group(), tag.end())
+            i = n if fim == -1 else fim + len(tag.group())
+        elif sql[i] == ";":
+            comandos.append(sql[inicio:i])
+            inicio = i = i + 1
+        else:
+            i += 1
+    comandos.append(sql[inicio:])
+
+    def _tem_codigo(trecho: str) -> bool:
+        return any(
+            linha.strip() and not linha.strip().startswith("--")
+            for linha in trecho.splitlines()
+        )
+
+    return [c.strip() for c in comandos if _tem_codigo(c)]
+
+
+def discover_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """
+    Lista as migrações do diretório em ordem de versão.
+
+    Raises:
+        MigrationError: Se duas migrações tiverem a mesma versão
+    """
+    migrations: Dict[str, Migration] = {}
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILE_PATTERN.match(path.name)
+        if not match:
+            logger.warning("Ignorando arquivo fora do padrão NNNN_nome.sql: %s", path.name)
+            continue
+
+        version, name = match.groups()
+        if version in migrations:
+            raise MigrationError(f"Versão de migração duplicada: {version}")
+        migrations[version] = Migration(version, name, path)
+
+    return [migrations[v] for v in sorted(migrations)]
+
+
+def _ensure_table(cur) -> None:
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(4) PRIMARY KEY,
+            name TEXT NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+
+
+def _applied(cur) -> Dict[str, str]:
+    cur.execute("SELECT version, checksum FROM schema_migrations")
+    return {version: checksum for version, checksum in cur.fetchall()}
+
+
+def migration_status(dsn: Optional[str] = None) -> List[Dict]:
+    """
+    Retorna o estado de cada migração conhecida.
+
+    Returns:
+        Lista de dicionários com version, name, applied e changed (arquivo
+        alterado depois de aplicado)
+    """
+    conn = psycopg2.connect(dsn or get_database_url())
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            _ensure_table(cur)
+            applied = _applied(cur)
+    finally:
+        conn.close()
+
+    return [
+        {
+            "version": m.version,
+            "name": m.name,
+            "applied": m.version in applied,
+            "changed": m.version in applied and applied[m.version].strip() != m.checksum,
+        }
+        for m in discover_migrations()
+    ]
+
+
+def apply_migrations(
+    target: Optional[str] = None,
+    dsn: Optional[str] = None,
+    dry_run: bool = False,
+) -> List[Migration]:
+    """
+    Aplica as migrações pendentes, em ordem, até `target` (inclusive).
+
+    Args:
+        target: Última versão a aplicar (None = todas)
+        dsn: URL do banco (usa get_database_url() se não fornecida)
+        dry_run: Se True, apenas retorna as pendentes sem aplicá-las
+
+    Returns:
+        Migrações aplicadas (ou que seriam aplicadas, em dry_run)
+
+    Raises:
+        MigrationError: Se uma migração falhar
+    """
+    conn = psycopg2.connect(dsn or get_database_url())
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            _ensure_table(cur)
+            cur.execute("SELECT pg_advisory_lock(%s)", (ADVISORY_LOCK_ID,))
+            try:
+                applied = _applied(cur)
+                pending = [
+                    m for m in discover_migrations()
+                    if m.version not in applied and (target is None or m.version <= target)
+                ]
+
+                for m in discover_migrations():
+                    if m.version in applied and applied[m.version].strip() != m.checksum:
+                        logger.warning("Migração %s_%s foi alterada após ser aplicada", m.version, m.name)
+
+                if dry_run:
+                    return pending
+
+                for migration in pending:
+                    _apply(conn, migration)
+
+                return pending
+            finally:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (ADVISORY_LOCK_ID,))
+    finally:
+        conn.close()
+
+
+def _apply(conn, migration: Migration) -> None:
+    logger.info("Aplicando migração %s_%s", migration.version, migration.name)
+    registro = (
+        "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+        (migration.version, migration.name, migration.checksum),
+    )
+
+    try:
+        if migration.transactional:
+            conn.autocommit = False
+            try:
+                with conn:
+                    with conn.cursor() as cur:
+                        cur.execute(migration.sql)
+                        cur.execute(*registro)
+            finally:
+                conn.autocommit = True
+        else:
+            with conn.cursor() as cur:
+                for statement in migration.statements():
+                    cur.execute(statement)
+                cur.execute(*registro)
+    except psycopg2.Error as e:
+        raise MigrationError(
+            f"Falha na migração {migration.version}_{migration.name}: {e}"
+        ) from e
@@ -0,0 +1,44 @@
+"""
+Linha de comando das migrações: python -m database.migrations [--list] [--target NNNN] [--dry-run]
+"""
+
+import argparse
+import logging
+import sys
+
+from database.migrations import MigrationError, apply_migrations, migration_status
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Aplica as migrações do schema do Maestro Front.")
+    parser.add_argument("--list", action="store_true", help="lista migrações aplicadas e pendentes")
+    parser.add_argument("--target", help="última versão a aplicar (ex.: 0003)")
+    parser.add_argument("--dry-run", action="store_true", help="mostra as pendentes sem aplicar")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    try:
+        if args.list:
+            for m in migration_status():
+                estado = "aplicada" if m["applied"] else "pendente"
+                if m["changed"]:
+                    estado += " (arquivo alterado)"
+                print(f"{m['version']}_{m['name']}: {estado}")
+            return 0
+
+        migrations = apply_migrations(target=args.target, dry_run=args.dry_run)
+    except MigrationError as e:
+        print(f"[ERRO] {e}", file=sys.stderr)
+        return 1
+
+    verbo = "Pendentes" if args.dry_run else "Aplicadas"
+    if migrations:
+        print(f"{verbo}: " + ", ".join(f"{m.version}_{m.name}" for m in migrations))
+    else:
+        print("Nenhuma migração pendente.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
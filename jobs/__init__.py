@@ -0,0 +1,3 @@
+"""
+Jobs de manutenção executados fora do Streamlit (python -m jobs.<nome>).
+"""
@@ -0,0 +1,163 @@
+"""
+Backfill de resposta_gpt_comprimida (migração 0007) para as execuções existentes.
+
+Lê as respostas ainda sem cópia comprimida em lotes (por id_execucao),
+comprime no Python (repositories.compressao) e grava a cópia. Cada lote é
+uma transação; o job pode ser interrompido e executado de novo.
+
+Uma linha só é atualizada se resposta_gpt não mudou desde a leitura
+(comparação por md5), para não gravar uma cópia desatualizada.
+
+Uso:
+    python -m jobs.comprimir_respostas                    # grava a cópia, mantém o texto
+    python -m jobs.comprimir_respostas --limpar-texto     # remove o texto após comprimir
+    python -m jobs.comprimir_respostas --formato zlib --lote 200
+"""
+
+import argparse
+import logging
+import sys
+from typing import Optional
+
+from psycopg2.extras import execute_values
+
+from database.connection import close_pool, transaction
+from repositories.compressao import FORMATOS, comprimir, formato_padrao
+from repositories.modelos import TupleCursor
+
+logger = logging.getLogger(__name__)
+
+LOTE_PADRAO = 500
+
+SQL_PROXIMO_LOTE = """
+    SELECT id_execucao, executado_em, resposta_gpt, md5(resposta_gpt)
+    FROM prompt_execucoes
+    WHERE id_execucao > %s
+      AND resposta_gpt IS NOT NULL{pendentes}
+    ORDER BY id_execucao
+    LIMIT %s
+"""
+
+SQL_GRAVAR = """
+    UPDATE prompt_execucoes pe
+    SET resposta_gpt_comprimida = v.dados{limpar}
+    FROM (VALUES %s) AS v(id_execucao, executado_em, dados, hash)
+    WHERE pe.id_execucao = v.id_execucao
+      AND pe.executado_em = v.executado_em
+      AND md5(pe.resposta_gpt) = v.hash
+"""
+
+
+def comprimir_lote(
+    ultimo_id: int,
+    tamanho_lote: int = LOTE_PADRAO,
+    formato: Optional[int] = None,
+    limpar_texto: bool = False,
+):
+    """
+    Comprime o próximo lote de respostas após `ultimo_id`.
+
+    Args:
+        ultimo_id: Maior id_execucao já processado
+        tamanho_lote: Número máximo de execuções por lote
+        formato: Formato de compressão (usa formato_padrao() se não fornecido)
+        limpar_texto: Se True, remove resposta_gpt das linhas comprimidas
+
+    Returns:
+        Tupla (maior id do lote ou None se não havia pendências,
+        linhas atualizadas, bytes de texto, bytes comprimidos)
+    """
+    if formato is None:
+        formato = formato_padrao()
+
+    # Ao limpar o texto, linhas já comprimidas em uma execução anterior
+    # também entram (a cópia é regravada e o texto removido)
+    selecao = SQL_PROXIMO_LOTE.format(
+        pendentes="" if limpar_texto else "\n      AND resposta_gpt_comprimida IS NULL"
+    )
+    query = SQL_GRAVAR.format(limpar=", resposta_gpt = NULL" if limpar_texto else "")
+
+    with transaction() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            cur.execute(selecao, (ultimo_id, tamanho_lote))
+            linhas = cur.fetchall()
+            if not linhas:
+                return None, 0, 0, 0
+
+            valores = []
+            bytes_texto = bytes_comprimidos = 0
+            for id_execucao, executado_em, resposta, hash_resposta in linhas:
+                dados = comprimir(resposta, formato)
+                bytes_texto += len(resposta.encode("utf-8"))
+                bytes_comprimidos += len(dados)
+                valores.append((id_execucao, executado_em, dados, hash_resposta))
+
+            execute_values(
+                cur, query, valores,
+                template="(%s::bigint, %s, %s::bytea, %s::text)",
+                page_size=tamanho_lote,
+            )
+            atualizadas = cur.rowcount
+
+    return linhas[-1][0], atualizadas, bytes_texto, bytes_comprimidos
+
+
+def comprimir_pendentes(
+    tamanho_lote: int = LOTE_PADRAO,
+    formato: Optional[int] = None,
+    limpar_texto: bool = False,
+) -> int:
+    """
+    Processa lotes até não haver respostas sem cópia comprimida.
+
+    Returns:
+        Total de execuções atualizadas
+    """
+    ultimo_id = 0
+    total = total_texto = total_comprimido = 0
+    while True:
+        maior_id, atualizadas, bytes_texto, bytes_comprimidos = comprimir_lote(
+            ultimo_id, tamanho_lote, formato, limpar_texto
+        )
+        if maior_id is None:
+            break
+
+        ultimo_id = maior_id
+        total += atualizadas
+        total_texto += bytes_texto
+        total_comprimido += bytes_comprimidos
+        logger.info("Respostas comprimidas: %s (até id %s)", total, ultimo_id)
+
+    if total_texto:
+        logger.info(
+            "Concluído: %s respostas, %.1f MB -> %.1f MB (%.0f%%)",
+            total, total_texto / 1e6, total_comprimido / 1e6, 100 * total_comprimido / total_texto,
+        )
+    return total
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Grava a cópia comprimida das respostas GPT existentes.")
+    parser.add_argument("--lote", type=int, default=LOTE_PADRAO,
+                        help=f"execuções por lote (padrão {LOTE_PADRAO})")
+    parser.add_argument("--formato", choices=sorted(FORMATOS),
+                        help="formato de compressão (padrão RESPOSTA_COMPRESSAO ou zstd, se instalado)")
+    parser.add_argument("--limpar-texto", action="store_true",
+                        help="remove resposta_gpt após gravar a cópia comprimida")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    try:
+        formato = FORMATOS[args.formato] if args.formato else None
+        comprimir_pendentes(args.lote, formato, args.limpar_texto)
+        return 0
+    except ValueError as e:
+        print(f"[ERRO] {e}", file=sys.stderr)
+        return 1
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
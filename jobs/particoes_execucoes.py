@@ -0,0 +1,85 @@
+"""
+Job que cria com antecedência as partições mensais de prompt_execucoes.
+
+As partições são criadas pela função maestro_criar_particoes_execucoes
+(migração 0006), que é idempotente: meses já existentes são ignorados e
+linhas que tenham caído na partição DEFAULT são movidas para a nova partição.
+
+Uso:
+    python -m jobs.particoes_execucoes                # verifica a cada PARTICOES_INTERVAL segundos
+    python -m jobs.particoes_execucoes --once         # cria as partições pendentes e sai
+    python -m jobs.particoes_execucoes --meses 6
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+
+from database.connection import close_pool, get_db_connection
+
+logger = logging.getLogger(__name__)
+
+MESES_PADRAO = int(os.getenv("PARTICOES_MESES_A_FRENTE", "3"))
+INTERVALO_PADRAO = int(os.getenv("PARTICOES_INTERVAL", "86400"))
+
+
+def criar_particoes_futuras(meses: int = MESES_PADRAO) -> int:
+    """
+    Garante as partições do mês atual até `meses` meses à frente.
+
+    Args:
+        meses: Quantidade de meses futuros com partição garantida
+
+    Returns:
+        Número de partições criadas nesta chamada
+    """
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT maestro_criar_particoes_execucoes(
+                    (NOW() AT TIME ZONE 'UTC')::date,
+                    ((NOW() AT TIME ZONE 'UTC') + make_interval(months => %s))::date
+                ) AS criadas
+            """, (meses,))
+            criadas = cur.fetchone()['criadas']
+
+    if criadas:
+        logger.info("Partições de prompt_execucoes criadas: %s", criadas)
+    return criadas
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cria as partições mensais futuras de prompt_execucoes.")
+    parser.add_argument("--once", action="store_true", help="cria as partições pendentes e sai")
+    parser.add_argument("--meses", type=int, default=MESES_PADRAO,
+                        help=f"meses à frente com partição garantida (padrão {MESES_PADRAO})")
+    parser.add_argument("--interval", type=int, default=INTERVALO_PADRAO,
+                        help=f"segundos entre verificações (padrão {INTERVALO_PADRAO})")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    try:
+        if args.once:
+            criar_particoes_futuras(args.meses)
+            return 0
+
+        parar = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: parar.set())
+        signal.signal(signal.SIGINT, lambda *_: parar.set())
+        while not parar.is_set():
+            try:
+                criar_particoes_futuras(args.meses)
+            except Exception:
+                logger.exception("Falha ao criar partições; nova tentativa em %ss", args.interval)
+            parar.wait(args.interval)
+        return 0
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
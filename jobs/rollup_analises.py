@@ -0,0 +1,249 @@
+"""
+Job do rollup diário de custos, tokens e latência (analytics_execucoes_diarias).
+
+Processa apenas as execuções posteriores à marca d'água (executado_em,
+id_execucao) guardada em analytics_watermarks, em lotes. Cada lote agrega as
+execuções e atualiza a marca na mesma transação, de modo que uma falha nunca
+conta uma execução duas vezes.
+
+Execuções mais recentes que ROLLUP_SETTLE_SECONDS ainda não entram no rollup:
+dá tempo para que transações abertas no backend (que gravam executado_em antes
+do commit) fiquem visíveis antes de a marca d'água passar por elas.
+
+Uso:
+    python -m jobs.rollup_analises                  # loop a cada ROLLUP_INTERVAL segundos
+    python -m jobs.rollup_analises --once           # processa o que houver e sai
+    python -m jobs.rollup_analises --reprocessar-desde 2026-01-01
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+from datetime import date
+from typing import Optional
+
+from database.connection import close_pool, transaction
+from repositories.analytics_repository import LIMITES_LATENCIA_MS, WATERMARK_ROLLUP
+from repositories.modelos import TupleCursor
+
+logger = logging.getLogger(__name__)
+
+INTERVALO_PADRAO = int(os.getenv("ROLLUP_INTERVAL", "300"))
+SETTLE_PADRAO = int(os.getenv("ROLLUP_SETTLE_SECONDS", "900"))
+LOTE_PADRAO = int(os.getenv("ROLLUP_BATCH_SIZE", "50000"))
+
+
+def _expressao_buckets() -> str:
+    """Monta o ARRAY[...] com a contagem de execuções por faixa de latência."""
+    faixas = []
+    inferior = None
+    for limite in LIMITES_LATENCIA_MS:
+        condicao = f"pe.tempo_execucao_ms < {limite}"
+        if inferior is not None:
+            condicao = f"pe.tempo_execucao_ms >= {inferior} AND {condicao}"
+        faixas.append(f"COUNT(*) FILTER (WHERE {condicao})")
+        inferior = limite
+    faixas.append(f"COUNT(*) FILTER (WHERE pe.tempo_execucao_ms >= {inferior})")
+    return "ARRAY[" + ", ".join(faixas) + "]::bigint[]"
+
+
+SQL_TRAVAR_WATERMARK = """
+    INSERT INTO analytics_watermarks (nome, executado_em, id_execucao)
+    VALUES (%s, '1970-01-01'::timestamptz, 0)
+    ON CONFLICT (nome) DO NOTHING;
+    SELECT executado_em, id_execucao
+    FROM analytics_watermarks
+    WHERE nome = %s
+    FOR UPDATE
+"""
+
+# Última execução do próximo lote (e quantas execuções ele tem). Os limites
+# simples em executado_em repetem as comparações de linha para que só as
+# partições do intervalo sejam lidas.
+SQL_FIM_DO_LOTE = """
+    SELECT executado_em, id_execucao, COUNT(*) OVER ()
+    FROM (
+        SELECT pe.executado_em, pe.id_execucao
+        FROM prompt_execucoes pe
+        WHERE pe.executado_em >= %s
+          AND (pe.executado_em, pe.id_execucao) > (%s, %s)
+          AND pe.executado_em <= NOW() - make_interval(secs => %s)
+        ORDER BY pe.executado_em, pe.id_execucao
+        LIMIT %s
+    ) lote
+    ORDER BY executado_em DESC, id_execucao DESC
+    LIMIT 1
+"""
+
+SQL_AGREGAR_LOTE = f"""
+    INSERT INTO analytics_execucoes_diarias AS a (
+        dia, id_cliente, id_epico, id_prompt, status,
+        execucoes, tokens, custo, tempo_total_ms, latencia_buckets
+    )
+    SELECT
+        pe.executado_em::date,
+        e.id_cliente,
+        pe.id_epico,
+        pe.id_prompt,
+        COALESCE(pe.status, 'desconhecido'),
+        COUNT(*),
+        COALESCE(SUM(pe.tokens_consumidos), 0),
+        COALESCE(SUM(pe.custo_estimado), 0),
+        COALESCE(SUM(pe.tempo_execucao_ms), 0),
+        {_expressao_buckets()}
+    FROM prompt_execucoes pe
+    INNER JOIN epicos e ON e.id_epico = pe.id_epico
+    WHERE pe.executado_em BETWEEN %s AND %s
+      AND (pe.executado_em, pe.id_execucao) > (%s, %s)
+      AND (pe.executado_em, pe.id_execucao) <= (%s, %s)
+    GROUP BY 1, 2, 3, 4, 5
+    ON CONFLICT (id_cliente, dia, id_prompt, id_epico, status) DO UPDATE SET
+        execucoes = a.execucoes + EXCLUDED.execucoes,
+        tokens = a.tokens + EXCLUDED.tokens,
+        custo = a.custo + EXCLUDED.custo,
+        tempo_total_ms = a.tempo_total_ms + EXCLUDED.tempo_total_ms,
+        latencia_buckets = maestro_somar_buckets(a.latencia_buckets, EXCLUDED.latencia_buckets)
+"""
+
+SQL_AVANCAR_WATERMARK = """
+    UPDATE analytics_watermarks
+    SET executado_em = %s, id_execucao = %s, atualizado_em = NOW()
+    WHERE nome = %s
+"""
+
+
+def _travar_watermark(cur):
+    """Cria a marca d'água se necessário e a trava até o fim da transação."""
+    cur.execute(SQL_TRAVAR_WATERMARK, (WATERMARK_ROLLUP, WATERMARK_ROLLUP))
+    return cur.fetchone()
+
+
+def processar_lote(settle_segundos: int = SETTLE_PADRAO, tamanho_lote: int = LOTE_PADRAO) -> int:
+    """
+    Agrega o próximo lote de execuções no rollup e avança a marca d'água.
+
+    A trava na linha da marca d'água serializa execuções concorrentes do job.
+
+    Args:
+        settle_segundos: Idade mínima (em segundos) das execuções processadas
+        tamanho_lote: Número máximo de execuções por lote
+
+    Returns:
+        Número de execuções processadas (0 se não havia nada novo)
+    """
+    with transaction() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            marca_em, marca_id = _travar_watermark(cur)
+
+            cur.execute(SQL_FIM_DO_LOTE, (marca_em, marca_em, marca_id, settle_segundos, tamanho_lote))
+            fim = cur.fetchone()
+            if fim is None:
+                return 0
+
+            fim_em, fim_id, total = fim
+            cur.execute(SQL_AGREGAR_LOTE, (marca_em, fim_em, marca_em, marca_id, fim_em, fim_id))
+            cur.execute(SQL_AVANCAR_WATERMARK, (fim_em, fim_id, WATERMARK_ROLLUP))
+
+    logger.info("Rollup: %s execuções agregadas (até %s, id %s)", total, fim_em, fim_id)
+    return total
+
+
+def processar_pendentes(settle_segundos: int = SETTLE_PADRAO, tamanho_lote: int = LOTE_PADRAO) -> int:
+    """
+    Processa lotes até alcançar as execuções mais recentes.
+
+    Returns:
+        Total de execuções processadas
+    """
+    total = 0
+    while True:
+        processadas = processar_lote(settle_segundos, tamanho_lote)
+        total += processadas
+        if processadas < tamanho_lote:
+            return total
+
+
+def reprocessar_desde(dia: date) -> None:
+    """
+    Descarta o rollup a partir de `dia` e recua a marca d'água para esse dia.
+
+    Útil após correções em prompt_execucoes ou mudança de LIMITES_LATENCIA_MS;
+    o próximo processamento reagrega as execuções a partir dessa data.
+
+    Args:
+        dia: Primeiro dia a reprocessar
+    """
+    with transaction() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            _travar_watermark(cur)
+            cur.execute("DELETE FROM analytics_execucoes_diarias WHERE dia >= %s", (dia,))
+            # Só recua: dias posteriores à marca atual ainda não foram agregados
+            cur.execute("""
+                UPDATE analytics_watermarks
+                SET executado_em = %s::date::timestamptz, id_execucao = 0, atualizado_em = NOW()
+                WHERE nome = %s AND executado_em > %s::date::timestamptz
+            """, (dia, WATERMARK_ROLLUP, dia))
+            recuada = cur.rowcount > 0
+
+    logger.info("Rollup descartado a partir de %s (marca d'água recuada: %s)", dia, recuada)
+
+
+def executar(
+    intervalo: int = INTERVALO_PADRAO,
+    settle_segundos: int = SETTLE_PADRAO,
+    tamanho_lote: int = LOTE_PADRAO,
+    parar: Optional[threading.Event] = None,
+) -> None:
+    """
+    Loop do agendador: processa as pendências e aguarda `intervalo` segundos.
+
+    Erros são registrados e a próxima rodada tenta de novo (a marca d'água só
+    avança com o commit do lote).
+    """
+    parar = parar or threading.Event()
+    while not parar.is_set():
+        try:
+            processar_pendentes(settle_segundos, tamanho_lote)
+        except Exception:
+            logger.exception("Falha no rollup de execuções; nova tentativa em %ss", intervalo)
+        parar.wait(intervalo)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mantém o rollup diário de custos e latência das execuções.")
+    parser.add_argument("--once", action="store_true", help="processa as pendências e sai")
+    parser.add_argument("--interval", type=int, default=INTERVALO_PADRAO,
+                        help=f"segundos entre rodadas (padrão {INTERVALO_PADRAO})")
+    parser.add_argument("--settle", type=int, default=SETTLE_PADRAO,
+                        help=f"idade mínima, em segundos, das execuções agregadas (padrão {SETTLE_PADRAO})")
+    parser.add_argument("--lote", type=int, default=LOTE_PADRAO,
+                        help=f"execuções por lote (padrão {LOTE_PADRAO})")
+    parser.add_argument("--reprocessar-desde", type=date.fromisoformat, metavar="AAAA-MM-DD",
+                        help="descarta o rollup a partir da data e reagrega")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    try:
+        if args.reprocessar_desde:
+            reprocessar_desde(args.reprocessar_desde)
+
+        if args.once or args.reprocessar_desde:
+            processar_pendentes(args.settle, args.lote)
+            return 0
+
+        parar = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: parar.set())
+        signal.signal(signal.SIGINT, lambda *_: parar.set())
+        logger.info("Rollup iniciado (intervalo %ss, settle %ss)", args.interval, args.settle)
+        executar(args.interval, args.settle, args.lote, parar)
+        return 0
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -58,6 +58,65 @@ DB_CONNECTION_ERRORS = Counter(
     "Erros ao abrir conexão com o banco de dados",
 )
 
+DB_POOL_SIZE = Gauge(
+    "maestro_db_pool_connections",
+    "Conexões físicas abertas pelo pool (em uso + ociosas)",
+)
+
+DB_POOL_IN_USE = Gauge(
+    "maestro_db_pool_connections_in_use",
+    "Conexões do pool emprestadas no momento",
+)
+
+DB_POOL_IDLE = Gauge(
+    "maestro_db_pool_connections_idle",
+    "Conexões ociosas disponíveis no pool",
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "maestro_db_pool_checkout_wait_seconds",
+    "Tempo de espera para obter uma conexão do pool",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+DB_POOL_TIMEOUTS = Counter(
+    "maestro_db_pool_checkout_timeouts_total",
+    "Checkouts que esgotaram o tempo de espera por uma conexão livre",
+)
+
+DB_CONNECTION_AGE = Histogram(
+    "maestro_db_connection_age_seconds",
+    "Idade das conexões do pool no momento em que são fechadas",
+    buckets=(1, 10, 30, 60, 300, 600, 1800, 3600, 7200),
+)
+
+DB_UP = Gauge(
+    "maestro_db_up",
+    "Resultado da última verificação de saúde do banco (1 = acessível)",
+)
+
+DB_HEALTH_LATENCY = Gauge(
+    "maestro_db_health_latency_seconds",
+    "Latência da última verificação de saúde do banco",
+)
+
+REPO_CACHE_REQUESTS = Counter(
+    "maestro_repository_cache_requests_total",
+    "Leituras do cache de repositórios por função e resultado (hit/miss)",
+    ["function", "result"],
+)
+
+REPO_CACHE_EVICTIONS = Counter(
+    "maestro_repository_cache_evictions_total",
+    "Entradas removidas do cache de repositórios por motivo",
+    ["reason"],
+)
+
+REPO_CACHE_ENTRIES = Gauge(
+    "maestro_repository_cache_entries",
+    "Entradas atualmente no cache de repositórios",
+)
+
 STREAMLIT_LAST_RUN = Gauge(
     "maestro_streamlit_last_success_timestamp",
     "Timestamp da última renderização concluída com sucesso",
@@ -138,3 +197,48 @@ def db_connection_opened() -> None:
 def db_connection_error() -> None:
     """Registra um erro ao abrir conexão com o banco."""
     DB_CONNECTION_ERRORS.inc()
+
+
+def db_connection_closed(age_seconds: float) -> None:
+    """Registra o fechamento de uma conexão do pool e sua idade."""
+    DB_CONNECTION_AGE.observe(age_seconds)
+
+
+def db_pool_state(size: int, in_use: int, idle: int) -> None:
+    """Atualiza os gauges de ocupação do pool de conexões."""
+    DB_POOL_SIZE.set(size)
+    DB_POOL_IN_USE.set(in_use)
+    DB_POOL_IDLE.set(idle)
+
+
+def db_pool_checkout(wait_seconds: float) -> None:
+    """Registra o tempo de espera de um checkout bem-sucedido."""
+    DB_POOL_CHECKOUT_WAIT.observe(wait_seconds)
+
+
+def db_pool_timeout() -> None:
+    """Registra um checkout que esgotou o tempo limite."""
+    DB_POOL_TIMEOUTS.inc()
+
+
+def db_health_checked(ok: bool, latency_seconds: Optional[float]) -> None:
+    """Registra o resultado de uma verificação de saúde do banco."""
+    DB_UP.set(1 if ok else 0)
+    if latency_seconds is not None:
+        DB_HEALTH_LATENCY.set(latency_seconds)
+
+
+def cache_lookup(function: str, hit: bool) -> None:
+    """Registra uma leitura do cache de repositórios (hit ou miss)."""
+    REPO_CACHE_REQUESTS.labels(function=function, result="hit" if hit else "miss").inc()
+
+
+def cache_evicted(reason: str, count: int = 1) -> None:
+    """Registra remoções do cache (ttl, lru, invalidation, clear)."""
+    if count:
+        REPO_CACHE_EVICTIONS.labels(reason=reason).inc(count)
+
+
+def cache_size(entries: int) -> None:
+    """Atualiza o número de entradas no cache de repositórios."""
+    REPO_CACHE_ENTRIES.set(entries)
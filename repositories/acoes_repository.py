@@ -3,70 +3,68 @@ Repositório para gerenciar Ações no banco de dados.
 """
 
 from database.connection import get_db_connection
-from typing import List, Dict, Optional
+from repositories.cache import cached
+from repositories.modelos import Acao, TupleCursor
+from typing import List, Optional
 
 
-def listar_acoes(apenas_ativas: bool = True) -> List[Dict]:
+@cached("acoes", "tag_acoes")
+def listar_acoes(apenas_ativas: bool = True, incluir_usos: bool = True) -> List[Acao]:
     """
     Lista todas as ações disponíveis no sistema.
 
     Args:
         apenas_ativas: Se True, retorna apenas ações ativas
+        incluir_usos: Se True, inclui "usos" (associações ativas em tag_acoes)
 
     Returns:
-        Lista de ações como dicionários
+        Lista de ações (registros Acao)
     """
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            query = """
-                SELECT
-                    id_acao,
-                    codigo,
-                    nome,
-                    descricao,
-                    tipo,
-                    ativo,
-                    criado_em
-                FROM acoes
-            """
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            if incluir_usos:
+                # Contagem de associações agregada uma única vez para todas as ações
+                query = """
+                    SELECT
+                        a.id_acao,
+                        a.codigo,
+                        a.nome,
+                        a.descricao,
+                        a.tipo,
+                        a.ativo,
+                        a.criado_em,
+                        COALESCE(usos.total, 0) as usos
+                    FROM acoes a
+                    LEFT JOIN (
+                        SELECT id_acao, COUNT(*) as total
+                        FROM tag_acoes
+                        WHERE ativo = true
+                        GROUP BY id_acao
+                    ) usos ON usos.id_acao = a.id_acao
+                """
+            else:
+                query = """
+                    SELECT
+                        a.id_acao,
+                        a.codigo,
+                        a.nome,
+                        a.descricao,
+                        a.tipo,
+                        a.ativo,
+                        a.criado_em
+                    FROM acoes a
+                """
 
             if apenas_ativas:
-                query += " WHERE ativo = true"
+                query += " WHERE a.ativo = true"
 
-            query += " ORDER BY tipo, nome"
+            query += " ORDER BY a.tipo, a.nome"
 
             cur.execute(query)
-            results = cur.fetchall()
-
-            # Contar usos de cada ação
-            acoes = []
-            for row in results:
-                # Contar quantas vezes a ação está associada a tags
-                cur.execute("""
-                    SELECT COUNT(*) as total
-                    FROM tag_acoes
-                    WHERE id_acao = %s AND ativo = true
-                """, (row['id_acao'],))
-
-                uso_result = cur.fetchone()
-                usos = uso_result['total'] if uso_result else 0
-
-                acao = {
-                    "id_acao": row['id_acao'],
-                    "codigo": row['codigo'],
-                    "nome": row['nome'],
-                    "descricao": row['descricao'],
-                    "tipo": row['tipo'],
-                    "ativo": row['ativo'],
-                    "criado_em": row['criado_em'],
-                    "usos": usos
-                }
-                acoes.append(acao)
-
-            return acoes
-
-
-def buscar_acao_por_id(id_acao: int) -> Optional[Dict]:
+            return Acao.todos(cur)
+
+
+def buscar_acao_por_id(id_acao: int) -> Optional[Acao]:
     """
     Busca uma ação específica pelo ID.
 
@@ -74,10 +72,10 @@ def buscar_acao_por_id(id_acao: int) -> Optional[Dict]:
         id_acao: ID da ação
 
     Returns:
-        Dicionário com dados da ação ou None se não encontrada
+        Registro Acao ou None se não encontrada
     """
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             cur.execute("""
                 SELECT
                     id_acao,
@@ -91,11 +89,10 @@ def buscar_acao_por_id(id_acao: int) -> Optional[Dict]:
                 WHERE id_acao = %s
             """, (id_acao,))
 
-            result = cur.fetchone()
-            return dict(result) if result else None
+            return Acao.primeiro(cur)
 
 
-def buscar_acao_por_codigo(codigo: str) -> Optional[Dict]:
+def buscar_acao_por_codigo(codigo: str) -> Optional[Acao]:
     """
     Busca uma ação pelo código.
 
@@ -103,10 +100,10 @@ def buscar_acao_por_codigo(codigo: str) -> Optional[Dict]:
         codigo: Código da ação
 
     Returns:
-        Dicionário com dados da ação ou None se não encontrada
+        Registro Acao ou None se não encontrada
     """
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             cur.execute("""
                 SELECT
                     id_acao,
@@ -120,11 +117,11 @@ def buscar_acao_por_codigo(codigo: str) -> Optional[Dict]:
                 WHERE codigo = %s
             """, (codigo,))
 
-            result = cur.fetchone()
-            return dict(result) if result else None
+            return Acao.primeiro(cur)
 
 
-def listar_acoes_por_tipo(tipo: str, apenas_ativas: bool = True) -> List[Dict]:
+@cached("acoes")
+def listar_acoes_por_tipo(tipo: str, apenas_ativas: bool = True) -> List[Acao]:
     """
     Lista ações de um tipo específico.
 
@@ -136,7 +133,7 @@ def listar_acoes_por_tipo(tipo: str, apenas_ativas: bool = True) -> List[Dict]:
         Lista de ações do tipo especificado
     """
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             query = """
                 SELECT
                     id_acao,
@@ -158,9 +155,7 @@ def listar_acoes_por_tipo(tipo: str, apenas_ativas: bool = True) -> List[Dict]:
             query += " ORDER BY nome"
 
             cur.execute(query, params)
-            results = cur.fetchall()
-
-            return [dict(row) for row in results]
+            return Acao.todos(cur)
 
 
 def listar_tipos_acoes() -> List[str]:
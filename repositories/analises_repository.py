@@ -3,11 +3,16 @@ Repositório para gerenciar Análises (prompt_execucoes) no banco de dados.
 """
 
 import os
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
 
-from database.connection import get_db_connection
+from database.connection import get_db_connection, stream_rows
 from observability.metrics import db_operation
+from repositories.compressao import descomprimir, texto_resposta
+from repositories.modelos import Analise, TupleCursor
+from repositories.paginacao import (
+    ANTERIOR, Pagina, decodificar_cursor, montar_pagina_tabela
+)
 
 
 def get_default_client_id() -> int:
@@ -15,126 +20,405 @@ def get_default_client_id() -> int:
     return int(os.getenv("DEFAULT_CLIENT_ID", "1"))
 
 
+# Análises bem-sucedidas de um cliente, apenas metadados
+# (listar_analises / iterar_analises)
+SQL_ANALISES_CLIENTE = """
+    SELECT
+        pe.id_execucao,
+        e.titulo as epico,
+        e.id_epico,
+        p.nome as prompt_nome,
+        p.contexto as prompt_contexto,
+        to_char(pe.executado_em, 'YYYY-MM-DD HH24:MI') as data,
+        pe.status,
+        pe.tokens_consumidos,
+        COALESCE(pe.custo_estimado, 0)::float8 as custo_estimado,
+        pe.tempo_execucao_ms,
+        'gpt-4o-mini' as modelo
+    FROM prompt_execucoes pe
+    INNER JOIN epicos e ON pe.id_epico = e.id_epico
+    INNER JOIN prompts p ON pe.id_prompt = p.id_prompt
+    WHERE e.id_cliente = %s
+      AND pe.status = 'sucesso'
+      AND (pe.resposta_gpt IS NOT NULL OR pe.resposta_gpt_comprimida IS NOT NULL)
+    ORDER BY pe.executado_em DESC
+"""
+
+# Análises de um épico, apenas metadados
+# (buscar_analises_por_epico / iterar_analises_por_epico)
+SQL_ANALISES_EPICO = """
+    SELECT
+        pe.id_execucao,
+        p.nome as prompt_nome,
+        p.contexto as prompt_contexto,
+        pe.executado_em,
+        to_char(pe.executado_em, 'YYYY-MM-DD HH24:MI') as data,
+        pe.status,
+        pe.tokens_consumidos,
+        COALESCE(pe.custo_estimado, 0)::float8 as custo_estimado,
+        pe.tempo_execucao_ms,
+        'gpt-4o-mini' as modelo
+    FROM prompt_execucoes pe
+    INNER JOIN prompts p ON pe.id_prompt = p.id_prompt
+    WHERE pe.id_epico = %s
+    ORDER BY pe.executado_em DESC
+"""
+
+
 @db_operation("listar_analises")
-def listar_analises(id_cliente: Optional[int] = None, limite: int = 100) -> List[Dict]:
+def listar_analises(id_cliente: Optional[int] = None, limite: int = 100) -> List[Analise]:
     """
     Lista as análises (execuções de prompts) de um cliente.
 
+    Retorna apenas metadados; o corpo da resposta (resposta_gpt) é carregado
+    sob demanda por buscar_resultado_execucao.
+
     Args:
         id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
         limite: Número máximo de resultados
 
     Returns:
-        Lista de análises como dicionários
+        Lista de análises (registros Analise)
     """
     if id_cliente is None:
         id_cliente = get_default_client_id()
 
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT
-                    pe.id_execucao,
-                    e.titulo as epico,
-                    e.id_epico,
-                    p.nome as prompt_nome,
-                    p.contexto as prompt_contexto,
-                    pe.executado_em as data,
-                    pe.resposta_gpt as resultado,
-                    pe.status,
-                    pe.tokens_consumidos,
-                    pe.custo_estimado,
-                    pe.tempo_execucao_ms,
-                    'gpt-4o-mini' as modelo
-                FROM prompt_execucoes pe
-                INNER JOIN epicos e ON pe.id_epico = e.id_epico
-                INNER JOIN prompts p ON pe.id_prompt = p.id_prompt
-                WHERE e.id_cliente = %s
-                  AND pe.status = 'sucesso'
-                  AND pe.resposta_gpt IS NOT NULL
-                ORDER BY pe.executado_em DESC
-                LIMIT %s
-            """, (id_cliente, limite))
-
-            results = cur.fetchall()
-
-            # Formatar os resultados para compatibilidade com o mock
-            analises = []
-            for row in results:
-                analise = {
-                    "id_execucao": row['id_execucao'],
-                    "epico": row['epico'],
-                    "id_epico": row['id_epico'],
-                    "data": row['data'].strftime("%Y-%m-%d %H:%M") if isinstance(row['data'], datetime) else str(row['data']),
-                    "modelo": row['modelo'],
-                    "resultado": row['resultado'] or "Análise em processamento...",
-                    "prompt_nome": row['prompt_nome'],
-                    "prompt_contexto": row['prompt_contexto'],
-                    "status": row['status'],
-                    "tokens_consumidos": row['tokens_consumidos'],
-                    "custo_estimado": float(row['custo_estimado']) if row['custo_estimado'] else 0.0,
-                    "tempo_execucao_ms": row['tempo_execucao_ms'],
-                }
-                analises.append(analise)
-
-            return analises
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            cur.execute(SQL_ANALISES_CLIENTE + " LIMIT %s", (id_cliente, limite))
+
+            return Analise.todos(cur)
+
+
+def iterar_analises(id_cliente: Optional[int] = None, itersize: int = 2000) -> Iterator[Analise]:
+    """
+    Gera todas as análises bem-sucedidas de um cliente com cursor no servidor.
+
+    Equivale a listar_analises sem limite, mas sem materializar o resultado.
+
+    Args:
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+        itersize: Linhas buscadas do servidor por lote
+
+    Yields:
+        Registros Analise (apenas metadados)
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    yield from stream_rows(
+        SQL_ANALISES_CLIENTE, (id_cliente,), itersize=itersize, row_factory=Analise.conversor
+    )
+
+
+def iterar_analises_por_epico(id_epico: int, itersize: int = 2000) -> Iterator[Analise]:
+    """
+    Gera todas as análises de um épico com cursor no servidor.
+
+    Equivale a buscar_analises_por_epico, sem materializar o resultado.
+
+    Args:
+        id_epico: ID do épico
+        itersize: Linhas buscadas do servidor por lote
+
+    Yields:
+        Registros Analise do épico (apenas metadados)
+    """
+    yield from stream_rows(
+        SQL_ANALISES_EPICO, (id_epico,), itersize=itersize, row_factory=Analise.conversor
+    )
+
+
+def _consulta_pagina_analises(
+    colunas: str,
+    id_cliente: int,
+    tamanho: int,
+    cursor: Optional[str],
+    id_epico: Optional[int],
+    contexto: Optional[str],
+    status: Optional[str],
+    data_inicio: Optional[date],
+    data_fim: Optional[date],
+) -> Tuple[str, List, Optional[str]]:
+    """Monta a consulta keyset filtrada de uma página de análises com as colunas dadas."""
+    query = f"""
+        SELECT {colunas}
+        FROM prompt_execucoes pe
+        INNER JOIN epicos e ON pe.id_epico = e.id_epico
+        INNER JOIN prompts p ON pe.id_prompt = p.id_prompt
+        WHERE e.id_cliente = %s
+    """
+    params: List = [id_cliente]
+
+    if id_epico is not None:
+        query += " AND pe.id_epico = %s"
+        params.append(id_epico)
+
+    if contexto:
+        query += " AND p.contexto = %s"
+        params.append(contexto)
+
+    if status:
+        query += " AND pe.status = %s"
+        params.append(status)
+
+    if data_inicio:
+        query += " AND pe.executado_em >= %s"
+        params.append(data_inicio)
+
+    if data_fim:
+        query += " AND pe.executado_em < %s"
+        params.append(data_fim + timedelta(days=1))
+
+    direcao = None
+    if cursor:
+        direcao, (executado_em, id_execucao) = decodificar_cursor(cursor)
+        # A comparação de linha não poda partições; o limite simples em
+        # executado_em (redundante) permite ao planner descartá-las
+        if direcao == ANTERIOR:
+            query += " AND pe.executado_em >= %s AND (pe.executado_em, pe.id_execucao) > (%s, %s)"
+        else:
+            query += " AND pe.executado_em <= %s AND (pe.executado_em, pe.id_execucao) < (%s, %s)"
+        params.extend([executado_em, executado_em, id_execucao])
+
+    if direcao == ANTERIOR:
+        query += " ORDER BY pe.executado_em ASC, pe.id_execucao ASC"
+    else:
+        query += " ORDER BY pe.executado_em DESC, pe.id_execucao DESC"
+
+    query += " LIMIT %s"
+    params.append(tamanho + 1)
+
+    return query, params, direcao
+
+
+@db_operation("tabela_analises_pagina")
+def tabela_analises_pagina(
+    id_cliente: Optional[int] = None,
+    tamanho: int = 50,
+    cursor: Optional[str] = None,
+    id_epico: Optional[int] = None,
+    contexto: Optional[str] = None,
+    status: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+) -> Pagina:
+    """
+    Página do histórico de análises já no formato da tabela da tela Análises.
+
+    A paginação é por keyset em (executado_em, id_execucao) decrescente, com
+    os filtros aplicados no SQL. Seleciona apenas as colunas exibidas, com os
+    rótulos em português, e monta o DataFrame direto das tuplas do cursor.
+
+    Args:
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+        tamanho: Número de análises por página
+        cursor: Token `proximo`/`anterior` de uma página anterior (None = primeira)
+        id_epico: Filtrar por épico (opcional)
+        contexto: Filtrar pelo contexto do prompt (opcional)
+        status: Filtrar pelo status da execução (opcional)
+        data_inicio: Data inicial, inclusiva (opcional)
+        data_fim: Data final, inclusiva (opcional)
+
+    Returns:
+        Página com `itens` como DataFrame e tokens de navegação
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    query, params, direcao = _consulta_pagina_analises("""
+            pe.id_execucao as "ID",
+            e.titulo as "Épico",
+            p.contexto as "Contexto",
+            pe.executado_em as "Data",
+            pe.tokens_consumidos as "Tokens",
+            COALESCE(pe.custo_estimado, 0)::float8 as "Custo (R$)",
+            pe.status as "Status"
+    """, id_cliente, tamanho, cursor, id_epico, contexto, status, data_inicio, data_fim)
+
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            cur.execute(query, params)
+            return montar_pagina_tabela(cur, tamanho, direcao, ("Data", "ID"))
 
 
 @db_operation("buscar_analises_por_epico")
-def buscar_analises_por_epico(id_epico: int) -> List[Dict]:
+def buscar_analises_por_epico(id_epico: int) -> List[Analise]:
     """
     Busca todas as análises de um épico específico.
 
+    Retorna apenas metadados; o corpo da resposta (resposta_gpt) é carregado
+    sob demanda por buscar_resultado_execucao.
+
     Args:
         id_epico: ID do épico
 
     Returns:
         Lista de análises do épico
     """
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            cur.execute(SQL_ANALISES_EPICO, (id_epico,))
+
+            return Analise.todos(cur)
+
+
+@db_operation("buscar_resultado_execucao")
+def buscar_resultado_execucao(id_execucao: int, executado_em: Optional[datetime] = None) -> Optional[str]:
+    """
+    Busca o resultado (resposta_gpt) de uma execução específica.
+
+    Se a execução tiver a cópia comprimida (resposta_gpt_comprimida), apenas
+    ela é trafegada e o texto é restaurado aqui.
+
+    Args:
+        id_execucao: ID da execução
+        executado_em: Data/hora da execução, se conhecida; limita a busca à
+            partição do mês em vez de consultar todas
+
+    Returns:
+        Texto da resposta ou None se a execução não existir ou ainda não
+        tiver resposta
+    """
+    query = """
+        SELECT
+            CASE WHEN resposta_gpt_comprimida IS NULL THEN resposta_gpt END as resultado,
+            resposta_gpt_comprimida as resultado_comprimido
+        FROM prompt_execucoes
+        WHERE id_execucao = %s
+    """
+    params: List = [id_execucao]
+
+    if executado_em is not None:
+        query += " AND executado_em = %s"
+        params.append(executado_em)
+
     with get_db_connection() as conn:
         with conn.cursor() as cur:
+            cur.execute(query, params)
+
+            result = cur.fetchone()
+
+    if not result:
+        return None
+    return texto_resposta(result['resultado'], result['resultado_comprimido'])
+
+
+# Marcadores dos termos encontrados nos trechos de buscar_em_resultados
+MARCA_INICIO = "⟦"
+MARCA_FIM = "⟧"
+
+_OPCOES_TRECHO = (
+    f"StartSel={MARCA_INICIO}, StopSel={MARCA_FIM}, "
+    'MaxFragments=3, MaxWords=25, MinWords=8, FragmentDelimiter=" … "'
+)
+
+
+@db_operation("buscar_em_resultados")
+def buscar_em_resultados(
+    texto: str,
+    limite: int = 20,
+    id_cliente: Optional[int] = None
+) -> List[Analise]:
+    """
+    Busca texto nos resultados das análises (resposta_gpt) com a busca textual
+    do PostgreSQL.
+
+    Usa a coluna resposta_tsv (mantida por trigger, migrações 0002/0003) e o
+    índice GIN; aceita a sintaxe de websearch_to_tsquery. Os trechos com os
+    termos destacados (entre MARCA_INICIO e MARCA_FIM) são gerados apenas para
+    as `limite` execuções mais relevantes.
+
+    Args:
+        texto: Termos de busca
+        limite: Número máximo de resultados
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+
+    Returns:
+        Análises encontradas, da mais relevante para a menos relevante
+        (campos "relevancia" e "trecho" preenchidos)
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    if not texto or not texto.strip():
+        return []
+
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             cur.execute("""
+                WITH q AS (
+                    SELECT websearch_to_tsquery('portuguese', %s) AS consulta
+                ),
+                melhores AS (
+                    SELECT
+                        pe.id_execucao,
+                        pe.executado_em,
+                        ts_rank(pe.resposta_tsv, q.consulta) AS relevancia
+                    FROM prompt_execucoes pe
+                    INNER JOIN epicos e ON pe.id_epico = e.id_epico
+                    CROSS JOIN q
+                    WHERE e.id_cliente = %s
+                      AND pe.resposta_tsv @@ q.consulta
+                    ORDER BY relevancia DESC, pe.executado_em DESC
+                    LIMIT %s
+                )
                 SELECT
                     pe.id_execucao,
+                    e.titulo as epico,
+                    e.id_epico,
                     p.nome as prompt_nome,
                     p.contexto as prompt_contexto,
-                    pe.executado_em as data,
-                    pe.resposta_gpt as resultado,
+                    pe.executado_em,
+                    to_char(pe.executado_em, 'YYYY-MM-DD HH24:MI') as data,
                     pe.status,
-                    pe.tokens_consumidos,
-                    pe.custo_estimado,
-                    pe.tempo_execucao_ms,
-                    'gpt-4o-mini' as modelo
-                FROM prompt_execucoes pe
+                    'gpt-4o-mini' as modelo,
+                    m.relevancia,
+                    ts_headline(
+                        'portuguese', left(pe.resposta_gpt, 250000), q.consulta, %s
+                    ) as trecho,
+                    CASE WHEN pe.resposta_gpt IS NULL THEN pe.resposta_gpt_comprimida END
+                        as resultado_comprimido
+                FROM melhores m
+                INNER JOIN prompt_execucoes pe
+                    ON pe.id_execucao = m.id_execucao AND pe.executado_em = m.executado_em
+                INNER JOIN epicos e ON pe.id_epico = e.id_epico
                 INNER JOIN prompts p ON pe.id_prompt = p.id_prompt
-                WHERE pe.id_epico = %s
-                ORDER BY pe.executado_em DESC
-            """, (id_epico,))
-
-            results = cur.fetchall()
-
-            # Formatar os resultados
-            analises = []
-            for row in results:
-                analise = {
-                    "id_execucao": row['id_execucao'],
-                    "data": row['data'].strftime("%Y-%m-%d %H:%M") if isinstance(row['data'], datetime) else str(row['data']),
-                    "modelo": row['modelo'],
-                    "resultado": row['resultado'] or "Análise em processamento...",
-                    "prompt_nome": row['prompt_nome'],
-                    "prompt_contexto": row['prompt_contexto'],
-                    "status": row['status'],
-                    "tokens_consumidos": row['tokens_consumidos'],
-                    "custo_estimado": float(row['custo_estimado']) if row['custo_estimado'] else 0.0,
-                    "tempo_execucao_ms": row['tempo_execucao_ms'],
-                }
-                analises.append(analise)
-
-            return analises
+                CROSS JOIN q
+                ORDER BY m.relevancia DESC, pe.executado_em DESC
+            """, (texto.strip(), id_cliente, limite, _OPCOES_TRECHO))
+            analises = Analise.todos(cur)
+
+            # Execuções que guardam apenas a cópia comprimida: o trecho é
+            # gerado a partir do texto restaurado, em uma única consulta
+            comprimidas = [a for a in analises if a.resultado_comprimido is not None]
+            if comprimidas:
+                cur.execute("""
+                    SELECT
+                        u.id_execucao,
+                        ts_headline(
+                            'portuguese', left(u.resposta, 250000),
+                            websearch_to_tsquery('portuguese', %s), %s
+                        )
+                    FROM unnest(%s::bigint[], %s::text[]) AS u(id_execucao, resposta)
+                """, (
+                    texto.strip(),
+                    _OPCOES_TRECHO,
+                    [a.id_execucao for a in comprimidas],
+                    [descomprimir(a.resultado_comprimido) for a in comprimidas],
+                ))
+                trechos = dict(cur.fetchall())
+                analises = [
+                    a._replace(trecho=trechos[a.id_execucao], resultado_comprimido=None)
+                    if a.resultado_comprimido is not None else a
+                    for a in analises
+                ]
+
+    return analises
 
 
 @db_operation("buscar_ultima_analise_epico")
-def buscar_ultima_analise_epico(id_epico: int) -> Optional[Dict]:
+def buscar_ultima_analise_epico(id_epico: int) -> Optional[Analise]:
     """
     Busca a última análise bem-sucedida de um épico.
 
@@ -142,48 +426,40 @@ def buscar_ultima_analise_epico(id_epico: int) -> Optional[Dict]:
         id_epico: ID do épico
 
     Returns:
-        Dicionário com a análise ou None se não encontrada
+        Registro Analise (com resultado) ou None se não encontrada
     """
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             cur.execute("""
                 SELECT
                     pe.id_execucao,
                     p.nome as prompt_nome,
                     p.contexto as prompt_contexto,
-                    pe.executado_em as data,
-                    pe.resposta_gpt as resultado,
+                    to_char(pe.executado_em, 'YYYY-MM-DD HH24:MI') as data,
+                    CASE WHEN pe.resposta_gpt_comprimida IS NULL THEN pe.resposta_gpt END as resultado,
+                    pe.resposta_gpt_comprimida as resultado_comprimido,
                     pe.status,
                     pe.tokens_consumidos,
-                    pe.custo_estimado,
+                    COALESCE(pe.custo_estimado, 0)::float8 as custo_estimado,
                     pe.tempo_execucao_ms,
                     'gpt-4o-mini' as modelo
                 FROM prompt_execucoes pe
                 INNER JOIN prompts p ON pe.id_prompt = p.id_prompt
                 WHERE pe.id_epico = %s
                   AND pe.status = 'sucesso'
-                  AND pe.resposta_gpt IS NOT NULL
+                  AND (pe.resposta_gpt IS NOT NULL OR pe.resposta_gpt_comprimida IS NOT NULL)
                 ORDER BY pe.executado_em DESC
                 LIMIT 1
             """, (id_epico,))
 
-            result = cur.fetchone()
+            analise = Analise.primeiro(cur)
 
-            if not result:
-                return None
-
-            return {
-                "id_execucao": result['id_execucao'],
-                "data": result['data'].strftime("%Y-%m-%d %H:%M") if isinstance(result['data'], datetime) else str(result['data']),
-                "modelo": result['modelo'],
-                "resultado": result['resultado'],
-                "prompt_nome": result['prompt_nome'],
-                "prompt_contexto": result['prompt_contexto'],
-                "status": result['status'],
-                "tokens_consumidos": result['tokens_consumidos'],
-                "custo_estimado": float(result['custo_estimado']) if result['custo_estimado'] else 0.0,
-                "tempo_execucao_ms": result['tempo_execucao_ms'],
-            }
+    if analise is not None and analise.resultado_comprimido is not None:
+        analise = analise._replace(
+            resultado=descomprimir(analise.resultado_comprimido),
+            resultado_comprimido=None,
+        )
+    return analise
 
 
 @db_operation("contar_analises")
@@ -0,0 +1,269 @@
+"""
+Repositório de analytics (custos, tokens e latência) sobre o rollup diário.
+
+As consultas leem apenas analytics_execucoes_diarias, mantida de forma
+incremental por jobs.rollup_analises; nenhuma delas varre prompt_execucoes.
+"""
+
+import os
+from datetime import date, datetime
+from typing import List, Optional, Sequence
+
+import pandas as pd
+
+from database.connection import get_db_connection
+from observability.metrics import db_operation
+from repositories.modelos import TupleCursor
+
+# Limites superiores (exclusivos) das faixas do histograma de latência, em ms.
+# A última posição de latencia_buckets conta as execuções acima de 120 s.
+# Alterar os limites exige reprocessar o rollup (--reprocessar-desde).
+LIMITES_LATENCIA_MS = (250, 500, 1000, 2000, 4000, 8000, 15000, 30000, 60000, 120000)
+
+WATERMARK_ROLLUP = "execucoes_diarias"
+
+# Agrupamentos disponíveis em custos_por_dimensao: (colunas exibidas, JOIN, GROUP BY)
+DIMENSOES = {
+    "prompt": (
+        "p.nome || ' (v' || p.versao || ')' AS \"Prompt\"",
+        "INNER JOIN prompts p ON p.id_prompt = a.id_prompt",
+        "p.id_prompt, p.nome, p.versao",
+    ),
+    "contexto": (
+        "COALESCE(p.contexto, '-') AS \"Contexto\"",
+        "INNER JOIN prompts p ON p.id_prompt = a.id_prompt",
+        "p.contexto",
+    ),
+    "epico": (
+        "a.id_epico AS \"ID\", e.titulo AS \"Épico\"",
+        "INNER JOIN epicos e ON e.id_epico = a.id_epico",
+        "a.id_epico, e.titulo",
+    ),
+}
+
+
+def get_default_client_id() -> int:
+    """Retorna o ID do cliente padrão configurado no .env."""
+    return int(os.getenv("DEFAULT_CLIENT_ID", "1"))
+
+
+def _consultar_tabela(query: str, params: Sequence) -> pd.DataFrame:
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            cur.execute(query, params)
+            colunas = [col.name for col in cur.description]
+            return pd.DataFrame.from_records(cur.fetchall(), columns=colunas)
+
+
+def percentil_buckets(buckets: Sequence[int], quantil: float) -> Optional[float]:
+    """
+    Estima um percentil de latência a partir do histograma do rollup.
+
+    Interpola linearmente dentro da faixa que contém o percentil; para a
+    última faixa (sem limite superior) retorna o maior limite.
+
+    Args:
+        buckets: Contagens por faixa (LIMITES_LATENCIA_MS + faixa final)
+        quantil: Percentil desejado entre 0 e 1 (ex.: 0.95)
+
+    Returns:
+        Latência estimada em ms ou None se não houver execuções
+    """
+    total = sum(buckets or [])
+    if total == 0:
+        return None
+
+    alvo = quantil * total
+    acumulado = 0
+    for i, contagem in enumerate(buckets):
+        if contagem and acumulado + contagem >= alvo:
+            if i >= len(LIMITES_LATENCIA_MS):
+                return float(LIMITES_LATENCIA_MS[-1])
+            inicio = LIMITES_LATENCIA_MS[i - 1] if i > 0 else 0
+            fim = LIMITES_LATENCIA_MS[i]
+            return inicio + (fim - inicio) * (alvo - acumulado) / contagem
+        acumulado += contagem
+
+    return float(LIMITES_LATENCIA_MS[-1])
+
+
+@db_operation("resumo_custos")
+def resumo_custos(data_inicio: date, data_fim: date, id_cliente: Optional[int] = None) -> dict:
+    """
+    Totais do período (execuções, tokens, custo e execuções com erro).
+
+    Args:
+        data_inicio: Primeiro dia do período (inclusive)
+        data_fim: Último dia do período (inclusive)
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+
+    Returns:
+        Dicionário com execucoes, erros, tokens e custo
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            cur.execute("""
+                SELECT
+                    COALESCE(SUM(execucoes), 0),
+                    COALESCE(SUM(execucoes) FILTER (WHERE status <> 'sucesso'), 0),
+                    COALESCE(SUM(tokens), 0),
+                    COALESCE(SUM(custo), 0)::float8
+                FROM analytics_execucoes_diarias
+                WHERE id_cliente = %s AND dia BETWEEN %s AND %s
+            """, (id_cliente, data_inicio, data_fim))
+            execucoes, erros, tokens, custo = cur.fetchone()
+
+    return {"execucoes": execucoes, "erros": erros, "tokens": tokens, "custo": custo}
+
+
+@db_operation("custos_por_dia")
+def custos_por_dia(data_inicio: date, data_fim: date, id_cliente: Optional[int] = None) -> pd.DataFrame:
+    """
+    Execuções, tokens e custo por dia.
+
+    Args:
+        data_inicio: Primeiro dia do período (inclusive)
+        data_fim: Último dia do período (inclusive)
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+
+    Returns:
+        DataFrame com as colunas Dia, Execuções, Tokens e Custo (R$)
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    return _consultar_tabela("""
+        SELECT
+            dia AS "Dia",
+            SUM(execucoes) AS "Execuções",
+            SUM(tokens) AS "Tokens",
+            SUM(custo)::float8 AS "Custo (R$)"
+        FROM analytics_execucoes_diarias
+        WHERE id_cliente = %s AND dia BETWEEN %s AND %s
+        GROUP BY dia
+        ORDER BY dia
+    """, (id_cliente, data_inicio, data_fim))
+
+
+@db_operation("custos_por_dimensao")
+def custos_por_dimensao(
+    dimensao: str,
+    data_inicio: date,
+    data_fim: date,
+    id_cliente: Optional[int] = None,
+    limite: int = 20
+) -> pd.DataFrame:
+    """
+    Custo agregado por prompt, contexto ou épico, do maior para o menor.
+
+    Args:
+        dimensao: 'prompt', 'contexto' ou 'epico'
+        data_inicio: Primeiro dia do período (inclusive)
+        data_fim: Último dia do período (inclusive)
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+        limite: Número máximo de linhas
+
+    Returns:
+        DataFrame com a dimensão, Execuções, Tokens, Custo (R$) e Custo médio (R$)
+
+    Raises:
+        ValueError: Se a dimensão não for suportada
+    """
+    if dimensao not in DIMENSOES:
+        raise ValueError(f"Dimensão inválida: {dimensao}")
+
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    colunas, juncao, agrupamento = DIMENSOES[dimensao]
+
+    return _consultar_tabela(f"""
+        SELECT
+            {colunas},
+            SUM(a.execucoes) AS "Execuções",
+            SUM(a.tokens) AS "Tokens",
+            SUM(a.custo)::float8 AS "Custo (R$)",
+            (SUM(a.custo) / NULLIF(SUM(a.execucoes), 0))::float8 AS "Custo médio (R$)"
+        FROM analytics_execucoes_diarias a
+        {juncao}
+        WHERE a.id_cliente = %s AND a.dia BETWEEN %s AND %s
+        GROUP BY {agrupamento}
+        ORDER BY SUM(a.custo) DESC
+        LIMIT %s
+    """, (id_cliente, data_inicio, data_fim, limite))
+
+
+@db_operation("latencia_por_prompt")
+def latencia_por_prompt(data_inicio: date, data_fim: date, id_cliente: Optional[int] = None) -> pd.DataFrame:
+    """
+    Latência média, p50 e p95 por prompt.
+
+    Os percentis são estimados a partir dos histogramas do rollup somados
+    no banco (maestro_soma_buckets), com a resolução de LIMITES_LATENCIA_MS.
+
+    Args:
+        data_inicio: Primeiro dia do período (inclusive)
+        data_fim: Último dia do período (inclusive)
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+
+    Returns:
+        DataFrame com Prompt, Execuções, Média (ms), p50 (ms) e p95 (ms)
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            cur.execute("""
+                SELECT
+                    p.nome || ' (v' || p.versao || ')',
+                    maestro_soma_buckets(a.latencia_buckets),
+                    SUM(a.tempo_total_ms)
+                FROM analytics_execucoes_diarias a
+                INNER JOIN prompts p ON p.id_prompt = a.id_prompt
+                WHERE a.id_cliente = %s AND a.dia BETWEEN %s AND %s
+                GROUP BY p.id_prompt, p.nome, p.versao
+                ORDER BY p.nome, p.versao
+            """, (id_cliente, data_inicio, data_fim))
+            linhas = cur.fetchall()
+
+    registros: List[tuple] = []
+    for prompt, buckets, tempo_total in linhas:
+        medidas = sum(buckets or [])
+        registros.append((
+            prompt,
+            medidas,
+            tempo_total / medidas if medidas else None,
+            percentil_buckets(buckets, 0.50),
+            percentil_buckets(buckets, 0.95),
+        ))
+
+    return pd.DataFrame.from_records(
+        registros,
+        columns=["Prompt", "Execuções", "Média (ms)", "p50 (ms)", "p95 (ms)"],
+    )
+
+
+@db_operation("frescor_rollup")
+def frescor_rollup() -> Optional[datetime]:
+    """
+    Retorna até que execução (executado_em) o rollup já foi processado.
+
+    Returns:
+        Marca d'água do rollup ou None se o job ainda não rodou
+    """
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            cur.execute(
+                "SELECT executado_em FROM analytics_watermarks WHERE nome = %s",
+                (WATERMARK_ROLLUP,)
+            )
+            row = cur.fetchone()
+
+    # Marca inicial (1970-01-01) indica que nenhum lote foi processado
+    if not row or row[0].year <= 1970:
+        return None
+    return row[0]
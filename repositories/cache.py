@@ -0,0 +1,350 @@
+"""
+Cache de leitura compartilhado pelo processo para dados de referência.
+
+Tags, ações, prompts e associações mudam pouco, mas eram consultados a cada
+rerun de cada sessão. As funções de leitura decoradas com `@cached(...)`
+guardam o resultado em um LRU com TTL, indexado pela função, argumentos e
+cliente padrão. As funções de escrita decoradas com `@invalidates(...)`
+removem as entradas dos namespaces afetados após o commit.
+
+Com várias réplicas do front, cada escrita também publica um NOTIFY no
+canal `REPO_CACHE_CHANNEL`; um listener em segundo plano em cada processo
+recebe a notificação e invalida os mesmos namespaces localmente.
+
+Os valores em cache são compartilhados entre sessões e não devem ser
+modificados por quem os recebe.
+"""
+
+import json
+import logging
+import os
+import select
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import psycopg2
+
+from database.connection import get_database_url, get_db_connection, in_unit_of_work, on_commit
+from observability.metrics import cache_evicted, cache_lookup, cache_size
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class RepositoryCache:
+    """
+    LRU com TTL e invalidação por namespace, seguro entre threads.
+
+    Args:
+        max_entries: Número máximo de entradas (as menos usadas saem primeiro)
+        ttl: Segundos de validade de cada entrada
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # chave -> (expira_em, namespaces, valor)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Tuple[str, ...], Any]]" = OrderedDict()
+        # Geração de cada namespace (incrementada a cada invalidação) e do
+        # cache inteiro (incrementada em clear)
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Retorna o valor em cache ou _MISSING."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, _, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                cache_evicted("ttl")
+                cache_size(len(self._entries))
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def snapshot(self, namespaces: Iterable[str]) -> Tuple[int, ...]:
+        """Gerações atuais dos namespaces, para passar a set() após a leitura."""
+        with self._lock:
+            return (self._epoch,) + tuple(self._generations.get(ns, 0) for ns in namespaces)
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        namespaces: Tuple[str, ...],
+        generations: Optional[Tuple[int, ...]] = None,
+    ) -> bool:
+        """
+        Guarda um valor associado aos namespaces dos quais ele depende.
+
+        Se `generations` (de snapshot(), tirado antes da leitura) não for mais
+        o atual, houve uma invalidação durante a leitura e o valor, possivelmente
+        desatualizado, não é guardado.
+
+        Returns:
+            True se o valor foi guardado
+        """
+        with self._lock:
+            if generations is not None:
+                current = (self._epoch,) + tuple(self._generations.get(ns, 0) for ns in namespaces)
+                if current != generations:
+                    return False
+            self._entries[key] = (time.monotonic() + self.ttl, namespaces, value)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            cache_evicted("lru", evicted)
+            cache_size(len(self._entries))
+        return True
+
+    def invalidate(self, namespaces: Iterable[str], reason: str = "invalidation") -> int:
+        """Remove as entradas que dependem de qualquer um dos namespaces."""
+        targets = set(namespaces)
+        with self._lock:
+            for ns in targets:
+                self._generations[ns] = self._generations.get(ns, 0) + 1
+            keys = [
+                key for key, (_, entry_namespaces, _) in self._entries.items()
+                if targets.intersection(entry_namespaces)
+            ]
+            for key in keys:
+                del self._entries[key]
+            cache_evicted(reason, len(keys))
+            cache_size(len(self._entries))
+        return len(keys)
+
+    def clear(self) -> None:
+        """Esvazia o cache."""
+        with self._lock:
+            self._epoch += 1
+            cache_evicted("clear", len(self._entries))
+            self._entries.clear()
+            cache_size(0)
+
+
+_CACHE = RepositoryCache(
+    max_entries=int(os.getenv("REPO_CACHE_MAX_ENTRIES", "512")),
+    ttl=float(os.getenv("REPO_CACHE_TTL", "60")),
+)
+_ENABLED = os.getenv("REPO_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+_NOTIFY_ENABLED = os.getenv("REPO_CACHE_NOTIFY", "true").lower() in ("1", "true", "yes")
+_CHANNEL = os.getenv("REPO_CACHE_CHANNEL", "maestro_cache")
+
+# Identifica este processo nas notificações, para ignorar as próprias
+_INSTANCE_ID = uuid.uuid4().hex
+
+
+def get_cache() -> RepositoryCache:
+    """Retorna o cache de repositórios do processo."""
+    return _CACHE
+
+
+def _make_key(func: Callable, args: tuple, kwargs: Dict[str, Any]) -> Optional[Hashable]:
+    key = (
+        func.__module__,
+        func.__qualname__,
+        # Funções chamadas sem id_cliente usam o cliente padrão do ambiente
+        os.getenv("DEFAULT_CLIENT_ID", "1"),
+        args,
+        tuple(sorted(kwargs.items())),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def cached(*namespaces: str) -> Callable:
+    """
+    Decorador de leitura: guarda o resultado no cache do processo.
+
+    Args:
+        *namespaces: Tabelas/entidades das quais o resultado depende; uma
+            escrita em qualquer uma delas invalida a entrada
+
+    Dentro de uma unidade de trabalho o cache é ignorado, para que a
+    transação enxergue as próprias escritas.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED or in_unit_of_work():
+                return func(*args, **kwargs)
+
+            if _NOTIFY_ENABLED:
+                _ensure_listener()
+
+            key = _make_key(func, args, kwargs)
+            if key is None:
+                return func(*args, **kwargs)
+
+            value = _CACHE.get(key)
+            cache_lookup(func.__name__, value is not _MISSING)
+            if value is _MISSING:
+                # Uma escrita concorrente pode invalidar os namespaces enquanto
+                # a leitura acontece; nesse caso o resultado não é guardado
+                generations = _CACHE.snapshot(namespaces)
+                value = func(*args, **kwargs)
+                _CACHE.set(key, value, namespaces, generations)
+            return value
+
+        wrapper.cache_namespaces = namespaces
+        return wrapper
+
+    return decorator
+
+
+def _publish(namespaces: Tuple[str, ...]) -> None:
+    """Publica a invalidação para as demais réplicas via NOTIFY."""
+    payload = json.dumps({"origin": _INSTANCE_ID, "namespaces": list(namespaces)})
+    try:
+        # Dentro de uma unidade de trabalho o NOTIFY entra na mesma transação
+        # e o PostgreSQL só o entrega após o commit
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_notify(%s, %s)", (_CHANNEL, payload))
+    except Exception as e:
+        if in_unit_of_work():
+            raise
+        logger.warning("Falha ao publicar invalidação de cache %s: %s", namespaces, e)
+
+
+def invalidate(*namespaces: str) -> None:
+    """
+    Invalida os namespaces após o commit da transação corrente.
+
+    A invalidação é aplicada localmente e publicada para as demais réplicas.
+    """
+    if _NOTIFY_ENABLED:
+        _publish(namespaces)
+    on_commit(lambda: _CACHE.invalidate(namespaces))
+
+
+def invalidates(*namespaces: str) -> Callable:
+    """
+    Decorador de escrita: invalida os namespaces quando a função retorna.
+
+    Args:
+        *namespaces: Tabelas/entidades alteradas pela função
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            invalidate(*namespaces)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class CacheInvalidationListener:
+    """
+    Escuta o canal de invalidação (LISTEN) e remove as entradas afetadas.
+
+    Usa uma conexão dedicada em autocommit, fora do pool. Se a conexão cair,
+    o cache local é esvaziado (notificações podem ter sido perdidas) e a
+    escuta é retomada com backoff exponencial.
+
+    Args:
+        cache: Cache a ser invalidado
+        channel: Canal do LISTEN/NOTIFY
+        poll_interval: Segundos máximos de espera por notificações por ciclo
+    """
+
+    def __init__(self, cache: RepositoryCache, channel: str, poll_interval: float = 5.0):
+        self.cache = cache
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Inicia a thread de escuta (idempotente)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="maestro-cache-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Sinaliza a thread para encerrar."""
+        self._stop.set()
+
+    def _handle(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            namespaces = message["namespaces"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Notificação de cache inválida: %r", payload)
+            return
+
+        if message.get("origin") == _INSTANCE_ID:
+            return
+        self.cache.invalidate(namespaces, reason="notify")
+
+    def _listen(self) -> None:
+        conn = psycopg2.connect(get_database_url())
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f'LISTEN "{self.channel}"')
+            logger.info("Escutando invalidações de cache no canal %s", self.channel)
+
+            while not self._stop.is_set():
+                ready, _, _ = select.select([conn], [], [], self.poll_interval)
+                if not ready:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self._handle(conn.notifies.pop(0).payload)
+        finally:
+            conn.close()
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self._listen()
+            except Exception as e:
+                logger.warning("Listener de cache desconectado: %s", e)
+
+            # Sem conexão, notificações podem ter sido perdidas
+            self.cache.clear()
+            if time.monotonic() - started > 60:
+                backoff = 1.0
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, 60.0)
+
+
+_LISTENER: Optional[CacheInvalidationListener] = None
+_LISTENER_LOCK = threading.Lock()
+
+
+def _ensure_listener() -> None:
+    """Inicia o listener de invalidação na primeira leitura em cache."""
+    global _LISTENER
+    if _LISTENER is not None:
+        return
+    with _LISTENER_LOCK:
+        if _LISTENER is None:
+            listener = CacheInvalidationListener(_CACHE, _CHANNEL)
+            listener.start()
+            _LISTENER = listener
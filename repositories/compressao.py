@@ -0,0 +1,107 @@
+"""
+Compressão das respostas GPT guardadas em prompt_execucoes.resposta_gpt_comprimida.
+
+O primeiro byte dos dados indica o formato:
+    0x01  zlib
+    0x02  zstd (requer o pacote `zstandard`, em requirements.txt)
+
+O formato usado na gravação vem de RESPOSTA_COMPRESSAO ('zstd' ou 'zlib');
+se `zstandard` não estiver instalado, zlib é usado e um aviso é registrado.
+"""
+
+import logging
+import os
+import zlib
+from typing import Optional
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+FORMATO_ZLIB = 1
+FORMATO_ZSTD = 2
+
+FORMATOS = {"zlib": FORMATO_ZLIB, "zstd": FORMATO_ZSTD}
+
+logger = logging.getLogger(__name__)
+
+_aviso_zstd_emitido = False
+
+NIVEL_ZLIB = 6
+NIVEL_ZSTD = 10
+
+
+def formato_padrao() -> int:
+    """Formato de compressão configurado (RESPOSTA_COMPRESSAO), com fallback para zlib."""
+    nome = os.getenv("RESPOSTA_COMPRESSAO", "zstd").strip().lower()
+    if nome not in FORMATOS:
+        raise ValueError(f"RESPOSTA_COMPRESSAO inválido: {nome} (use 'zstd' ou 'zlib')")
+    if FORMATOS[nome] == FORMATO_ZSTD and not ZSTD_AVAILABLE:
+        global _aviso_zstd_emitido
+        if not _aviso_zstd_emitido:
+            logger.warning(
+                "RESPOSTA_COMPRESSAO=zstd, mas o pacote zstandard não está instalado; usando zlib"
+            )
+            _aviso_zstd_emitido = True
+        return FORMATO_ZLIB
+    return FORMATOS[nome]
+
+
+def comprimir(texto: str, formato: Optional[int] = None) -> bytes:
+    """
+    Comprime o texto de uma resposta, prefixado pelo byte de formato.
+
+    Args:
+        texto: Resposta GPT
+        formato: FORMATO_ZLIB ou FORMATO_ZSTD (usa formato_padrao() se não fornecido)
+
+    Returns:
+        Bytes para a coluna resposta_gpt_comprimida
+    """
+    if formato is None:
+        formato = formato_padrao()
+
+    dados = texto.encode("utf-8")
+    if formato == FORMATO_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise ValueError("Compressão zstd requer o pacote zstandard")
+        return bytes([FORMATO_ZSTD]) + zstandard.ZstdCompressor(level=NIVEL_ZSTD).compress(dados)
+    if formato == FORMATO_ZLIB:
+        return bytes([FORMATO_ZLIB]) + zlib.compress(dados, NIVEL_ZLIB)
+    raise ValueError(f"Formato de compressão desconhecido: {formato}")
+
+
+def descomprimir(dados) -> str:
+    """
+    Restaura o texto de uma resposta comprimida por comprimir().
+
+    Args:
+        dados: Conteúdo de resposta_gpt_comprimida (bytes ou memoryview)
+
+    Returns:
+        Texto da resposta
+
+    Raises:
+        ValueError: Se o formato for desconhecido ou exigir zstandard ausente
+    """
+    dados = bytes(dados)
+    if not dados:
+        raise ValueError("Resposta comprimida vazia")
+
+    formato, corpo = dados[0], dados[1:]
+    if formato == FORMATO_ZLIB:
+        return zlib.decompress(corpo).decode("utf-8")
+    if formato == FORMATO_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise ValueError("Resposta comprimida com zstd; instale o pacote zstandard")
+        return zstandard.ZstdDecompressor().decompress(corpo).decode("utf-8")
+    raise ValueError(f"Formato de compressão desconhecido: {formato}")
+
+
+def texto_resposta(texto: Optional[str], comprimida) -> Optional[str]:
+    """Retorna a resposta a partir da cópia comprimida, se houver, ou do texto."""
+    if comprimida is not None:
+        return descomprimir(comprimida)
+    return texto
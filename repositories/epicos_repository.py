@@ -3,10 +3,18 @@ Repositório para gerenciar Épicos no banco de dados.
 """
 
 import os
-from typing import Dict, List, Optional
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
-from database.connection import get_db_connection
+from psycopg2.extras import execute_values
+
+from database.connection import get_db_connection, stream_rows
 from observability.metrics import db_operation
+from repositories.cache import invalidates
+from repositories.modelos import Epico, TupleCursor
+from repositories.paginacao import (
+    ANTERIOR, Pagina, decodificar_cursor, montar_pagina, montar_pagina_tabela
+)
 
 
 def get_default_client_id() -> int:
@@ -14,8 +22,27 @@ def get_default_client_id() -> int:
     return int(os.getenv("DEFAULT_CLIENT_ID", "1"))
 
 
+# Épicos de um cliente (listar_epicos / iterar_epicos)
+SQL_EPICOS_CLIENTE = """
+    SELECT
+        id_epico,
+        titulo,
+        descricao_inicial as descricao,
+        status,
+        tag_atual as tag,
+        origem,
+        external_id,
+        azure_id,
+        criado_em,
+        atualizado_em
+    FROM epicos
+    WHERE id_cliente = %s
+    ORDER BY atualizado_em DESC
+"""
+
+
 @db_operation("listar_epicos")
-def listar_epicos(id_cliente: Optional[int] = None) -> List[Dict]:
+def listar_epicos(id_cliente: Optional[int] = None) -> List[Epico]:
     """
     Lista todos os épicos de um cliente.
 
@@ -23,38 +50,225 @@ def listar_epicos(id_cliente: Optional[int] = None) -> List[Dict]:
         id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
 
     Returns:
-        Lista de épicos como dicionários
+        Lista de épicos (registros Epico, com acesso estilo dicionário)
     """
     if id_cliente is None:
         id_cliente = get_default_client_id()
 
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            cur.execute(SQL_EPICOS_CLIENTE, (id_cliente,))
+
+            return Epico.todos(cur)
+
+
+def iterar_epicos(id_cliente: Optional[int] = None, itersize: int = 2000) -> Iterator[Epico]:
+    """
+    Gera todos os épicos de um cliente usando um cursor no servidor.
+
+    Equivale a listar_epicos, mas sem materializar o resultado: a memória
+    fica limitada a `itersize` linhas (útil para exportações).
+
+    Args:
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+        itersize: Linhas buscadas do servidor por lote
+
+    Yields:
+        Registros Epico
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    yield from stream_rows(
+        SQL_EPICOS_CLIENTE, (id_cliente,), itersize=itersize, row_factory=Epico.conversor
+    )
+
+
+# Chave de ordenação das páginas de épicos. atualizado_em pode ser NULL em
+# épicos nunca alterados; sem o COALESCE, a comparação de linha com NULL
+# pularia ou repetiria esses épicos entre as páginas.
+ORDEM_EPICOS = "COALESCE(atualizado_em, criado_em)"
+
+
+def _consulta_pagina_epicos(
+    colunas: str,
+    id_cliente: int,
+    tamanho: int,
+    cursor: Optional[str],
+) -> Tuple[str, List, Optional[str]]:
+    """Monta a consulta keyset de uma página de épicos com as colunas dadas."""
+    query = f"""
+        SELECT {colunas}
+        FROM epicos
+        WHERE id_cliente = %s
+    """
+    params: List = [id_cliente]
+
+    direcao = None
+    if cursor:
+        direcao, (atualizado_em, id_epico) = decodificar_cursor(cursor)
+        if direcao == ANTERIOR:
+            query += f" AND ({ORDEM_EPICOS}, id_epico) > (%s, %s)"
+        else:
+            query += f" AND ({ORDEM_EPICOS}, id_epico) < (%s, %s)"
+        params.extend([atualizado_em, id_epico])
+
+    if direcao == ANTERIOR:
+        query += f" ORDER BY {ORDEM_EPICOS} ASC, id_epico ASC"
+    else:
+        query += f" ORDER BY {ORDEM_EPICOS} DESC, id_epico DESC"
+
+    query += " LIMIT %s"
+    params.append(tamanho + 1)
+
+    return query, params, direcao
+
+
+@db_operation("listar_epicos_pagina")
+def listar_epicos_pagina(
+    id_cliente: Optional[int] = None,
+    tamanho: int = 50,
+    cursor: Optional[str] = None,
+) -> Pagina:
+    """
+    Lista uma página de épicos de um cliente, paginando por keyset.
+
+    A ordenação é (atualizado_em, id_epico) decrescente, usando criado_em
+    nos épicos sem atualizado_em; o custo de cada página depende apenas do
+    tamanho da página, não do total de épicos.
+
+    Args:
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+        tamanho: Número de épicos por página
+        cursor: Token `proximo`/`anterior` de uma página anterior (None = primeira)
+
+    Returns:
+        Página com os épicos (mesmos campos de listar_epicos) e tokens de navegação
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    query, params, direcao = _consulta_pagina_epicos("""
+            id_epico,
+            titulo,
+            descricao_inicial as descricao,
+            status,
+            tag_atual as tag,
+            origem,
+            external_id,
+            azure_id,
+            criado_em,
+            atualizado_em
+    """, id_cliente, tamanho, cursor)
+
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            cur.execute(query, params)
+            results = Epico.todos(cur)
+
+    return montar_pagina(
+        results, tamanho, direcao,
+        lambda e: (e['atualizado_em'] or e['criado_em'], e['id_epico'])
+    )
+
+
+@db_operation("tabela_epicos_pagina")
+def tabela_epicos_pagina(
+    id_cliente: Optional[int] = None,
+    tamanho: int = 50,
+    cursor: Optional[str] = None,
+) -> Pagina:
+    """
+    Página de épicos já no formato da tabela da tela de Épicos.
+
+    Seleciona apenas as colunas exibidas, com os rótulos em português, e
+    monta o DataFrame direto das tuplas do cursor. Usa os mesmos tokens
+    de cursor que listar_epicos_pagina.
+
+    Args:
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+        tamanho: Número de épicos por página
+        cursor: Token `proximo`/`anterior` de uma página anterior (None = primeira)
+
+    Returns:
+        Página com `itens` como DataFrame e tokens de navegação
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    query, params, direcao = _consulta_pagina_epicos("""
+            id_epico as "ID",
+            titulo as "Título",
+            status as "Status",
+            tag_atual as "Tag",
+            origem as "Origem",
+            external_id as "ID Externo",
+            criado_em as "Criado em",
+            COALESCE(atualizado_em, criado_em) as "Atualizado em"
+    """, id_cliente, tamanho, cursor)
+
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            cur.execute(query, params)
+            return montar_pagina_tabela(cur, tamanho, direcao, ("Atualizado em", "ID"))
+
+
+@db_operation("buscar_epicos")
+def buscar_epicos(
+    texto: str,
+    limite: int = 20,
+    id_cliente: Optional[int] = None
+) -> List[Epico]:
+    """
+    Busca épicos por texto no título e na descrição (busca textual do PostgreSQL).
+
+    Usa a coluna busca_tsv (migração 0001) e o índice GIN; aceita a sintaxe
+    de websearch_to_tsquery ("frase exata", -excluir, OR). Título pesa mais
+    que descrição na relevância.
+
+    Args:
+        texto: Termos de busca
+        limite: Número máximo de resultados
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+
+    Returns:
+        Épicos encontrados, do mais relevante para o menos relevante
+        (campo "relevancia" preenchido)
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    if not texto or not texto.strip():
+        return []
+
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             cur.execute("""
                 SELECT
-                    id_epico,
-                    titulo,
-                    descricao_inicial as descricao,
-                    status,
-                    tag_atual as tag,
-                    origem,
-                    external_id,
-                    azure_id,
-                    criado_em,
-                    atualizado_em
-                FROM epicos
-                WHERE id_cliente = %s
-                ORDER BY atualizado_em DESC
-            """, (id_cliente,))
-
-            results = cur.fetchall()
+                    e.id_epico,
+                    e.titulo,
+                    e.descricao_inicial as descricao,
+                    e.status,
+                    e.tag_atual as tag,
+                    e.origem,
+                    e.external_id,
+                    e.azure_id,
+                    e.criado_em,
+                    e.atualizado_em,
+                    ts_rank(e.busca_tsv, q.consulta) as relevancia
+                FROM epicos e
+                CROSS JOIN websearch_to_tsquery('portuguese', %s) AS q(consulta)
+                WHERE e.id_cliente = %s
+                  AND e.busca_tsv @@ q.consulta
+                ORDER BY relevancia DESC, e.atualizado_em DESC
+                LIMIT %s
+            """, (texto.strip(), id_cliente, limite))
 
-            # Converter para lista de dicionários (já vem como RealDictRow)
-            return [dict(row) for row in results]
+            return Epico.todos(cur)
 
 
 @db_operation("buscar_epico_por_id")
-def buscar_epico_por_id(id_epico: int) -> Optional[Dict]:
+def buscar_epico_por_id(id_epico: int) -> Optional[Epico]:
     """
     Busca um épico específico pelo ID.
 
@@ -62,10 +276,10 @@ def buscar_epico_por_id(id_epico: int) -> Optional[Dict]:
         id_epico: ID do épico
 
     Returns:
-        Dicionário com dados do épico ou None se não encontrado
+        Registro Epico ou None se não encontrado
     """
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             cur.execute("""
                 SELECT
                     e.id_epico,
@@ -84,10 +298,17 @@ def buscar_epico_por_id(id_epico: int) -> Optional[Dict]:
                 WHERE e.id_epico = %s
             """, (id_epico,))
 
-            result = cur.fetchone()
-            return dict(result) if result else None
+            return Epico.primeiro(cur)
 
 
+def _descricao_completa(descricao: str, contexto: Optional[str]) -> str:
+    """Combina a descrição com o contexto adicional, se houver."""
+    if contexto:
+        return f"{descricao}\n\nContexto adicional:\n{contexto}"
+    return descricao
+
+
+@invalidates("epicos")
 @db_operation("criar_epico")
 def criar_epico(
     titulo: str,
@@ -118,13 +339,9 @@ def criar_epico(
 
     # Se não houver external_id, gerar um baseado no timestamp
     if not external_id:
-        import time
         external_id = f"EP{int(time.time())}"
 
-    # Combinar descrição e contexto se houver contexto
-    descricao_completa = descricao
-    if contexto:
-        descricao_completa = f"{descricao}\n\nContexto adicional:\n{contexto}"
+    descricao_completa = _descricao_completa(descricao, contexto)
 
     with get_db_connection() as conn:
         with conn.cursor() as cur:
@@ -147,6 +364,89 @@ def criar_epico(
             return result['id_epico']
 
 
+@invalidates("epicos")
+@db_operation("criar_epicos_em_lote")
+def criar_epicos_em_lote(
+    epicos: List[Dict],
+    id_cliente: Optional[int] = None,
+    tamanho_lote: int = 1000,
+) -> List[int]:
+    """
+    Cria vários épicos de uma vez, em uma única transação.
+
+    Os épicos são enviados em INSERTs com VALUES de várias linhas
+    (`tamanho_lote` linhas por comando), em vez de um round-trip por épico.
+    Se algum lote falhar, nenhum épico é criado.
+
+    Args:
+        epicos: Dicionários com "titulo" e "descricao" (obrigatórios) e,
+            opcionalmente, "contexto", "tag", "origem" e "external_id"
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+        tamanho_lote: Linhas por comando INSERT
+
+    Returns:
+        IDs dos épicos criados, na mesma ordem de `epicos`
+
+    Raises:
+        ValueError: Se algum épico não tiver título ou descrição, ou se o
+            mesmo external_id aparecer mais de uma vez
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    if not epicos:
+        return []
+
+    prefixo_external_id = f"EP{int(time.time())}"
+
+    valores = []
+    for indice, epico in enumerate(epicos, start=1):
+        titulo = (epico.get("titulo") or "").strip()
+        descricao = (epico.get("descricao") or "").strip()
+        if not titulo or not descricao:
+            raise ValueError(f"Épico {indice}: título e descrição são obrigatórios")
+
+        valores.append((
+            id_cliente,
+            epico.get("origem") or "manual",
+            epico.get("external_id") or f"{prefixo_external_id}-{indice}",
+            titulo,
+            _descricao_completa(descricao, epico.get("contexto")),
+            epico.get("tag") or "analise_pre",
+        ))
+
+    external_ids = [valor[2] for valor in valores]
+    if len(set(external_ids)) != len(external_ids):
+        raise ValueError("Há external_id repetido entre os épicos do lote")
+
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            linhas = execute_values(
+                cur,
+                """
+                INSERT INTO epicos (
+                    id_cliente,
+                    origem,
+                    external_id,
+                    titulo,
+                    descricao_inicial,
+                    tag_atual,
+                    status
+                ) VALUES %s
+                RETURNING external_id, id_epico
+                """,
+                valores,
+                template="(%s, %s, %s, %s, %s, %s, 'em_analise')",
+                page_size=tamanho_lote,
+                fetch=True,
+            )
+
+    # RETURNING não garante a ordem das linhas: associa pelo external_id
+    ids_por_external_id = dict(linhas)
+    return [ids_por_external_id[external_id] for external_id in external_ids]
+
+
+@invalidates("epicos")
 @db_operation("atualizar_epico")
 def atualizar_epico(
     id_epico: int,
@@ -207,6 +507,59 @@ def atualizar_epico(
             return cur.rowcount > 0
 
 
+@invalidates("epicos")
+@db_operation("atualizar_epicos_em_lote")
+def atualizar_epicos_em_lote(
+    ids: Sequence[int],
+    status: Optional[str] = None,
+    tag: Optional[str] = None,
+    id_cliente: Optional[int] = None
+) -> int:
+    """
+    Aplica o mesmo status e/ou tag a vários épicos com um único UPDATE.
+
+    Args:
+        ids: IDs dos épicos
+        status: Novo status (opcional)
+        tag: Nova tag (opcional)
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido);
+            épicos de outros clientes são ignorados
+
+    Returns:
+        Número de épicos atualizados
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    updates = []
+    params: List = []
+
+    if status is not None:
+        updates.append("status = %s")
+        params.append(status)
+
+    if tag is not None:
+        updates.append("tag_atual = %s")
+        params.append(tag)
+
+    if not updates or not ids:
+        return 0
+
+    updates.append("atualizado_em = NOW()")
+    params.extend([list(ids), id_cliente])
+
+    query = f"""
+        UPDATE epicos
+        SET {', '.join(updates)}
+        WHERE id_epico = ANY(%s) AND id_cliente = %s
+    """
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            return cur.rowcount
+
+
 @db_operation("contar_epicos")
 def contar_epicos(id_cliente: Optional[int] = None) -> int:
     """
@@ -0,0 +1,133 @@
+"""
+Modelos de linha compactos para os resultados dos repositórios.
+
+Cada entidade é uma namedtuple (sem __dict__ por instância) construída
+diretamente a partir das tuplas do cursor, sem o RealDictRow intermediário
+nem a cópia para dict. Para manter compatibilidade com as telas, os
+registros também aceitam acesso estilo dicionário: registro['campo'],
+registro.get('campo'), keys(), items() e dict(registro).
+
+Campos não selecionados pela consulta ficam como None.
+"""
+
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from psycopg2.extensions import cursor as TupleCursor
+
+__all__ = [
+    "TupleCursor",
+    "Epico",
+    "Analise",
+    "Prompt",
+    "Tag",
+    "TagAcao",
+    "Acao",
+]
+
+
+class _Registro:
+    """Acesso estilo dicionário para namedtuples (mixin sem estado)."""
+
+    __slots__ = ()
+    _fields: tuple
+    _indices: Dict[str, int]
+
+    def __getitem__(self, chave):
+        if isinstance(chave, str):
+            return tuple.__getitem__(self, self._indices[chave])
+        return tuple.__getitem__(self, chave)
+
+    def __contains__(self, chave) -> bool:
+        return chave in self._indices
+
+    def get(self, chave: str, padrao: Any = None) -> Any:
+        indice = self._indices.get(chave)
+        return padrao if indice is None else tuple.__getitem__(self, indice)
+
+    def keys(self):
+        return self._fields
+
+    def values(self):
+        return tuple(self)
+
+    def items(self):
+        return zip(self._fields, self)
+
+    @classmethod
+    def conversor(cls, colunas: Sequence[str]) -> Callable[[Sequence[Any]], "_Registro"]:
+        """
+        Retorna a função que converte uma tupla do cursor neste modelo.
+
+        Se as colunas coincidirem com os campos (mesma ordem) a tupla é usada
+        diretamente; caso contrário as colunas são reposicionadas.
+        """
+        colunas = tuple(colunas)
+        if colunas == cls._fields:
+            return cls._make
+
+        desconhecidas = set(colunas) - set(cls._fields)
+        if desconhecidas:
+            raise ValueError(f"Colunas sem campo em {cls.__name__}: {sorted(desconhecidas)}")
+
+        posicoes = {nome: i for i, nome in enumerate(colunas)}
+        indices = [posicoes.get(campo) for campo in cls._fields]
+
+        def converter(linha):
+            return cls._make([None if i is None else linha[i] for i in indices])
+
+        return converter
+
+    @classmethod
+    def todos(cls, cur) -> List["_Registro"]:
+        """Converte todas as linhas restantes de um cursor de tuplas."""
+        converter = cls.conversor([coluna.name for coluna in cur.description])
+        return list(map(converter, cur.fetchall()))
+
+    @classmethod
+    def primeiro(cls, cur) -> Optional["_Registro"]:
+        """Converte a próxima linha de um cursor de tuplas (ou None)."""
+        linha = cur.fetchone()
+        if linha is None:
+            return None
+        return cls.conversor([coluna.name for coluna in cur.description])(linha)
+
+
+def _modelo(nome: str, campos: str) -> type:
+    base = namedtuple(nome, campos, defaults=None)
+    modelo = type(nome, (_Registro, base), {"__slots__": (), "__module__": __name__})
+    modelo._indices = {campo: i for i, campo in enumerate(base._fields)}
+    return modelo
+
+
+Epico = _modelo("Epico", """
+    id_epico titulo descricao discussao status tag origem
+    external_id azure_id criado_em atualizado_em id_cliente relevancia
+""")
+
+Analise = _modelo("Analise", """
+    id_execucao epico id_epico executado_em data modelo prompt_nome
+    prompt_contexto status tokens_consumidos custo_estimado
+    tempo_execucao_ms resultado resultado_comprimido relevancia trecho
+""")
+
+Prompt = _modelo("Prompt", """
+    id_prompt id_cliente nome tag versao ativo template_prompt
+    variaveis_esperadas temperatura max_tokens metadata criado_em
+    atualizado_em ultima_atualizacao em_uso
+""")
+
+Tag = _modelo("Tag", """
+    id_tag id_cliente nome descricao cor_hex ativo criado_em
+    atualizado_em usos acoes_associadas
+""")
+
+TagAcao = _modelo("TagAcao", """
+    id_tag_acao id_tag tag_nome tag_cor id_acao acao_nome acao_codigo
+    acao_tipo id_prompt prompt_nome prioridade condicoes_extras
+    parametros ativo criado_em
+""")
+
+Acao = _modelo("Acao", """
+    id_acao codigo nome descricao tipo ativo criado_em usos
+""")
@@ -0,0 +1,152 @@
+"""
+Utilitários de paginação por keyset (cursor) para os repositórios.
+
+Os tokens de cursor são opacos para as telas: codificam a direção da
+navegação e os valores da chave de ordenação da linha de referência.
+"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+PROXIMA = "proxima"
+ANTERIOR = "anterior"
+
+
+@dataclass
+class Pagina:
+    """
+    Uma página de resultados com os tokens para navegar às vizinhas.
+
+    `itens` é uma lista de registros ou, nas variantes de tabela, um DataFrame.
+    """
+
+    itens: Any = field(default_factory=list)
+    proximo: Optional[str] = None
+    anterior: Optional[str] = None
+
+    @property
+    def vazia(self) -> bool:
+        return len(self.itens) == 0
+
+
+def _serializar(valor: Any) -> Any:
+    if isinstance(valor, datetime):
+        return {"dt": valor.isoformat()}
+    if isinstance(valor, date):
+        return {"d": valor.isoformat()}
+    return valor
+
+
+def _desserializar(valor: Any) -> Any:
+    if isinstance(valor, dict):
+        if "dt" in valor:
+            return datetime.fromisoformat(valor["dt"])
+        if "d" in valor:
+            return date.fromisoformat(valor["d"])
+    return valor
+
+
+def codificar_cursor(direcao: str, chave: Sequence[Any]) -> str:
+    """Gera um token de cursor a partir da direção e da chave de ordenação."""
+    payload = {"d": direcao, "k": [_serializar(v) for v in chave]}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decodificar_cursor(token: str) -> Tuple[str, List[Any]]:
+    """
+    Decodifica um token de cursor.
+
+    Returns:
+        Tupla (direção, valores da chave)
+
+    Raises:
+        ValueError: Se o token for inválido
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        direcao = payload["d"]
+        chave = [_desserializar(v) for v in payload["k"]]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Cursor de paginação inválido: {token!r}") from e
+
+    if direcao not in (PROXIMA, ANTERIOR):
+        raise ValueError(f"Direção de paginação inválida: {direcao!r}")
+
+    return direcao, chave
+
+
+def montar_pagina(
+    linhas: List[Dict],
+    tamanho: int,
+    direcao: Optional[str],
+    chave: Callable[[Dict], Sequence[Any]],
+) -> Pagina:
+    """
+    Monta a página a partir das linhas lidas com LIMIT tamanho + 1.
+
+    Args:
+        linhas: Linhas retornadas pela consulta (na ordem da consulta)
+        tamanho: Tamanho da página
+        direcao: Direção do cursor usado (None para a primeira página)
+        chave: Função que extrai a chave de ordenação de uma linha
+
+    Returns:
+        Página com os itens na ordem de exibição e os tokens de navegação
+    """
+    ha_mais = len(linhas) > tamanho
+    itens = linhas[:tamanho]
+
+    if direcao == ANTERIOR:
+        # A consulta de página anterior lê na ordem inversa
+        itens.reverse()
+
+    if not itens:
+        return Pagina()
+
+    if direcao == ANTERIOR:
+        tem_proxima, tem_anterior = True, ha_mais
+    else:
+        tem_proxima, tem_anterior = ha_mais, direcao is not None
+
+    return Pagina(
+        itens=itens,
+        proximo=codificar_cursor(PROXIMA, chave(itens[-1])) if tem_proxima else None,
+        anterior=codificar_cursor(ANTERIOR, chave(itens[0])) if tem_anterior else None,
+    )
+
+
+def montar_pagina_tabela(
+    cur,
+    tamanho: int,
+    direcao: Optional[str],
+    chave: Sequence[str],
+) -> Pagina:
+    """
+    Monta a página como DataFrame direto das tuplas de um cursor de tuplas.
+
+    As colunas do DataFrame são as da consulta (já com os rótulos de
+    exibição), sem passar por dicionários nem cópias intermediárias.
+
+    Args:
+        cur: Cursor de tuplas já executado com LIMIT tamanho + 1
+        tamanho: Tamanho da página
+        direcao: Direção do cursor usado (None para a primeira página)
+        chave: Nomes das colunas que formam a chave de ordenação
+
+    Returns:
+        Página com `itens` como DataFrame e os tokens de navegação
+    """
+    colunas = [coluna.name for coluna in cur.description]
+    indices = [colunas.index(nome) for nome in chave]
+
+    pagina = montar_pagina(
+        cur.fetchall(), tamanho, direcao, lambda linha: [linha[i] for i in indices]
+    )
+    pagina.itens = pd.DataFrame.from_records(pagina.itens, columns=colunas)
+    return pagina
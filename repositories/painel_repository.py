@@ -0,0 +1,68 @@
+"""
+Repositório com consultas agregadas para o painel inicial.
+"""
+
+import os
+from typing import Dict, Optional
+
+from database.connection import get_db_connection
+from observability.metrics import db_operation
+
+
+def get_default_client_id() -> int:
+    """Retorna o ID do cliente padrão configurado no .env."""
+    return int(os.getenv("DEFAULT_CLIENT_ID", "1"))
+
+
+@db_operation("resumo_painel")
+def resumo_painel(id_cliente: Optional[int] = None) -> Dict[str, int]:
+    """
+    Retorna os contadores do painel inicial em uma única consulta.
+
+    Equivale a contar_epicos, contar_analises, contar_prompts e contar_tags
+    (prompts e tags apenas ativos), mas com um só round-trip ao banco.
+
+    Args:
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+
+    Returns:
+        Dicionário com as chaves epicos, analises, prompts e tags
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT
+                    (
+                        SELECT COUNT(*)
+                        FROM epicos
+                        WHERE id_cliente = %s
+                    ) as epicos,
+                    (
+                        SELECT COUNT(*)
+                        FROM prompt_execucoes pe
+                        INNER JOIN epicos e ON pe.id_epico = e.id_epico
+                        WHERE e.id_cliente = %s
+                          AND pe.status = 'sucesso'
+                    ) as analises,
+                    (
+                        SELECT COUNT(*)
+                        FROM prompts
+                        WHERE id_cliente = %s AND ativo = true
+                    ) as prompts,
+                    (
+                        SELECT COUNT(*)
+                        FROM tags
+                        WHERE id_cliente = %s AND ativo = true
+                    ) as tags
+            """, (id_cliente, id_cliente, id_cliente, id_cliente))
+
+            result = cur.fetchone()
+            return {
+                "epicos": result['epicos'],
+                "analises": result['analises'],
+                "prompts": result['prompts'],
+                "tags": result['tags'],
+            }
@@ -3,11 +3,12 @@ Repositório para gerenciar Prompts no banco de dados.
 """
 
 import os
-from datetime import datetime
 from typing import Dict, List, Optional
 
 from database.connection import get_db_connection
 from observability.metrics import db_operation
+from repositories.cache import cached, invalidates
+from repositories.modelos import Prompt, TupleCursor
 
 
 def get_default_client_id() -> int:
@@ -15,8 +16,9 @@ def get_default_client_id() -> int:
     return int(os.getenv("DEFAULT_CLIENT_ID", "1"))
 
 
+@cached("prompts")
 @db_operation("listar_prompts")
-def listar_prompts(id_cliente: Optional[int] = None, apenas_ativos: bool = True) -> List[Dict]:
+def listar_prompts(id_cliente: Optional[int] = None, apenas_ativos: bool = True) -> List[Prompt]:
     """
     Lista os prompts cadastrados de um cliente.
 
@@ -25,27 +27,78 @@ def listar_prompts(id_cliente: Optional[int] = None, apenas_ativos: bool = True)
         apenas_ativos: Se True, retorna apenas prompts ativos
 
     Returns:
-        Lista de prompts como dicionários
+        Lista de prompts (registros Prompt)
     """
     if id_cliente is None:
         id_cliente = get_default_client_id()
 
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            # "em_uso" (número de execuções) vem de um agregado por prompt
+            # na mesma consulta, em vez de um COUNT separado por prompt; o
+            # agregado lê apenas as execuções dos prompts do cliente
+            query = """
+                SELECT
+                    p.id_prompt,
+                    p.nome,
+                    p.contexto as tag,
+                    p.versao,
+                    p.ativo,
+                    p.template_prompt,
+                    p.variaveis_esperadas,
+                    COALESCE(NULLIF(p.temperatura, 0), 0.7)::float8 as temperatura,
+                    p.max_tokens,
+                    p.metadata,
+                    p.criado_em,
+                    to_char(p.atualizado_em, 'YYYY-MM-DD HH24:MI') as ultima_atualizacao,
+                    COALESCE(uso.total, 0) as em_uso
+                FROM prompts p
+                LEFT JOIN (
+                    SELECT id_prompt, COUNT(*) as total
+                    FROM prompt_execucoes
+                    WHERE id_prompt IN (SELECT id_prompt FROM prompts WHERE id_cliente = %s)
+                    GROUP BY id_prompt
+                ) uso ON uso.id_prompt = p.id_prompt
+                WHERE p.id_cliente = %s
+            """
+
+            params = [id_cliente, id_cliente]
+
+            if apenas_ativos:
+                query += " AND p.ativo = true"
+
+            query += " ORDER BY p.contexto, p.nome"
+
+            cur.execute(query, params)
+            return Prompt.todos(cur)
+
+
+@cached("prompts")
+@db_operation("listar_prompts_opcoes")
+def listar_prompts_opcoes(id_cliente: Optional[int] = None, apenas_ativos: bool = True) -> List[Prompt]:
+    """
+    Lista apenas id, nome, contexto e versão dos prompts (para selectboxes).
+
+    Não carrega templates nem conta execuções.
+
+    Args:
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+        apenas_ativos: Se True, retorna apenas prompts ativos
+
+    Returns:
+        Lista de prompts (registros Prompt só com esses campos)
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             query = """
                 SELECT
                     id_prompt,
                     nome,
                     contexto as tag,
-                    versao,
-                    ativo,
-                    template_prompt,
-                    variaveis_esperadas,
-                    temperatura,
-                    max_tokens,
-                    metadata,
-                    criado_em,
-                    atualizado_em as ultima_atualizacao
+                    versao
                 FROM prompts
                 WHERE id_cliente = %s
             """
@@ -58,42 +111,11 @@ def listar_prompts(id_cliente: Optional[int] = None, apenas_ativos: bool = True)
             query += " ORDER BY contexto, nome"
 
             cur.execute(query, params)
-            results = cur.fetchall()
-
-            # Calcular "em_uso" (número de vezes que o prompt foi executado)
-            prompts = []
-            for row in results:
-                # Buscar contagem de uso
-                cur.execute("""
-                    SELECT COUNT(*) as total
-                    FROM prompt_execucoes
-                    WHERE id_prompt = %s
-                """, (row['id_prompt'],))
-
-                uso_result = cur.fetchone()
-                em_uso = uso_result['total'] if uso_result else 0
-
-                prompt = {
-                    "id_prompt": row['id_prompt'],
-                    "nome": row['nome'],
-                    "tag": row['tag'],
-                    "versao": row['versao'],
-                    "ativo": row['ativo'],
-                    "template_prompt": row['template_prompt'],
-                    "variaveis_esperadas": row['variaveis_esperadas'],
-                    "temperatura": float(row['temperatura']) if row['temperatura'] else 0.7,
-                    "max_tokens": row['max_tokens'],
-                    "metadata": row['metadata'],
-                    "ultima_atualizacao": row['ultima_atualizacao'].strftime("%Y-%m-%d %H:%M") if isinstance(row['ultima_atualizacao'], datetime) else str(row['ultima_atualizacao']),
-                    "em_uso": em_uso
-                }
-                prompts.append(prompt)
-
-            return prompts
+            return Prompt.todos(cur)
 
 
 @db_operation("buscar_prompt_por_id")
-def buscar_prompt_por_id(id_prompt: int) -> Optional[Dict]:
+def buscar_prompt_por_id(id_prompt: int) -> Optional[Prompt]:
     """
     Busca um prompt específico pelo ID.
 
@@ -101,10 +123,10 @@ def buscar_prompt_por_id(id_prompt: int) -> Optional[Dict]:
         id_prompt: ID do prompt
 
     Returns:
-        Dicionário com dados do prompt ou None se não encontrado
+        Registro Prompt ou None se não encontrado
     """
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             cur.execute("""
                 SELECT
                     id_prompt,
@@ -124,8 +146,7 @@ def buscar_prompt_por_id(id_prompt: int) -> Optional[Dict]:
                 WHERE id_prompt = %s
             """, (id_prompt,))
 
-            result = cur.fetchone()
-            return dict(result) if result else None
+            return Prompt.primeiro(cur)
 
 
 @db_operation("buscar_prompt_por_contexto")
@@ -133,7 +154,7 @@ def buscar_prompt_por_contexto(
     contexto: str,
     id_cliente: Optional[int] = None,
     apenas_ativos: bool = True
-) -> Optional[Dict]:
+) -> Optional[Prompt]:
     """
     Busca o prompt ativo mais recente de um contexto específico.
 
@@ -143,13 +164,13 @@ def buscar_prompt_por_contexto(
         apenas_ativos: Se True, busca apenas prompts ativos
 
     Returns:
-        Dicionário com dados do prompt ou None se não encontrado
+        Registro Prompt ou None se não encontrado
     """
     if id_cliente is None:
         id_cliente = get_default_client_id()
 
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             query = """
                 SELECT
                     id_prompt,
@@ -174,9 +195,7 @@ def buscar_prompt_por_contexto(
             query += " ORDER BY atualizado_em DESC LIMIT 1"
 
             cur.execute(query, params)
-            result = cur.fetchone()
-
-            return dict(result) if result else None
+            return Prompt.primeiro(cur)
 
 
 @db_operation("contar_prompts")
@@ -212,6 +231,7 @@ def contar_prompts(id_cliente: Optional[int] = None, apenas_ativos: bool = True)
             return result['total']
 
 
+@cached("prompts")
 @db_operation("listar_contextos_prompts")
 def listar_contextos_disponiveis() -> List[str]:
     """
@@ -233,6 +253,7 @@ def listar_contextos_disponiveis() -> List[str]:
             return [row['contexto'] for row in results]
 
 
+@invalidates("prompts")
 @db_operation("criar_prompt")
 def criar_prompt(
     nome: str,
@@ -301,6 +322,7 @@ def criar_prompt(
             return result['id_prompt']
 
 
+@invalidates("prompts")
 @db_operation("atualizar_prompt")
 def atualizar_prompt(
     id_prompt: int,
@@ -405,6 +427,7 @@ def excluir_prompt(id_prompt: int) -> bool:
     return atualizar_prompt(id_prompt, ativo=False)
 
 
+@invalidates("prompts")
 @db_operation("excluir_prompt_permanente")
 def excluir_prompt_permanente(id_prompt: int) -> bool:
     """
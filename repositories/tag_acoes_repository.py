@@ -2,12 +2,15 @@
 Repositório para gerenciar associações entre Tags e Ações (tag_acoes).
 """
 
-from database.connection import get_db_connection
-from typing import List, Dict, Optional
+from database.connection import get_db_connection, transaction
+from repositories.cache import cached, invalidates
+from repositories.modelos import TagAcao, TupleCursor
+from typing import List, Dict, Optional, Sequence, Set, Tuple
 import json
 
 
-def listar_tag_acoes(id_tag: Optional[int] = None, apenas_ativas: bool = True) -> List[Dict]:
+@cached("tag_acoes", "tags", "acoes", "prompts")
+def listar_tag_acoes(id_tag: Optional[int] = None, apenas_ativas: bool = True) -> List[TagAcao]:
     """
     Lista todas as associações tag-ação.
 
@@ -16,10 +19,10 @@ def listar_tag_acoes(id_tag: Optional[int] = None, apenas_ativas: bool = True) -
         apenas_ativas: Se True, retorna apenas associações ativas
 
     Returns:
-        Lista de associações como dicionários
+        Lista de associações (registros TagAcao)
     """
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             query = """
                 SELECT
                     ta.id_tag_acao,
@@ -56,12 +59,10 @@ def listar_tag_acoes(id_tag: Optional[int] = None, apenas_ativas: bool = True) -
             query += " ORDER BY ta.prioridade ASC, t.nome, a.nome"
 
             cur.execute(query, params)
-            results = cur.fetchall()
-
-            return [dict(row) for row in results]
+            return TagAcao.todos(cur)
 
 
-def buscar_tag_acao_por_id(id_tag_acao: int) -> Optional[Dict]:
+def buscar_tag_acao_por_id(id_tag_acao: int) -> Optional[TagAcao]:
     """
     Busca uma associação específica pelo ID.
 
@@ -69,10 +70,10 @@ def buscar_tag_acao_por_id(id_tag_acao: int) -> Optional[Dict]:
         id_tag_acao: ID da associação
 
     Returns:
-        Dicionário com dados da associação ou None se não encontrada
+        Registro TagAcao ou None se não encontrada
     """
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             cur.execute("""
                 SELECT
                     ta.id_tag_acao,
@@ -95,10 +96,10 @@ def buscar_tag_acao_por_id(id_tag_acao: int) -> Optional[Dict]:
                 WHERE ta.id_tag_acao = %s
             """, (id_tag_acao,))
 
-            result = cur.fetchone()
-            return dict(result) if result else None
+            return TagAcao.primeiro(cur)
 
 
+@invalidates("tag_acoes")
 def criar_tag_acao(
     id_tag: int,
     id_acao: int,
@@ -149,6 +150,109 @@ def criar_tag_acao(
             return result['id_tag_acao']
 
 
+def verificar_duplicatas(pares: Sequence[Tuple[int, int]], id_prompt: int) -> Set[Tuple[int, int]]:
+    """
+    Verifica, em uma única consulta, quais pares (tag, ação) já têm
+    associação ativa com o prompt.
+
+    Args:
+        pares: Pares (id_tag, id_acao)
+        id_prompt: ID do prompt
+
+    Returns:
+        Conjunto dos pares (id_tag, id_acao) que já existem
+    """
+    if not pares:
+        return set()
+
+    ids_tags, ids_acoes = zip(*pares)
+
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            cur.execute("""
+                SELECT ta.id_tag, ta.id_acao
+                FROM tag_acoes ta
+                INNER JOIN unnest(%s::int[], %s::int[]) AS n(id_tag, id_acao)
+                    ON n.id_tag = ta.id_tag AND n.id_acao = ta.id_acao
+                WHERE ta.id_prompt = %s AND ta.ativo = true
+            """, (list(ids_tags), list(ids_acoes), id_prompt))
+
+            return {(id_tag, id_acao) for id_tag, id_acao in cur.fetchall()}
+
+
+@invalidates("tag_acoes")
+def criar_tag_acoes_em_lote(
+    pares: Sequence[Tuple[int, int]],
+    id_prompt: int,
+    prioridade: int = 1,
+    condicoes_extras: Optional[Dict] = None,
+    parametros: Optional[Dict] = None
+) -> Dict[str, List]:
+    """
+    Cria várias associações tag-ação com o mesmo prompt de uma só vez.
+
+    As duplicatas (associação ativa com o mesmo prompt) são detectadas por
+    uma consulta sobre todos os pares e as demais associações são inseridas
+    com um único INSERT ... ON CONFLICT DO NOTHING, na mesma transação.
+    Pares barrados por restrição de unicidade (ex.: associação inativa ou
+    com outro prompt) também são ignorados.
+
+    Args:
+        pares: Pares (id_tag, id_acao) a associar
+        id_prompt: ID do prompt a ser executado
+        prioridade: Prioridade de execução (menor = mais prioritário)
+        condicoes_extras: Condições extras em JSON
+        parametros: Parâmetros adicionais em JSON
+
+    Returns:
+        Dicionário com "criadas" (IDs das associações criadas), "duplicadas"
+        e "conflitos" (pares (id_tag, id_acao) não inseridos)
+    """
+    pares = list(dict.fromkeys((int(t), int(a)) for t, a in pares))
+
+    with transaction():
+        duplicadas = verificar_duplicatas(pares, id_prompt)
+        novos = [par for par in pares if par not in duplicadas]
+
+        inseridos = []
+        if novos:
+            ids_tags, ids_acoes = zip(*novos)
+            with get_db_connection() as conn:
+                with conn.cursor(cursor_factory=TupleCursor) as cur:
+                    cur.execute("""
+                        INSERT INTO tag_acoes (
+                            id_tag,
+                            id_acao,
+                            id_prompt,
+                            prioridade,
+                            condicoes_extras,
+                            parametros,
+                            ativo
+                        )
+                        SELECT n.id_tag, n.id_acao, %s, %s, %s, %s, true
+                        FROM unnest(%s::int[], %s::int[]) AS n(id_tag, id_acao)
+                        ON CONFLICT DO NOTHING
+                        RETURNING id_tag_acao, id_tag, id_acao
+                    """, (
+                        id_prompt,
+                        prioridade,
+                        json.dumps(condicoes_extras) if condicoes_extras else None,
+                        json.dumps(parametros) if parametros else None,
+                        list(ids_tags),
+                        list(ids_acoes)
+                    ))
+                    inseridos = cur.fetchall()
+
+    criados = {(id_tag, id_acao) for _, id_tag, id_acao in inseridos}
+
+    return {
+        "criadas": [id_tag_acao for id_tag_acao, _, _ in inseridos],
+        "duplicadas": [par for par in pares if par in duplicadas],
+        "conflitos": [par for par in novos if par not in criados],
+    }
+
+
+@invalidates("tag_acoes")
 def atualizar_tag_acao(
     id_tag_acao: int,
     prioridade: Optional[int] = None,
@@ -218,6 +322,7 @@ def excluir_tag_acao(id_tag_acao: int) -> bool:
     return atualizar_tag_acao(id_tag_acao, ativo=False)
 
 
+@invalidates("tag_acoes")
 def excluir_tag_acao_permanente(id_tag_acao: int) -> bool:
     """
     Exclui uma associação permanentemente do banco de dados.
@@ -235,7 +340,7 @@ def excluir_tag_acao_permanente(id_tag_acao: int) -> bool:
             return cur.rowcount > 0
 
 
-def listar_acoes_por_tag(id_tag: int) -> List[Dict]:
+def listar_acoes_por_tag(id_tag: int) -> List[TagAcao]:
     """
     Lista todas as ações associadas a uma tag específica.
 
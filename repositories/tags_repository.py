@@ -4,10 +4,12 @@ Repositório para gerenciar Tags no banco de dados.
 
 import os
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import List, Optional
 
 from database.connection import get_db_connection
 from observability.metrics import db_operation
+from repositories.cache import cached, invalidates
+from repositories.modelos import Tag, TupleCursor
 
 
 def get_default_client_id() -> int:
@@ -15,8 +17,9 @@ def get_default_client_id() -> int:
     return int(os.getenv("DEFAULT_CLIENT_ID", "1"))
 
 
+@cached("tags", "epicos", "tag_acoes")
 @db_operation("listar_tags")
-def listar_tags(id_cliente: Optional[int] = None, apenas_ativas: bool = True) -> List[Dict]:
+def listar_tags(id_cliente: Optional[int] = None, apenas_ativas: bool = True) -> List[Tag]:
     """
     Lista todas as tags de um cliente.
 
@@ -25,22 +28,79 @@ def listar_tags(id_cliente: Optional[int] = None, apenas_ativas: bool = True) ->
         apenas_ativas: Se True, retorna apenas tags ativas
 
     Returns:
-        Lista de tags como dicionários
+        Lista de tags (registros Tag)
     """
     if id_cliente is None:
         id_cliente = get_default_client_id()
 
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
+            # Usos em épicos e ações associadas são agregados uma única vez
+            # para todas as tags do cliente, em vez de dois COUNT por tag
+            query = """
+                SELECT
+                    t.id_tag,
+                    t.nome,
+                    t.descricao,
+                    t.cor_hex,
+                    t.ativo,
+                    t.criado_em,
+                    t.atualizado_em,
+                    COALESCE(usos.total, 0) as usos,
+                    COALESCE(acoes.total, 0) as acoes_associadas
+                FROM tags t
+                LEFT JOIN (
+                    SELECT tag_atual, COUNT(*) as total
+                    FROM epicos
+                    WHERE id_cliente = %s
+                    GROUP BY tag_atual
+                ) usos ON usos.tag_atual = t.nome
+                LEFT JOIN (
+                    SELECT ta.id_tag, COUNT(*) as total
+                    FROM tag_acoes ta
+                    INNER JOIN tags tt ON tt.id_tag = ta.id_tag
+                    WHERE tt.id_cliente = %s AND ta.ativo = true
+                    GROUP BY ta.id_tag
+                ) acoes ON acoes.id_tag = t.id_tag
+                WHERE t.id_cliente = %s
+            """
+
+            params = [id_cliente, id_cliente, id_cliente]
+
+            if apenas_ativas:
+                query += " AND t.ativo = true"
+
+            query += " ORDER BY t.nome"
+
+            cur.execute(query, params)
+            return Tag.todos(cur)
+
+
+@cached("tags")
+@db_operation("listar_tags_opcoes")
+def listar_tags_opcoes(id_cliente: Optional[int] = None, apenas_ativas: bool = True) -> List[Tag]:
+    """
+    Lista apenas id, nome e cor das tags (para selectboxes).
+
+    Não calcula usos nem ações associadas.
+
+    Args:
+        id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
+        apenas_ativas: Se True, retorna apenas tags ativas
+
+    Returns:
+        Lista de tags (registros Tag)
+    """
+    if id_cliente is None:
+        id_cliente = get_default_client_id()
+
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             query = """
                 SELECT
                     id_tag,
                     nome,
-                    descricao,
-                    cor_hex,
-                    ativo,
-                    criado_em,
-                    atualizado_em
+                    cor_hex
                 FROM tags
                 WHERE id_cliente = %s
             """
@@ -53,49 +113,11 @@ def listar_tags(id_cliente: Optional[int] = None, apenas_ativas: bool = True) ->
             query += " ORDER BY nome"
 
             cur.execute(query, params)
-            results = cur.fetchall()
-
-            # Contar usos de cada tag
-            tags = []
-            for row in results:
-                # Contar quantas vezes a tag foi usada em épicos
-                cur.execute("""
-                    SELECT COUNT(*) as total
-                    FROM epicos
-                    WHERE tag_atual = %s AND id_cliente = %s
-                """, (row['nome'], id_cliente))
-
-                uso_result = cur.fetchone()
-                usos = uso_result['total'] if uso_result else 0
-
-                # Contar ações associadas
-                cur.execute("""
-                    SELECT COUNT(*) as total
-                    FROM tag_acoes
-                    WHERE id_tag = %s AND ativo = true
-                """, (row['id_tag'],))
-
-                acoes_result = cur.fetchone()
-                acoes_associadas = acoes_result['total'] if acoes_result else 0
-
-                tag = {
-                    "id_tag": row['id_tag'],
-                    "nome": row['nome'],
-                    "descricao": row['descricao'],
-                    "cor_hex": row['cor_hex'],
-                    "ativo": row['ativo'],
-                    "criado_em": row['criado_em'],
-                    "atualizado_em": row['atualizado_em'],
-                    "usos": usos,
-                    "acoes_associadas": acoes_associadas
-                }
-                tags.append(tag)
-
-            return tags
+            return Tag.todos(cur)
 
 
 @db_operation("buscar_tag_por_id")
-def buscar_tag_por_id(id_tag: int) -> Optional[Dict]:
+def buscar_tag_por_id(id_tag: int) -> Optional[Tag]:
     """
     Busca uma tag específica pelo ID.
 
@@ -103,10 +125,10 @@ def buscar_tag_por_id(id_tag: int) -> Optional[Dict]:
         id_tag: ID da tag
 
     Returns:
-        Dicionário com dados da tag ou None se não encontrada
+        Registro Tag ou None se não encontrada
     """
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             cur.execute("""
                 SELECT
                     id_tag,
@@ -121,12 +143,11 @@ def buscar_tag_por_id(id_tag: int) -> Optional[Dict]:
                 WHERE id_tag = %s
             """, (id_tag,))
 
-            result = cur.fetchone()
-            return dict(result) if result else None
+            return Tag.primeiro(cur)
 
 
 @db_operation("buscar_tag_por_nome")
-def buscar_tag_por_nome(nome: str, id_cliente: Optional[int] = None) -> Optional[Dict]:
+def buscar_tag_por_nome(nome: str, id_cliente: Optional[int] = None) -> Optional[Tag]:
     """
     Busca uma tag pelo nome.
 
@@ -135,13 +156,13 @@ def buscar_tag_por_nome(nome: str, id_cliente: Optional[int] = None) -> Optional
         id_cliente: ID do cliente (usa DEFAULT_CLIENT_ID se não fornecido)
 
     Returns:
-        Dicionário com dados da tag ou None se não encontrada
+        Registro Tag ou None se não encontrada
     """
     if id_cliente is None:
         id_cliente = get_default_client_id()
 
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=TupleCursor) as cur:
             cur.execute("""
                 SELECT
                     id_tag,
@@ -156,10 +177,10 @@ def buscar_tag_por_nome(nome: str, id_cliente: Optional[int] = None) -> Optional
                 WHERE nome = %s AND id_cliente = %s
             """, (nome, id_cliente))
 
-            result = cur.fetchone()
-            return dict(result) if result else None
+            return Tag.primeiro(cur)
 
 
+@invalidates("tags")
 @db_operation("criar_tag")
 def criar_tag(
     nome: str,
@@ -201,6 +222,7 @@ def criar_tag(
             return result['id_tag']
 
 
+@invalidates("tags")
 @db_operation("atualizar_tag")
 def atualizar_tag(
     id_tag: int,
@@ -274,6 +296,7 @@ def excluir_tag(id_tag: int) -> bool:
     return atualizar_tag(id_tag, ativo=False)
 
 
+@invalidates("tags", "tag_acoes")
 @db_operation("excluir_tag_permanente")
 def excluir_tag_permanente(id_tag: int) -> bool:
     """
@@ -0,0 +1,135 @@
+"""
+Testes do cache de repositórios (repositories.cache): TTL, LRU e invalidação
+por namespace, inclusive durante uma leitura em andamento.
+"""
+
+import pytest
+
+from repositories import cache
+from repositories.cache import _MISSING, RepositoryCache, cached, invalidate
+
+
+class Relogio:
+    """Substitui time.monotonic com um tempo controlado pelo teste."""
+
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self):
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(cache.time, "monotonic", relogio)
+    return relogio
+
+
+@pytest.fixture
+def cache_isolado(monkeypatch):
+    """Cache novo para o decorador, sem NOTIFY (não há banco nos testes)."""
+    novo = RepositoryCache(max_entries=16, ttl=60)
+    monkeypatch.setattr(cache, "_CACHE", novo)
+    monkeypatch.setattr(cache, "_ENABLED", True)
+    monkeypatch.setattr(cache, "_NOTIFY_ENABLED", False)
+    return novo
+
+
+def test_entrada_expira_apos_o_ttl(relogio):
+    repo_cache = RepositoryCache(ttl=30)
+    repo_cache.set("k", "valor", ("tags",))
+
+    relogio.agora += 29.9
+    assert repo_cache.get("k") == "valor"
+
+    relogio.agora += 0.1
+    assert repo_cache.get("k") is _MISSING
+
+
+def test_lru_descarta_a_menos_usada():
+    repo_cache = RepositoryCache(max_entries=2)
+    repo_cache.set("a", 1, ("tags",))
+    repo_cache.set("b", 2, ("tags",))
+    repo_cache.get("a")
+    repo_cache.set("c", 3, ("tags",))
+
+    assert repo_cache.get("a") == 1
+    assert repo_cache.get("b") is _MISSING
+    assert repo_cache.get("c") == 3
+
+
+def test_invalidacao_remove_apenas_os_namespaces_afetados():
+    repo_cache = RepositoryCache()
+    repo_cache.set("tags", 1, ("tags",))
+    repo_cache.set("tag_acoes", 2, ("tags", "acoes"))
+    repo_cache.set("prompts", 3, ("prompts",))
+
+    assert repo_cache.invalidate(["acoes"]) == 1
+    assert repo_cache.get("tags") == 1
+    assert repo_cache.get("tag_acoes") is _MISSING
+    assert repo_cache.get("prompts") == 3
+
+
+def test_set_recusa_valor_lido_antes_de_uma_invalidacao():
+    repo_cache = RepositoryCache()
+    geracoes = repo_cache.snapshot(("tags",))
+
+    repo_cache.invalidate(["tags"])
+
+    assert repo_cache.set("k", "antigo", ("tags",), geracoes) is False
+    assert repo_cache.get("k") is _MISSING
+
+    # Uma invalidação de outro namespace não afeta a leitura
+    geracoes = repo_cache.snapshot(("tags",))
+    repo_cache.invalidate(["prompts"])
+    assert repo_cache.set("k", "novo", ("tags",), geracoes) is True
+    assert repo_cache.get("k") == "novo"
+
+
+def test_set_recusa_valor_lido_antes_de_um_clear():
+    repo_cache = RepositoryCache()
+    geracoes = repo_cache.snapshot(("tags",))
+
+    repo_cache.clear()
+
+    assert repo_cache.set("k", "antigo", ("tags",), geracoes) is False
+
+
+def test_cached_reutiliza_o_resultado(cache_isolado):
+    chamadas = []
+
+    @cached("tags")
+    def listar(id_cliente):
+        chamadas.append(id_cliente)
+        return [id_cliente]
+
+    assert listar(1) == [1]
+    assert listar(1) == [1]
+    assert listar(2) == [2]
+    assert chamadas == [1, 2]
+
+    invalidate("tags")
+    assert listar(1) == [1]
+    assert chamadas == [1, 2, 1]
+
+
+def test_cached_nao_guarda_leitura_concorrente_com_invalidacao(cache_isolado):
+    versao = {"atual": 1}
+    chamadas = []
+
+    @cached("tags")
+    def listar():
+        lida = versao["atual"]
+        chamadas.append(lida)
+        # Uma escrita em outra sessão termina enquanto a leitura acontece
+        if len(chamadas) == 1:
+            versao["atual"] = 2
+            invalidate("tags")
+        return lida
+
+    assert listar() == 1
+    # O valor desatualizado não ficou no cache: a próxima chamada relê
+    assert listar() == 2
+    assert listar() == 2
+    assert chamadas == [1, 2]
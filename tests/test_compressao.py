@@ -0,0 +1,101 @@
+"""
+Testes do formato de resposta_gpt_comprimida (repositories.compressao).
+
+O formato é persistido no banco: o byte inicial e os dados já gravados
+precisam continuar legíveis.
+"""
+
+import logging
+import zlib
+
+import pytest
+
+from repositories import compressao
+from repositories.compressao import (
+    FORMATO_ZLIB, FORMATO_ZSTD, comprimir, descomprimir, formato_padrao, texto_resposta
+)
+
+TEXTO = "Análise do épico: integração com o sistema legado. " * 20
+
+
+def test_zlib_ida_e_volta():
+    dados = comprimir(TEXTO, FORMATO_ZLIB)
+
+    assert dados[0] == FORMATO_ZLIB
+    assert len(dados) < len(TEXTO.encode("utf-8"))
+    assert descomprimir(dados) == TEXTO
+
+
+def test_zlib_le_dados_gravados_com_o_byte_de_formato():
+    # Dados gravados por versões anteriores: byte 0x01 + zlib puro
+    dados = bytes([1]) + zlib.compress(TEXTO.encode("utf-8"))
+
+    assert descomprimir(dados) == TEXTO
+
+
+def test_zstd_ida_e_volta():
+    pytest.importorskip("zstandard")
+    dados = comprimir(TEXTO, FORMATO_ZSTD)
+
+    assert dados[0] == FORMATO_ZSTD
+    assert descomprimir(dados) == TEXTO
+
+
+def test_descomprimir_aceita_memoryview():
+    # psycopg2 devolve colunas bytea como memoryview
+    dados = comprimir(TEXTO, FORMATO_ZLIB)
+
+    assert descomprimir(memoryview(dados)) == TEXTO
+
+
+def test_formato_padrao_usa_zlib_sem_zstandard(monkeypatch, caplog):
+    monkeypatch.setenv("RESPOSTA_COMPRESSAO", "zstd")
+    monkeypatch.setattr(compressao, "ZSTD_AVAILABLE", False)
+    monkeypatch.setattr(compressao, "_aviso_zstd_emitido", False)
+
+    with caplog.at_level(logging.WARNING, logger="repositories.compressao"):
+        assert formato_padrao() == FORMATO_ZLIB
+        assert formato_padrao() == FORMATO_ZLIB
+
+    avisos = [r for r in caplog.records if "zstandard" in r.getMessage()]
+    assert len(avisos) == 1
+
+    dados = comprimir(TEXTO)
+    assert dados[0] == FORMATO_ZLIB
+    assert descomprimir(dados) == TEXTO
+
+
+def test_formato_padrao_respeita_zlib(monkeypatch):
+    monkeypatch.setenv("RESPOSTA_COMPRESSAO", "zlib")
+
+    assert formato_padrao() == FORMATO_ZLIB
+
+
+def test_formato_padrao_invalido(monkeypatch):
+    monkeypatch.setenv("RESPOSTA_COMPRESSAO", "gzip")
+
+    with pytest.raises(ValueError):
+        formato_padrao()
+
+
+def test_zstd_sem_zstandard_gera_erro(monkeypatch):
+    monkeypatch.setattr(compressao, "ZSTD_AVAILABLE", False)
+
+    with pytest.raises(ValueError):
+        comprimir(TEXTO, FORMATO_ZSTD)
+    with pytest.raises(ValueError):
+        descomprimir(bytes([FORMATO_ZSTD]) + b"qualquer")
+
+
+@pytest.mark.parametrize("dados", [b"", bytes([0x7F]) + b"abc"])
+def test_descomprimir_rejeita_dados_invalidos(dados):
+    with pytest.raises(ValueError):
+        descomprimir(dados)
+
+
+def test_texto_resposta_prefere_a_copia_comprimida():
+    comprimida = comprimir("resposta comprimida", FORMATO_ZLIB)
+
+    assert texto_resposta("texto antigo", comprimida) == "resposta comprimida"
+    assert texto_resposta("texto", None) == "texto"
+    assert texto_resposta(None, None) is None
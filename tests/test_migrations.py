@@ -0,0 +1,83 @@
+"""
+Testes da separação de comandos das migrações (database.migrations.split_statements).
+"""
+
+from database.migrations import MIGRATIONS_DIR, discover_migrations, split_statements
+
+
+def test_separa_comandos_simples():
+    sql = """
+        CREATE TABLE a (id int);
+        CREATE INDEX idx_a ON a (id);
+    """
+
+    assert split_statements(sql) == [
+        "CREATE TABLE a (id int)",
+        "CREATE INDEX idx_a ON a (id)",
+    ]
+
+
+def test_bloco_do_com_dollar_quote_e_um_comando():
+    sql = """
+        DO $$
+        BEGIN
+            PERFORM 1;
+            RAISE NOTICE 'fim; ok';
+        END
+        $$;
+        SELECT 2;
+    """
+
+    comandos = split_statements(sql)
+
+    assert len(comandos) == 2
+    assert comandos[0].startswith("DO $$")
+    assert comandos[0].endswith("$$")
+    assert "PERFORM 1;" in comandos[0]
+    assert comandos[1] == "SELECT 2"
+
+
+def test_dollar_quote_com_tag_e_aninhado():
+    sql = """
+        CREATE FUNCTION f() RETURNS void LANGUAGE plpgsql AS $corpo$
+        BEGIN
+            EXECUTE $q$SELECT 1; SELECT 2$q$;
+        END
+        $corpo$;
+        SELECT f();
+    """
+
+    comandos = split_statements(sql)
+
+    assert len(comandos) == 2
+    assert "$q$SELECT 1; SELECT 2$q$;" in comandos[0]
+    assert comandos[1] == "SELECT f()"
+
+
+def test_ignora_ponto_e_virgula_em_strings_e_comentarios():
+    sql = """
+        -- comentário; não separa
+        INSERT INTO t VALUES ('a;b', 'it''s; ok');
+        SELECT 1; -- fim; comentário
+    """
+
+    assert split_statements(sql) == [
+        "-- comentário; não separa\n        INSERT INTO t VALUES ('a;b', 'it''s; ok')",
+        "SELECT 1",
+    ]
+
+
+def test_descarta_trechos_apenas_com_comentarios():
+    assert split_statements("-- só comentário\n;\n  ;") == []
+
+
+def test_migracoes_do_repositorio_sao_separaveis():
+    migracoes = discover_migrations(MIGRATIONS_DIR)
+
+    assert migracoes
+    for migracao in migracoes:
+        comandos = split_statements(migracao.sql)
+        assert comandos, migracao.path.name
+        # Um dollar quote sem fechamento engoliria o resto do arquivo
+        for comando in comandos:
+            assert comando.count("$$") % 2 == 0, migracao.path.name
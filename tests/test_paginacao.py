@@ -0,0 +1,76 @@
+"""
+Testes dos tokens de cursor da paginação por keyset (repositories.paginacao).
+"""
+
+import base64
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+
+from repositories.paginacao import (
+    ANTERIOR, PROXIMA, codificar_cursor, decodificar_cursor, montar_pagina
+)
+
+
+def _token(payload) -> str:
+    raw = json.dumps(payload).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+@pytest.mark.parametrize("chave", [
+    [datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc), 42],
+    [datetime(2026, 3, 1, 12, 30), 7],
+    [date(2026, 1, 31), "texto", None],
+])
+@pytest.mark.parametrize("direcao", [PROXIMA, ANTERIOR])
+def test_cursor_ida_e_volta(direcao, chave):
+    assert decodificar_cursor(codificar_cursor(direcao, chave)) == (direcao, chave)
+
+
+def test_cursor_preserva_fuso_horario():
+    executado_em = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+
+    _, (valor, _) = decodificar_cursor(codificar_cursor(PROXIMA, [executado_em, 1]))
+
+    assert valor.tzinfo is not None
+    assert valor == executado_em
+
+
+@pytest.mark.parametrize("token", [
+    "",
+    "não é base64",
+    "!!!!",
+    base64.urlsafe_b64encode(b"{json invalido").decode("ascii"),
+    _token([1, 2]),
+    _token({"d": PROXIMA}),
+    _token({"k": [1]}),
+    _token({"d": PROXIMA, "k": 5}),
+    _token({"d": PROXIMA, "k": [{"dt": "ontem"}]}),
+    _token({"d": "lateral", "k": [1]}),
+])
+def test_cursor_adulterado_e_rejeitado(token):
+    with pytest.raises(ValueError):
+        decodificar_cursor(token)
+
+
+def test_cursor_truncado_e_rejeitado():
+    token = codificar_cursor(PROXIMA, [datetime(2026, 3, 1, 12, 30), 42])
+
+    with pytest.raises(ValueError):
+        decodificar_cursor(token[:-6])
+
+
+def test_montar_pagina_tokens():
+    linhas = [{"id": i} for i in (5, 4, 3)]
+
+    primeira = montar_pagina(linhas, 2, None, lambda l: [l["id"]])
+    assert [l["id"] for l in primeira.itens] == [5, 4]
+    assert primeira.anterior is None
+    assert decodificar_cursor(primeira.proximo) == (PROXIMA, [4])
+
+    # Voltando: a consulta lê em ordem inversa e a página é reordenada
+    anterior = montar_pagina([{"id": 6}, {"id": 7}], 2, ANTERIOR, lambda l: [l["id"]])
+    assert [l["id"] for l in anterior.itens] == [7, 6]
+    assert anterior.anterior is None
+    assert decodificar_cursor(anterior.proximo) == (PROXIMA, [6])